@@ -2,6 +2,7 @@
 QSS Service Bot - Admin Panel
 FastAPI application for managing bot data.
 """
+import logging
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -14,20 +15,43 @@ from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.config import settings
-from bot.db.engine import session_pool
+from bot.db.engine import pool_stats, session_pool
 from bot.db.models import Owner, Master, Admin, Ticket, BotText
+from bot.db.repositories import master_repo, recipient_repo
+from bot.services.dashboard_service import dashboard_cache
+from bot.services.role_cache import notify_roles_changed
 from bot.utils.constants import (
     COMPLEX_DISPLAY, CATEGORY_DISPLAY, STATUS_DISPLAY,
     ResidentialComplex, TicketCategory, TicketStatus,
 )
 from admin_panel.auth import AuthMiddleware, create_session_token, SESSION_COOKIE, SESSION_MAX_AGE
 
+logger = logging.getLogger(__name__)
+
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
 
+async def seed_texts() -> None:
+    """Add default texts introduced since the last start, so the texts page lists them."""
+    from bot.db.repositories import bot_text_repo
+    from bot.services.text_service import seed_default_texts
+
+    async with session_pool() as session:
+        count = await seed_default_texts(session)
+        if count:
+            await bot_text_repo.notify_changed(session)
+        await session.commit()
+    if count:
+        logger.info("Seeded %d default bot texts", count)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    try:
+        await seed_texts()
+    except Exception as e:
+        logger.warning("Failed to seed default bot texts: %s", e)
     yield
 
 
@@ -84,42 +108,24 @@ async def logout():
 # --- Dashboard ---
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, session: AsyncSession = Depends(get_session)):
-    # Stats
-    total_tickets = await session.scalar(select(func.count(Ticket.id)))
-    new_tickets = await session.scalar(
-        select(func.count(Ticket.id)).where(Ticket.status == "new")
-    )
-    in_progress = await session.scalar(
-        select(func.count(Ticket.id)).where(Ticket.status == "in_progress")
-    )
-    completed = await session.scalar(
-        select(func.count(Ticket.id)).where(Ticket.status.in_(["completed", "closed"]))
-    )
-    total_owners = await session.scalar(select(func.count(Owner.id)))
-    total_masters = await session.scalar(select(func.count(Master.id)))
-
-    # Recent tickets
-    recent_result = await session.execute(
-        select(Ticket).order_by(desc(Ticket.created_at)).limit(10)
-    )
-    recent_tickets = recent_result.scalars().all()
-
+async def dashboard(request: Request):
+    data = await dashboard_cache.get(session_pool)
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
-        "stats": {
-            "total_tickets": total_tickets or 0,
-            "new_tickets": new_tickets or 0,
-            "in_progress": in_progress or 0,
-            "completed": completed or 0,
-            "total_owners": total_owners or 0,
-            "total_masters": total_masters or 0,
-        },
-        "recent_tickets": recent_tickets,
+        "stats": data["stats"],
+        "by_complex": data["by_complex"],
+        "by_category": data["by_category"],
+        "breakdown_days": data["breakdown_days"],
+        "recent_tickets": data["recent_tickets"],
         **get_display_mappings(),
     })
 
 
+@app.get("/api/pool-stats")
+async def db_pool_stats():
+    return pool_stats()
+
+
 # --- Tickets ---
 
 @app.get("/tickets", response_class=HTMLResponse)
@@ -298,6 +304,7 @@ async def owner_edit(
     owner.block = block or None
     owner.entrance = entrance or None
     owner.apartment = apartment
+    await notify_roles_changed(session, owner.telegram_id)
     await session.commit()
     return RedirectResponse("/owners", status_code=303)
 
@@ -310,6 +317,7 @@ async def owner_delete(
     owner = await session.get(Owner, owner_id)
     if owner:
         await session.delete(owner)
+        await notify_roles_changed(session, owner.telegram_id)
         await session.commit()
     return RedirectResponse("/owners", status_code=303)
 
@@ -346,16 +354,18 @@ async def master_add(
     telegram_id: int = Form(...),
     full_name: str = Form(...),
     username: str = Form(None),
-    residential_complex: str = Form(...),
+    residential_complex: list[str] = Form(...),
     session: AsyncSession = Depends(get_session),
 ):
     master = Master(
         telegram_id=telegram_id,
         full_name=full_name,
         username=username or None,
-        residential_complex=residential_complex,
     )
+    master_repo.set_complexes(master, residential_complex)
     session.add(master)
+    await recipient_repo.notify_changed(session)
+    await notify_roles_changed(session, telegram_id)
     await session.commit()
     return RedirectResponse("/masters", status_code=303)
 
@@ -366,7 +376,7 @@ async def master_edit_form(
     master_id: int,
     session: AsyncSession = Depends(get_session),
 ):
-    master = await session.get(Master, master_id)
+    master = await master_repo.get_with_complexes(session, master_id)
     if not master:
         raise HTTPException(status_code=404, detail="Master not found")
 
@@ -384,19 +394,21 @@ async def master_edit(
     telegram_id: int = Form(...),
     full_name: str = Form(...),
     username: str = Form(None),
-    residential_complex: str = Form(...),
+    residential_complex: list[str] = Form(...),
     is_active: bool = Form(False),
     session: AsyncSession = Depends(get_session),
 ):
-    master = await session.get(Master, master_id)
+    master = await master_repo.get_with_complexes(session, master_id)
     if not master:
         raise HTTPException(status_code=404, detail="Master not found")
 
+    await notify_roles_changed(session, master.telegram_id, telegram_id)
     master.telegram_id = telegram_id
     master.full_name = full_name
     master.username = username or None
-    master.residential_complex = residential_complex
+    master_repo.set_complexes(master, residential_complex)
     master.is_active = is_active
+    await recipient_repo.notify_changed(session)
     await session.commit()
     return RedirectResponse("/masters", status_code=303)
 
@@ -425,6 +437,8 @@ async def admin_add(
 ):
     admin = Admin(telegram_id=telegram_id, full_name=full_name)
     session.add(admin)
+    await recipient_repo.notify_changed(session)
+    await notify_roles_changed(session, telegram_id)
     await session.commit()
     return RedirectResponse("/admins", status_code=303)
 
@@ -437,6 +451,8 @@ async def admin_delete(
     admin = await session.get(Admin, admin_id)
     if admin:
         await session.delete(admin)
+        await recipient_repo.notify_changed(session)
+        await notify_roles_changed(session, admin.telegram_id)
         await session.commit()
     return RedirectResponse("/admins", status_code=303)
 
@@ -449,12 +465,7 @@ async def texts_list(
     lang: str = "ru",
     session: AsyncSession = Depends(get_session),
 ):
-    from bot.services.text_service import DEFAULT_TEXTS, TEXT_DESCRIPTIONS, seed_default_texts
-
-    # Seed defaults if needed
-    count = await seed_default_texts(session)
-    if count:
-        await session.commit()
+    from bot.services.text_service import TEXT_DESCRIPTIONS
 
     # Filter by language
     query = select(BotText).order_by(BotText.key)
@@ -532,13 +543,15 @@ async def text_edit_form(
 
 @app.post("/texts/{text_id}/edit")
 async def text_edit(
+    request: Request,
     text_id: int,
     value: str = Form(...),
     value_other: str = Form(None),
     other_id: int = Form(None),
     session: AsyncSession = Depends(get_session),
 ):
-    from bot.services.text_service import refresh_cache
+    from bot.db.repositories import bot_text_repo
+    from bot.services.text_service import unknown_placeholders
 
     text = await session.get(BotText, text_id)
     if not text:
@@ -547,16 +560,29 @@ async def text_edit(
     text.value = value
 
     # Update the other language version if provided
+    other_text = None
     if other_id and value_other is not None:
         other_text = await session.get(BotText, other_id)
         if other_text:
             other_text.value = value_other
 
+    # A placeholder the bot never passes would be sent to users as "{name}"
+    unknown = unknown_placeholders(text.key, value)
+    if other_text:
+        unknown += unknown_placeholders(other_text.key, value_other)
+    if unknown:
+        # Not committed: the session is discarded and the form keeps the input
+        return templates.TemplateResponse("text_form.html", {
+            "request": request,
+            "text": text,
+            "other_text": other_text,
+            "error": "Неизвестные переменные: " + ", ".join(f"{{{name}}}" for name in sorted(set(unknown))),
+        }, status_code=400)
+
+    # The bot processes reload this key once the edit commits
+    await bot_text_repo.notify_changed(session, [text.key])
     await session.commit()
 
-    # Refresh cache so changes take effect immediately
-    await refresh_cache(session)
-
     return RedirectResponse(f"/texts?lang={text.language}", status_code=303)
 
 
@@ -568,15 +594,15 @@ async def text_add(
     description: str = Form(None),
     session: AsyncSession = Depends(get_session),
 ):
-    from bot.services.text_service import refresh_cache
+    from bot.db.repositories import bot_text_repo
 
     text_ru = BotText(key=key, value=value_ru, language="ru", description=description)
     session.add(text_ru)
     if value_kk.strip():
         text_kk = BotText(key=key, value=value_kk, language="kk", description=description)
         session.add(text_kk)
+    await bot_text_repo.notify_changed(session, [key])
     await session.commit()
-    await refresh_cache(session)
     return RedirectResponse("/texts", status_code=303)
 
 
@@ -0,0 +1,41 @@
+"""Add per-day ticket number counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ticket_counters",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("last_value", sa.Integer(), nullable=False),
+    )
+
+    # Continue numbering after the tickets already issued each day
+    op.execute(
+        """
+        INSERT INTO ticket_counters (day, last_value)
+        SELECT to_date(split_part(ticket_id, '-', 2), 'YYYYMMDD'),
+               max(split_part(ticket_id, '-', 3)::int)
+        FROM tickets
+        WHERE ticket_id ~ '^QSS-[0-9]{8}-[0-9]+$'
+        GROUP BY 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ticket_counters")
@@ -0,0 +1,37 @@
+"""Add composite created_at indexes for ticket date-range queries
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_tickets_client_created", "tickets", ["client_telegram_id", "created_at"])
+    op.create_index("ix_tickets_status_created", "tickets", ["status", "created_at"])
+    op.create_index("ix_tickets_master_created", "tickets", ["assigned_master_id", "created_at"])
+    op.create_index("ix_tickets_created_at", "tickets", ["created_at"])
+
+    # Covered by the composite indexes above (same leading column)
+    op.drop_index("ix_tickets_client_telegram_id", table_name="tickets")
+    op.drop_index("ix_tickets_status", table_name="tickets")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tickets_status", "tickets", ["status"])
+    op.create_index("ix_tickets_client_telegram_id", "tickets", ["client_telegram_id"])
+
+    op.drop_index("ix_tickets_created_at", table_name="tickets")
+    op.drop_index("ix_tickets_master_created", table_name="tickets")
+    op.drop_index("ix_tickets_status_created", table_name="tickets")
+    op.drop_index("ix_tickets_client_created", table_name="tickets")
@@ -0,0 +1,56 @@
+"""Add ticket_stats_daily rollup
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from bot.config import settings
+
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ticket_stats_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("residential_complex", sa.String(50), nullable=False),
+        sa.Column("category", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("master_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ticket_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rating_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rated_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("day", "residential_complex", "category", "status", "master_id"),
+    )
+
+    # Same result as scripts/rebuild_ticket_stats.py, done in SQL
+    op.get_bind().execute(
+        sa.text(
+            """
+            INSERT INTO ticket_stats_daily
+                (day, residential_complex, category, status, master_id,
+                 ticket_count, rating_sum, rated_count)
+            SELECT (created_at AT TIME ZONE :db_tz AT TIME ZONE :tz)::date,
+                   residential_complex, category, status,
+                   coalesce(assigned_master_id, 0),
+                   count(*), coalesce(sum(rating), 0), count(rating)
+            FROM tickets
+            GROUP BY 1, 2, 3, 4, 5
+            """
+        ),
+        {"db_tz": settings.db_timezone, "tz": settings.timezone},
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ticket_stats_daily")
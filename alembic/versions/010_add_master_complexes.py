@@ -0,0 +1,42 @@
+"""Add master_complexes join table
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "master_complexes",
+        sa.Column("master_id", sa.Integer(), sa.ForeignKey("masters.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("residential_complex", sa.String(50), primary_key=True),
+    )
+    op.create_index("ix_master_complexes_complex", "master_complexes", ["residential_complex", "master_id"])
+
+    # Split the comma-separated masters.residential_complex into rows
+    op.execute(
+        """
+        INSERT INTO master_complexes (master_id, residential_complex)
+        SELECT DISTINCT m.id, trim(c.name)
+        FROM masters m
+        CROSS JOIN LATERAL unnest(string_to_array(m.residential_complex, ',')) AS c(name)
+        WHERE trim(c.name) <> ''
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_master_complexes_complex", table_name="master_complexes")
+    op.drop_table("master_complexes")
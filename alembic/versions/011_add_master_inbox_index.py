@@ -0,0 +1,33 @@
+"""Add partial index for the master "new tickets" inbox
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match bot.db.models.ticket.MASTER_INBOX for the planner to use the index
+INBOX = "status IN ('new', 'pending_approval') AND assigned_master_id IS NULL"
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tickets_master_inbox",
+        "tickets",
+        ["residential_complex", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text(INBOX),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tickets_master_inbox", table_name="tickets")
@@ -1,18 +1,36 @@
 import asyncio
 import logging
+from functools import partial
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import BotCommand, BotCommandScopeDefault
 
+from bot import metrics
 from bot.config import settings
-from bot.db.engine import session_pool
+from bot.db.engine import engine, pool_stats, session_pool
+from bot.db.repositories import bot_text_repo, recipient_repo
 from bot.middlewares.db_session import DbSessionMiddleware
+from bot.middlewares.fsm_batch import FsmBatchMiddleware
 from bot.middlewares.auth import AuthMiddleware
+from bot.middlewares.metrics import (
+    TelegramMetricsMiddleware, TimedMiddleware, UpdateMetricsMiddleware, instrument_router,
+)
 from bot.middlewares.throttling import ThrottlingMiddleware
+from bot.services.fsm_storage import DbStorage
+from bot.services.outbox import run_outbox_worker
+from bot.services.role_cache import CHANNEL as ROLES_CHANNEL, role_cache
+from bot.services import text_listener
+from bot.services.change_listener import run_change_listener
+from bot.services.recipient_directory import recipient_directory
+from bot.services.text_listener import run_text_refresher
 from bot.handlers import get_all_routers
+from bot.polling import run_polling
+from bot.services.update_scheduler import ChatScheduler
+from bot.webhook import run_webhook
 
 logging.basicConfig(
     level=getattr(logging, settings.log_level, logging.INFO),
@@ -56,21 +74,65 @@ async def seed_and_load_texts() -> None:
         await text_service.load_cache(session)
 
 
+async def load_recipients() -> None:
+    """Load masters and admins for notification fan-out; on failure it reads the DB until a reload."""
+    try:
+        await recipient_directory.refresh(session_pool)
+    except Exception as e:
+        logger.warning("Failed to load the recipient directory: %s", e)
+
+
+def create_fsm_storage() -> BaseStorage:
+    if settings.fsm_storage == "memory":
+        return MemoryStorage()
+    if settings.fsm_storage == "db":
+        return DbStorage(session_pool)
+    raise ValueError(f"Unknown FSM storage: {settings.fsm_storage!r}")
+
+
+async def log_stats(interval: int, scheduler: ChatScheduler) -> None:
+    """Periodically log DB pool and update queue usage so both can be sized under real traffic."""
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("DB pool: %s", pool_stats())
+        logger.info("Update queue: %s", scheduler.stats())
+        # The peak gauge covers the same window as the log line
+        scheduler.reset_peak()
+
+
 async def main() -> None:
+    if settings.metrics_port > 0:
+        metrics.start_server(settings.metrics_host, settings.metrics_port)
+        metrics.instrument_engine(engine)
+
     # Seed texts and load cache
     await seed_and_load_texts()
+    await load_recipients()
 
     bot = Bot(
         token=settings.bot_token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
-    dp = Dispatcher(storage=MemoryStorage())
-
-    dp.update.outer_middleware(DbSessionMiddleware(session_pool))
-    dp.update.outer_middleware(AuthMiddleware())
-    dp.message.middleware(ThrottlingMiddleware())
+    bot.session.middleware(TelegramMetricsMiddleware())
+    storage = create_fsm_storage()
+    # disable_fsm only keeps aiogram from registering FSMContextMiddleware
+    # itself: it is registered below, after the FSM batch
+    dp = Dispatcher(storage=metrics.MeteredStorage(storage), disable_fsm=True)
+
+    # Only aiogram's ErrorsMiddleware and UserContextMiddleware run before
+    # this one, so the update time covers the FSM load and every middleware below
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    if isinstance(storage, DbStorage):
+        dp.update.outer_middleware(TimedMiddleware(FsmBatchMiddleware(storage)))
+    dp.update.outer_middleware(TimedMiddleware(dp.fsm))
+    dp.update.outer_middleware(TimedMiddleware(DbSessionMiddleware(session_pool)))
+    dp.update.outer_middleware(TimedMiddleware(AuthMiddleware(role_cache)))
+    throttling = TimedMiddleware(ThrottlingMiddleware())
+    dp.message.middleware(throttling)
+    dp.callback_query.middleware(throttling)
 
     for router in get_all_routers():
+        instrument_router(router)
         dp.include_router(router)
 
     await bot.set_my_commands(
@@ -82,8 +144,39 @@ async def main() -> None:
         scope=BotCommandScopeDefault(),
     )
 
-    logger.info("Bot starting...")
-    await dp.start_polling(bot)
+    scheduler = ChatScheduler(dp, bot, settings.update_concurrency, settings.update_queue_limit)
+    if settings.metrics_port > 0:
+        metrics.instrument_scheduler(scheduler)
+
+    stats_task = None
+    if settings.db_pool_stats_interval > 0:
+        stats_task = asyncio.create_task(log_stats(settings.db_pool_stats_interval, scheduler))
+
+    outbox_task = asyncio.create_task(run_outbox_worker(bot, session_pool))
+    listener_task = asyncio.create_task(run_change_listener({
+        bot_text_repo.CHANNEL: partial(text_listener.apply_changes, session_pool),
+        recipient_repo.CHANNEL: partial(recipient_directory.apply_changes, session_pool),
+        ROLES_CHANNEL: role_cache.apply_changes,
+    }))
+    refresh_task = None
+    if settings.text_refresh_interval > 0:
+        refresh_task = asyncio.create_task(run_text_refresher(session_pool, settings.text_refresh_interval))
+
+    logger.info("Bot starting in %s mode...", settings.bot_mode)
+    try:
+        if settings.bot_mode == "webhook":
+            await run_webhook(dp, bot, scheduler, engine)
+        elif settings.bot_mode == "polling":
+            await run_polling(dp, bot, scheduler)
+        else:
+            raise ValueError(f"Unknown bot mode: {settings.bot_mode!r}")
+    finally:
+        outbox_task.cancel()
+        listener_task.cancel()
+        if refresh_task:
+            refresh_task.cancel()
+        if stats_task:
+            stats_task.cancel()
 
 
 if __name__ == "__main__":
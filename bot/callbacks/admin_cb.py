@@ -14,3 +14,7 @@ class AdminTicketCB(CallbackData, prefix="at"):
 class AdminReassignCB(CallbackData, prefix="ar"):
     ticket_pk: int
     master_id: int
+
+
+class AdminStatsCB(CallbackData, prefix="as"):
+    days: int
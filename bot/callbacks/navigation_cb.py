@@ -4,6 +4,9 @@ from aiogram.filters.callback_data import CallbackData
 class PageCB(CallbackData, prefix="page"):
     scope: str   # owner_tickets, master_tickets, admin_tickets
     page: int
+    total: int = 0   # row count from the first page, reused instead of re-counting
+    after: int = 0   # keyset cursor: id of the last ticket shown (next page)
+    before: int = 0  # keyset cursor: id of the first ticket shown (previous page)
 
 
 class BackCB(CallbackData, prefix="back"):
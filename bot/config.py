@@ -12,8 +12,64 @@ class Settings(BaseSettings):
     db_pass: str = "changeme"
     db_name: str = "qss_service"
 
+    # Connection pool. DB_PROFILE selects the per-process sizing:
+    # "bot" (many short transactions) or "admin" (few, mostly idle)
+    db_profile: str = "bot"
+    bot_db_pool_size: int = 10
+    bot_db_max_overflow: int = 10
+    bot_db_pool_pre_ping: bool = False
+    admin_db_pool_size: int = 3
+    admin_db_max_overflow: int = 2
+    admin_db_pool_pre_ping: bool = True
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800  # seconds, -1 disables
+    db_statement_cache_size: int = 100  # asyncpg prepared statements per connection, 0 for pgbouncer
+    db_pool_stats_interval: int = 300  # seconds between pool and update queue stats log lines in the bot, 0 disables
+
+    # Business days ("today", daily limits, ticket numbers) follow TIMEZONE;
+    # DB_TIMEZONE is the zone of the naive timestamps Postgres stores (now())
+    timezone: str = "Asia/Almaty"
+    db_timezone: str = "UTC"
+
+    # Update delivery: "polling" (getUpdates, one process) or "webhook"
+    # (Telegram POSTs to WEBHOOK_URL + WEBHOOK_PATH through nginx; one replica)
+    bot_mode: str = "polling"
+    webhook_url: str = ""  # public HTTPS base URL, e.g. https://bot.example.com
+    webhook_path: str = "/webhook"
+    webhook_secret: str = ""  # checked against X-Telegram-Bot-Api-Secret-Token
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+
+    # Update processing: up to UPDATE_CONCURRENCY updates run at once, one
+    # per chat at a time; polling pauses while UPDATE_QUEUE_LIMIT are pending
+    update_concurrency: int = 32
+    update_queue_limit: int = 1000
+
+    # FSM storage: "db" keeps dialog state in Postgres (survives restarts,
+    # shared by all bot processes), "memory" keeps it in the process
+    fsm_storage: str = "db"
+
+    # Bot texts follow admin edits via LISTEN/NOTIFY; this full reload in
+    # the background only catches edits made around the admin panel
+    text_refresh_interval: int = 900  # seconds, 0 disables
+
+    # Notification outbox worker
+    outbox_batch_size: int = 50
+    outbox_poll_interval: float = 1.0  # seconds between polls when the outbox is empty
+    outbox_max_attempts: int = 8
+    outbox_backoff_base: float = 2.0  # seconds, doubled after every failed attempt
+    outbox_backoff_max: float = 600.0
+    # Seconds a claimed batch is reserved for its worker; must outlast sending
+    # it, or another worker may send it again
+    outbox_lease: float = 300.0
+
     log_level: str = "INFO"
 
+    # Prometheus metrics of the bot process (GET /metrics); 0 disables.
+    # Set METRICS_HOST=0.0.0.0 to scrape from another container
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9101
+
     # Admin panel auth
     admin_login: str = "admin"
     admin_password: str = "changeme"
@@ -26,5 +82,32 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def db_dsn(self) -> str:
+        """Plain libpq URL, for connections made with asyncpg directly."""
+        return (
+            f"postgresql://{self.db_user}:{self.db_pass}"
+            f"@{self.db_host}:{self.db_port}/{self.db_name}"
+        )
+
+    def db_engine_options(self, profile: str | None = None) -> dict:
+        """Keyword arguments for create_async_engine() for the given pool profile."""
+        profile = profile or self.db_profile
+        if profile not in ("bot", "admin"):
+            raise ValueError(f"Unknown DB profile: {profile!r}")
+        return {
+            "pool_size": getattr(self, f"{profile}_db_pool_size"),
+            "max_overflow": getattr(self, f"{profile}_db_max_overflow"),
+            "pool_pre_ping": getattr(self, f"{profile}_db_pool_pre_ping"),
+            "pool_timeout": self.db_pool_timeout,
+            "pool_recycle": self.db_pool_recycle,
+            # SQLAlchemy's asyncpg dialect keeps its own prepared statement
+            # cache on top of asyncpg's; both must be off behind pgbouncer
+            "connect_args": {
+                "prepared_statement_cache_size": self.db_statement_cache_size,
+                "statement_cache_size": self.db_statement_cache_size,
+            },
+        }
+
 
 settings = Settings()
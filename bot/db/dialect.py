@@ -0,0 +1,13 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert(session: AsyncSession, model):
+    """Dialect-specific INSERT supporting ON CONFLICT for the session's engine.
+
+    Postgres in production, SQLite in tests — both speak the same
+    ``on_conflict_do_update`` / ``on_conflict_do_nothing`` API.
+    """
+    if session.bind.dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
@@ -1,6 +1,57 @@
+import time
+
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from bot.config import settings
 
-engine = create_async_engine(settings.db_url, echo=False)
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long connection checkouts take.
+
+    The time includes waiting for a free connection, opening an overflow
+    connection and the pre-ping, i.e. everything a request waits for.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_time_total = 0.0
+        self.checkout_time_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.checkouts += 1
+            self.checkout_time_total += elapsed
+            self.checkout_time_max = max(self.checkout_time_max, elapsed)
+
+
+engine = create_async_engine(
+    settings.db_url,
+    echo=False,
+    poolclass=TimedQueuePool,
+    **settings.db_engine_options(),
+)
 session_pool = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def pool_stats() -> dict[str, int | float]:
+    """Current pool usage plus cumulative checkout timings for this process."""
+    pool = engine.pool
+    checkouts = getattr(pool, "checkouts", 0)
+    total = getattr(pool, "checkout_time_total", 0.0)
+    return {
+        "profile": settings.db_profile,
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.db_engine_options()["max_overflow"],
+        "checkouts": checkouts,
+        "wait_avg_ms": round(total / checkouts * 1000, 3) if checkouts else 0.0,
+        "wait_max_ms": round(getattr(pool, "checkout_time_max", 0.0) * 1000, 3),
+    }
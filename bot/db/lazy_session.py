@@ -0,0 +1,53 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class LazySession:
+    """Stand-in for ``AsyncSession`` that creates the real session on first use.
+
+    Attribute access is forwarded to the underlying session, so handlers and
+    repositories use it exactly like an ``AsyncSession``. ``has_pending_work``
+    tells the caller whether a connection was taken from the pool or ORM
+    changes are waiting to be flushed, i.e. whether commit/rollback is needed.
+    """
+
+    __slots__ = ("_session_pool", "_session", "_connected")
+
+    def __init__(self, session_pool: async_sessionmaker) -> None:
+        self._session_pool = session_pool
+        self._session: AsyncSession | None = None
+        self._connected = False
+
+    @property
+    def is_started(self) -> bool:
+        return self._session is not None
+
+    def _get(self) -> AsyncSession:
+        if self._session is None:
+            session = self._session_pool()
+            event.listen(session.sync_session, "after_begin", self._on_begin)
+            event.listen(session.sync_session, "after_transaction_end", self._on_transaction_end)
+            self._session = session
+        return self._session
+
+    def _on_begin(self, session, transaction, connection) -> None:
+        self._connected = True
+
+    def _on_transaction_end(self, session, transaction) -> None:
+        if transaction.parent is None:
+            self._connected = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+    def has_pending_work(self) -> bool:
+        session = self._session
+        if session is None:
+            return False
+        return self._connected or bool(session.new or session.dirty or session.deleted)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
@@ -1,8 +1,13 @@
 from bot.db.models.owner import Owner
 from bot.db.models.master import Master
+from bot.db.models.master_complex import MasterComplex
 from bot.db.models.admin import Admin
 from bot.db.models.ticket import Ticket
 from bot.db.models.ticket_history import TicketHistory
+from bot.db.models.ticket_counter import TicketCounter
+from bot.db.models.ticket_stats import TicketStatsDaily
+from bot.db.models.notification_outbox import NotificationOutbox
+from bot.db.models.fsm_state import FsmState
 from bot.db.models.bot_text import BotText
 
-__all__ = ["Owner", "Master", "Admin", "Ticket", "TicketHistory", "BotText"]
+__all__ = ["Owner", "Master", "MasterComplex", "Admin", "Ticket", "TicketHistory", "TicketCounter", "TicketStatsDaily", "NotificationOutbox", "FsmState", "BotText"]
@@ -1,9 +1,10 @@
 from typing import Optional
 
 from sqlalchemy import BigInteger, String, Boolean
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from bot.db.base import Base, TimestampMixin
+from bot.db.models.master_complex import MasterComplex
 
 
 class Master(Base, TimestampMixin):
@@ -13,6 +14,17 @@ class Master(Base, TimestampMixin):
     telegram_id: Mapped[int] = mapped_column(BigInteger, unique=True, index=True)
     full_name: Mapped[str] = mapped_column(String(255))
     username: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    # Display label only ("alasha,terekti"); master_complexes is the source of truth
     residential_complex: Mapped[str] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true")
     language: Mapped[str] = mapped_column(String(2), default="ru", server_default="ru")
+
+    # Loaded explicitly (selectinload) where needed; never lazily
+    complexes: Mapped[list[MasterComplex]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True, lazy="raise",
+        order_by=MasterComplex.residential_complex,
+    )
+
+    @property
+    def complex_names(self) -> list[str]:
+        return [c.residential_complex for c in self.complexes]
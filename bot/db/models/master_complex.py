@@ -0,0 +1,15 @@
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.db.base import Base
+
+
+class MasterComplex(Base):
+    """A residential complex a master serves (one row per master and complex)."""
+
+    __tablename__ = "master_complexes"
+    # The primary key serves "complexes of a master"; this index serves "masters of a complex"
+    __table_args__ = (Index("ix_master_complexes_complex", "residential_complex", "master_id"),)
+
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"), primary_key=True)
+    residential_complex: Mapped[str] = mapped_column(String(50), primary_key=True)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Index, Integer, JSON, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.db.base import Base, TimestampMixin
+
+
+class NotificationOutbox(Base, TimestampMixin):
+    """A Bot API call queued in the same transaction as the change it reports.
+
+    Rows are deleted once delivered; ``failed`` rows are kept for inspection.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_due", "status", "next_attempt_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger)
+    method: Mapped[str] = mapped_column(String(30))  # send_message, send_photo, send_document
+    payload: Mapped[dict] = mapped_column(JSON)
+
+    status: Mapped[str] = mapped_column(String(10), default="pending")  # pending, failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
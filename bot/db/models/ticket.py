@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import BigInteger, String, Text, Integer, JSON, ForeignKey, func
+from sqlalchemy import BigInteger, String, Text, Integer, JSON, ForeignKey, Index, and_, bindparam, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from bot.db.base import Base, TimestampMixin
@@ -9,11 +9,21 @@ from bot.db.base import Base, TimestampMixin
 
 class Ticket(Base, TimestampMixin):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Equality filter first, then the created_at range / sort
+        Index("ix_tickets_client_created", "client_telegram_id", "created_at"),
+        Index("ix_tickets_status_created", "status", "created_at"),
+        Index("ix_tickets_master_created", "assigned_master_id", "created_at"),
+        Index("ix_tickets_created_at", "created_at"),
+    )
+    # Load server-side created_at/updated_at via RETURNING on INSERT, so
+    # the stats rollup can read the creation day without another SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     ticket_id: Mapped[str] = mapped_column(String(30), unique=True, index=True)
 
-    client_telegram_id: Mapped[int] = mapped_column(BigInteger, index=True)
+    client_telegram_id: Mapped[int] = mapped_column(BigInteger)
     client_phone: Mapped[str] = mapped_column(String(20))
     client_full_name: Mapped[str] = mapped_column(String(255))
 
@@ -39,7 +49,7 @@ class Ticket(Base, TimestampMixin):
     key_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     key_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
-    status: Mapped[str] = mapped_column(String(30), default="new", index=True)
+    status: Mapped[str] = mapped_column(String(30), default="new")
     assigned_master_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("masters.id"), nullable=True
     )
@@ -50,3 +60,20 @@ class Ticket(Base, TimestampMixin):
     rated_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
 
     assigned_master = relationship("Master", foreign_keys=[assigned_master_id], lazy="joined")
+
+
+# Tickets waiting in the masters' "new tickets" inbox: open and unassigned.
+# The statuses are rendered as SQL literals, not bind parameters: Postgres
+# only uses a partial index when it can see that the query's WHERE implies
+# the index's, which it cannot prove for a prepared statement's generic plan.
+MASTER_INBOX = and_(
+    Ticket.status.in_(bindparam("inbox_statuses", ["new", "pending_approval"], expanding=True, literal_execute=True)),
+    Ticket.assigned_master_id.is_(None),
+)
+
+# Stays small however many tickets are closed; ordered like the inbox pages
+Index(
+    "ix_tickets_master_inbox",
+    Ticket.residential_complex, Ticket.created_at.desc(), Ticket.id.desc(),
+    postgresql_where=MASTER_INBOX, sqlite_where=MASTER_INBOX,
+)
@@ -0,0 +1,15 @@
+from datetime import date
+
+from sqlalchemy import Date, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.db.base import Base
+
+
+class TicketCounter(Base):
+    """Last allocated ticket number per day (the NNNN in QSS-YYYYMMDD-NNNN)."""
+
+    __tablename__ = "ticket_counters"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer)
@@ -0,0 +1,26 @@
+from datetime import date
+
+from sqlalchemy import Date, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.db.base import Base
+
+
+class TicketStatsDaily(Base):
+    """Ticket counts per local creation day and current complex/category/status/master.
+
+    Kept up to date by ``ticket_service``; ``scripts/rebuild_ticket_stats.py``
+    recomputes it from ``tickets``. ``master_id`` is 0 for unassigned tickets.
+    """
+
+    __tablename__ = "ticket_stats_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    residential_complex: Mapped[str] = mapped_column(String(50), primary_key=True)
+    category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    status: Mapped[str] = mapped_column(String(30), primary_key=True)
+    master_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
+
+    ticket_count: Mapped[int] = mapped_column(Integer, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0)
+    rated_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,17 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ALL = "*"  # payload: reload everything rather than named items
+MAX_PAYLOAD = 7900  # Postgres rejects NOTIFY payloads of 8000 bytes and more
+
+
+async def notify(session: AsyncSession, channel: str, payload: str = ALL) -> None:
+    """NOTIFY ``channel`` when the session's transaction commits (dropped on rollback).
+
+    SQLite has no NOTIFY, so this is a no-op there (tests).
+    """
+    if session.bind.dialect.name != "postgresql":
+        return
+    if len(payload.encode()) > MAX_PAYLOAD:
+        payload = ALL
+    await session.execute(select(func.pg_notify(channel, payload)))
@@ -1,7 +1,14 @@
+import json
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bot.db import dialect
 from bot.db.models.bot_text import BotText
+from bot.db.notify import ALL, notify
+
+# NOTIFY channel for text edits; the payload is a JSON list of keys or ALL
+CHANNEL = "bot_texts"
 
 
 async def get_by_key(session: AsyncSession, key: str, language: str = "ru") -> str | None:
@@ -29,6 +36,26 @@ async def get_all_as_dict(session: AsyncSession) -> dict[str, dict[str, str]]:
     return d
 
 
+async def get_by_keys(session: AsyncSession, keys: list[str]) -> dict[str, dict[str, str]]:
+    """Texts of the given keys as {key: {lang: value}}; keys without rows are absent."""
+    result = await session.execute(
+        select(BotText.key, BotText.language, BotText.value).where(BotText.key.in_(keys))
+    )
+    d: dict[str, dict[str, str]] = {}
+    for key, language, value in result:
+        d.setdefault(key, {})[language] = value
+    return d
+
+
+async def notify_changed(session: AsyncSession, keys: list[str] | None = None) -> None:
+    """Tell the bot processes which texts changed (None: possibly all of them).
+
+    Delivered when the transaction commits; too many keys for one
+    payload are sent as ALL.
+    """
+    await notify(session, CHANNEL, ALL if keys is None else json.dumps(sorted(set(keys))))
+
+
 async def upsert(
     session: AsyncSession,
     key: str,
@@ -53,6 +80,16 @@ async def upsert(
     return text
 
 
+async def insert_missing(session: AsyncSession, rows: list[dict]) -> int:
+    """Insert texts whose (key, language) has no row yet, in one statement; returns how many."""
+    if not rows:
+        return 0
+    stmt = dialect.insert(session, BotText).values(rows)
+    stmt = stmt.on_conflict_do_nothing(index_elements=[BotText.key, BotText.language]).returning(BotText.id)
+    result = await session.execute(stmt)
+    return len(result.all())
+
+
 async def update_value(session: AsyncSession, text_id: int, value: str) -> bool:
     """Update text value by ID."""
     result = await session.execute(
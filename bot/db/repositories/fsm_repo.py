@@ -0,0 +1,28 @@
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db import dialect
+from bot.db.models.fsm_state import FsmState
+
+
+async def get(session: AsyncSession, key: str) -> tuple[str | None, dict[str, Any]] | None:
+    """``(state, data)`` stored under ``key``, or None if there is no row."""
+    result = await session.execute(select(FsmState.state, FsmState.data).where(FsmState.key == key))
+    row = result.one_or_none()
+    return (row.state, row.data or {}) if row else None
+
+
+async def upsert(session: AsyncSession, key: str, **values: Any) -> None:
+    """Write ``state`` and/or ``data`` for ``key``; columns not given keep their value."""
+    stmt = dialect.insert(session, FsmState).values(key=key, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FsmState.key],
+        set_={**{name: getattr(stmt.excluded, name) for name in values}, "updated_at": func.now()},
+    )
+    await session.execute(stmt)
+
+
+async def delete_key(session: AsyncSession, key: str) -> None:
+    await session.execute(delete(FsmState).where(FsmState.key == key))
@@ -1,12 +1,18 @@
-from sqlalchemy import select
+from collections.abc import Iterable
+
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from bot.db.models.master import Master
+from bot.db.models.master_complex import MasterComplex
 
 
 async def get_by_telegram_id(session: AsyncSession, telegram_id: int) -> Master | None:
     result = await session.execute(
-        select(Master).where(Master.telegram_id == telegram_id, Master.is_active.is_(True))
+        select(Master)
+        .options(selectinload(Master.complexes))
+        .where(Master.telegram_id == telegram_id, Master.is_active.is_(True))
     )
     return result.scalar_one_or_none()
 
@@ -16,16 +22,44 @@ async def get_by_id(session: AsyncSession, master_id: int) -> Master | None:
     return result.scalar_one_or_none()
 
 
+async def get_with_complexes(session: AsyncSession, master_id: int) -> Master | None:
+    return await session.get(Master, master_id, options=[selectinload(Master.complexes)])
+
+
 async def get_by_complex(session: AsyncSession, residential_complex: str) -> list[Master]:
     result = await session.execute(
-        select(Master).where(
-            Master.residential_complex.contains(residential_complex),
+        select(Master)
+        .join(MasterComplex, MasterComplex.master_id == Master.id)
+        .where(
+            MasterComplex.residential_complex == residential_complex,
             Master.is_active.is_(True),
         )
     )
     return list(result.scalars().all())
 
 
+def set_complexes(master: Master, complexes: Iterable[str]) -> None:
+    """Replace the master's complexes (loaded, or a new master) and the display label."""
+    names = sorted({c.strip() for c in complexes if c.strip()})
+    # Keep rows that stay, so unchanged complexes are not deleted and re-inserted
+    kept = {c.residential_complex: c for c in (master.complexes if master.id else [])}
+    master.complexes = [kept.get(name) or MasterComplex(residential_complex=name) for name in names]
+    master.residential_complex = ",".join(names)
+
+
 async def get_all_active(session: AsyncSession) -> list[Master]:
     result = await session.execute(select(Master).where(Master.is_active.is_(True)))
     return list(result.scalars().all())
+
+
+async def count_all(session: AsyncSession) -> int:
+    return await session.scalar(select(func.count(Master.id)))
+
+
+async def get_names(session: AsyncSession, master_ids: list[int]) -> dict[int, str]:
+    if not master_ids:
+        return {}
+    result = await session.execute(
+        select(Master.id, Master.full_name).where(Master.id.in_(master_ids))
+    )
+    return dict(result.all())
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models.notification_outbox import NotificationOutbox
+from bot.utils.dates import db_now
+
+
+async def claim_due(session: AsyncSession, limit: int, lease: float) -> list[NotificationOutbox]:
+    """Lease up to ``limit`` due pending rows, oldest first.
+
+    Their ``next_attempt_at`` moves ``lease`` seconds ahead, so once the
+    caller commits no other worker picks them up, and no lock is held
+    while they are sent. Rows a dead worker never settled come due again
+    when the lease runs out. ``SKIP LOCKED`` keeps workers claiming at the
+    same moment apart.
+    """
+    due = (
+        select(NotificationOutbox.id)
+        .where(NotificationOutbox.status == "pending", NotificationOutbox.next_attempt_at <= db_now())
+        .order_by(NotificationOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(due.scalar_subquery()))
+        .values(next_attempt_at=db_now() + timedelta(seconds=lease))
+        .returning(NotificationOutbox)
+    )
+    return sorted(result.scalars().all(), key=lambda row: row.id)
+
+
+async def delete_by_ids(session: AsyncSession, ids: list[int]) -> None:
+    if ids:
+        await session.execute(delete(NotificationOutbox).where(NotificationOutbox.id.in_(ids)))
+
+
+def schedule_retry(row: NotificationOutbox, error: str | None, delay: float) -> None:
+    row.attempts += 1
+    row.last_error = error
+    row.next_attempt_at = db_now() + timedelta(seconds=delay)
+
+
+def mark_failed(row: NotificationOutbox, error: str | None) -> None:
+    row.attempts += 1
+    row.last_error = error
+    row.status = "failed"
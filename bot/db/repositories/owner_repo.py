@@ -1,4 +1,4 @@
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.db.models.owner import Owner
@@ -20,3 +20,7 @@ async def link_telegram_id(session: AsyncSession, owner_id: int, telegram_id: in
     await session.execute(
         update(Owner).where(Owner.id == owner_id).values(telegram_id=telegram_id)
     )
+
+
+async def count_all(session: AsyncSession) -> int:
+    return await session.scalar(select(func.count(Owner.id)))
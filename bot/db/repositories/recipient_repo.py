@@ -0,0 +1,62 @@
+from typing import NamedTuple
+
+from sqlalchemy import String, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db.models.admin import Admin
+from bot.db.models.master import Master
+from bot.db.models.master_complex import MasterComplex
+from bot.db.notify import notify
+
+# NOTIFY channel for changes to masters and admins (payload unused)
+CHANNEL = "recipients"
+
+
+class Recipient(NamedTuple):
+    """Enough of a master or admin to address a notification in their language."""
+
+    telegram_id: int
+    language: str
+
+
+async def new_ticket_recipients(
+    session: AsyncSession, residential_complex: str
+) -> tuple[list[Recipient], list[Recipient]]:
+    """Active masters of the complex and all admins, in one query (UNION ALL)."""
+    masters = (
+        select(literal("master").label("role"), Master.telegram_id, Master.language)
+        .join(MasterComplex, MasterComplex.master_id == Master.id)
+        .where(
+            MasterComplex.residential_complex == residential_complex,
+            Master.is_active.is_(True),
+        )
+    )
+    admins = select(literal("admin").label("role"), Admin.telegram_id, Admin.language)
+    result = await session.execute(union_all(masters, admins))
+    found: dict[str, list[Recipient]] = {"master": [], "admin": []}
+    for role, telegram_id, language in result:
+        found[role].append(Recipient(telegram_id, language))
+    return found["master"], found["admin"]
+
+
+async def get_all(session: AsyncSession) -> tuple[list[tuple[str, Recipient]], list[Recipient]]:
+    """Every (complex, active master) pair, and all admins, in one query."""
+    masters = (
+        select(MasterComplex.residential_complex, Master.telegram_id, Master.language)
+        .join(MasterComplex, MasterComplex.master_id == Master.id)
+        .where(Master.is_active.is_(True))
+    )
+    admins = select(literal(None, String).label("residential_complex"), Admin.telegram_id, Admin.language)
+    result = await session.execute(union_all(masters, admins))
+    found_masters, found_admins = [], []
+    for residential_complex, telegram_id, language in result:
+        if residential_complex is None:
+            found_admins.append(Recipient(telegram_id, language))
+        else:
+            found_masters.append((residential_complex, Recipient(telegram_id, language)))
+    return found_masters, found_admins
+
+
+async def notify_changed(session: AsyncSession) -> None:
+    """Tell the bot processes to reload their recipient directory once this commits."""
+    await notify(session, CHANNEL)
@@ -0,0 +1,176 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import NamedTuple
+
+from sqlalchemy import Select, delete, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.db import dialect
+from bot.db.models.ticket import Ticket
+from bot.db.models.ticket_stats import TicketStatsDaily
+from bot.utils.dates import local_date
+
+UNASSIGNED = 0
+
+DIMENSIONS = ("residential_complex", "category", "status", "master_id")
+
+_KEY_COLUMNS = ("day", *DIMENSIONS)
+
+
+class TicketFacts(NamedTuple):
+    """The ticket fields the rollup is keyed and aggregated on."""
+
+    created_at: datetime
+    residential_complex: str
+    category: str
+    status: str
+    assigned_master_id: int | None
+    rating: int | None
+
+    def key(self) -> tuple:
+        return (
+            local_date(self.created_at),
+            self.residential_complex,
+            self.category,
+            self.status,
+            self.assigned_master_id or UNASSIGNED,
+        )
+
+
+class StatsRow(NamedTuple):
+    value: str | int
+    tickets: int
+    rating_sum: int
+    rated_count: int
+
+    @property
+    def avg_rating(self) -> float | None:
+        return self.rating_sum / self.rated_count if self.rated_count else None
+
+
+_FACT_COLUMNS = (
+    Ticket.created_at,
+    Ticket.residential_complex,
+    Ticket.category,
+    Ticket.status,
+    Ticket.assigned_master_id,
+    Ticket.rating,
+)
+
+
+def facts_of(ticket: Ticket) -> TicketFacts:
+    return TicketFacts(*(getattr(ticket, col.key) for col in _FACT_COLUMNS))
+
+
+async def lock_facts(session: AsyncSession, ticket_pk: int) -> TicketFacts | None:
+    """Read a ticket's rollup fields, locking the row until commit.
+
+    The lock makes a concurrent change to the same ticket wait and then see
+    the committed values, so the rollup moves from the right bucket.
+    """
+    result = await session.execute(
+        select(*_FACT_COLUMNS).where(Ticket.id == ticket_pk).with_for_update()
+    )
+    row = result.one_or_none()
+    return TicketFacts(*row) if row else None
+
+
+def _deltas(facts: TicketFacts, sign: int) -> tuple[int, int, int]:
+    rated = facts.rating is not None
+    return sign, sign * (facts.rating or 0), sign * int(rated)
+
+
+async def _apply(session: AsyncSession, changes: dict[tuple, list[int]]) -> None:
+    rows = [
+        dict(zip(_KEY_COLUMNS, key), ticket_count=d[0], rating_sum=d[1], rated_count=d[2])
+        for key, d in changes.items()
+        if any(d)
+    ]
+    if not rows:
+        return
+    stmt = dialect.insert(session, TicketStatsDaily).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_KEY_COLUMNS),
+        set_={
+            name: getattr(TicketStatsDaily, name) + getattr(stmt.excluded, name)
+            for name in ("ticket_count", "rating_sum", "rated_count")
+        },
+    )
+    await session.execute(stmt)
+
+
+async def record(session: AsyncSession, old: TicketFacts | None, new: TicketFacts | None) -> None:
+    """Move a ticket's contribution from ``old`` to ``new`` in one statement.
+
+    ``old=None`` records a new ticket; both rows go into a single
+    multi-row UPSERT, merged first so no row is touched twice.
+    """
+    changes: dict[tuple, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for facts, sign in ((old, -1), (new, 1)):
+        if facts is not None:
+            for i, value in enumerate(_deltas(facts, sign)):
+                changes[facts.key()][i] += value
+    await _apply(session, changes)
+
+
+async def rebuild(session: AsyncSession) -> int:
+    """Recompute the whole rollup from ``tickets``. Returns the row count."""
+    changes: dict[tuple, list[int]] = defaultdict(lambda: [0, 0, 0])
+    result = await session.stream(select(*_FACT_COLUMNS).execution_options(yield_per=1000))
+    async for row in result:
+        facts = TicketFacts(*row)
+        for i, value in enumerate(_deltas(facts, 1)):
+            changes[facts.key()][i] += value
+
+    await session.execute(delete(TicketStatsDaily))
+    await _apply(session, changes)
+    return len(changes)
+
+
+def _in_period(q: Select, first: date | None, last: date | None) -> Select:
+    if first:
+        q = q.where(TicketStatsDaily.day >= first)
+    if last:
+        q = q.where(TicketStatsDaily.day <= last)
+    return q
+
+
+async def totals_by(
+    session: AsyncSession, dimension: str, first: date | None = None, last: date | None = None
+) -> list[StatsRow]:
+    """Ticket count and rating totals grouped by one dimension, largest first."""
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown stats dimension: {dimension}")
+    col = getattr(TicketStatsDaily, dimension)
+    tickets = func.sum(TicketStatsDaily.ticket_count)
+    q = (
+        select(
+            col,
+            tickets,
+            func.sum(TicketStatsDaily.rating_sum),
+            func.sum(TicketStatsDaily.rated_count),
+        )
+        .group_by(col)
+        .having(tickets != 0)
+        .order_by(desc(tickets), col)
+    )
+    result = await session.execute(_in_period(q, first, last))
+    return [StatsRow(*row) for row in result.all()]
+
+
+async def status_summary(
+    session: AsyncSession, first: date | None = None, last: date | None = None
+) -> dict[str, int]:
+    """Total tickets, and those new, in progress and completed or closed, read from the rollup."""
+    tickets = TicketStatsDaily.ticket_count
+    status = TicketStatsDaily.status
+    q = select(
+        func.coalesce(func.sum(tickets), 0).label("total"),
+        func.coalesce(func.sum(tickets).filter(status == "new"), 0).label("new"),
+        func.coalesce(func.sum(tickets).filter(status == "in_progress"), 0).label("in_progress"),
+        func.coalesce(
+            func.sum(tickets).filter(status.in_(["completed", "closed"])), 0
+        ).label("completed"),
+    )
+    result = await session.execute(_in_period(q, first, last))
+    return dict(result.one()._mapping)
@@ -1,11 +1,16 @@
-from datetime import datetime, date
+from datetime import date, timedelta
 
-from sqlalchemy import select, update, func, desc
+from sqlalchemy import Select, insert, literal, select, update, func, desc, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload
 
-from bot.db.models.ticket import Ticket
+from bot.db import dialect
+from bot.db.models.ticket import MASTER_INBOX, Ticket
+from bot.db.models.ticket_counter import TicketCounter
 from bot.db.models.ticket_history import TicketHistory
+from bot.utils.dates import day_range, day_start, local_today
+from bot.utils.ticket_id import format_ticket_id, ticket_id_sql
 
 
 async def create(session: AsyncSession, **kwargs) -> Ticket:
@@ -15,6 +20,112 @@ async def create(session: AsyncSession, **kwargs) -> Ticket:
     return ticket
 
 
+async def create_with_history(session: AsyncSession, values: dict, history: dict) -> Ticket:
+    """Insert a ticket numbered with the next number of the day, and its first history row.
+
+    On Postgres this is one statement: the counter UPSERT, the ticket and
+    the history INSERT chained as data-modifying CTEs. SQLite (tests)
+    can't INSERT inside WITH, so there they run one by one.
+    """
+    today = local_today()
+    if session.bind.dialect.name != "postgresql":
+        number = await next_daily_number(session, today)
+        ticket = await create(session, ticket_id=format_ticket_id(today, number), **values)
+        await add_history(session, ticket_pk=ticket.id, **history)
+        return ticket
+
+    counter = (
+        postgresql.insert(TicketCounter).values(day=today, last_value=1)
+        .on_conflict_do_update(
+            index_elements=[TicketCounter.day],
+            set_={"last_value": TicketCounter.last_value + 1},
+        )
+        .returning(TicketCounter.last_value)
+        .cte("counter")
+    )
+    ticket_columns = Ticket.__table__.c
+    # Python-side defaults (status="new") are not filled in for an INSERT
+    # nested in a CTE, so pass them as values.
+    values = {
+        **{c.name: c.default.arg for c in ticket_columns if c.default is not None and c.default.is_scalar},
+        **values,
+    }
+    ticket = (
+        insert(Ticket)
+        .from_select(
+            ["ticket_id", *values],
+            select(
+                ticket_id_sql(today, counter.c.last_value),
+                *(literal(value, ticket_columns[name].type) for name, value in values.items()),
+            ),
+        )
+        .returning(*ticket_columns)
+        .cte("ticket")
+    )
+    history_columns = TicketHistory.__table__.c
+    entry = (
+        insert(TicketHistory)
+        .from_select(
+            ["ticket_id", *history],
+            select(ticket.c.id, *(literal(value, history_columns[name].type) for name, value in history.items())),
+        )
+        .cte("history")
+    )
+    result = await session.execute(select(Ticket).from_statement(select(ticket).add_cte(entry)))
+    return result.scalar_one()
+
+
+def _paged(
+    q: Select, limit: int, offset: int = 0,
+    after_id: int | None = None, before_id: int | None = None,
+) -> tuple[Select, bool]:
+    """Order newest first and cut one page out of ``q``.
+
+    With a cursor the page is found by keyset on (created_at, id) — the id
+    of the last row shown (``after_id``) or the first one (``before_id``) —
+    so deep pages cost the same as the first. ``offset`` is only used
+    without a cursor. Returns the query and whether rows come back in
+    reverse (oldest first) order.
+    """
+    newest_first = (desc(Ticket.created_at), desc(Ticket.id))
+    cursor_id = after_id or before_id
+    if not cursor_id:
+        return q.order_by(*newest_first).limit(limit).offset(offset), False
+
+    anchor = aliased(Ticket)
+    anchor_created = select(anchor.created_at).where(anchor.id == cursor_id).scalar_subquery()
+    key = tuple_(Ticket.created_at, Ticket.id)
+    if after_id:
+        q = q.where(key < tuple_(anchor_created, cursor_id)).order_by(*newest_first)
+        return q.limit(limit), False
+    q = q.where(key > tuple_(anchor_created, cursor_id)).order_by(Ticket.created_at, Ticket.id)
+    return q.limit(limit), True
+
+
+async def _fetch_page(session: AsyncSession, q: Select, **page) -> list[Ticket]:
+    q, reverse = _paged(q, **page)
+    result = await session.execute(q)
+    tickets = list(result.scalars().all())
+    if reverse:
+        tickets.reverse()
+    return tickets
+
+
+async def _fetch_first_page_with_total(
+    session: AsyncSession, q: Select, limit: int
+) -> tuple[list[Ticket], int]:
+    """First page plus the total match count in one round trip.
+
+    ``COUNT(*) OVER ()`` is evaluated over the whole filtered set before
+    LIMIT, so every returned row carries the full count.
+    """
+    q, _ = _paged(q.add_columns(func.count().over().label("total")), limit)
+    rows = (await session.execute(q)).all()
+    if not rows:
+        return [], 0
+    return [row[0] for row in rows], rows[0].total
+
+
 async def get_by_id(session: AsyncSession, ticket_pk: int) -> Ticket | None:
     result = await session.execute(
         select(Ticket).options(joinedload(Ticket.assigned_master)).where(Ticket.id == ticket_pk)
@@ -30,84 +141,74 @@ async def get_by_ticket_id(session: AsyncSession, ticket_id: str) -> Ticket | No
 
 
 async def list_by_owner(
-    session: AsyncSession, telegram_id: int, limit: int = 20, offset: int = 0
+    session: AsyncSession, telegram_id: int, limit: int = 20, offset: int = 0,
+    after_id: int | None = None, before_id: int | None = None,
 ) -> list[Ticket]:
-    result = await session.execute(
-        select(Ticket)
-        .where(Ticket.client_telegram_id == telegram_id)
-        .order_by(desc(Ticket.created_at))
-        .limit(limit)
-        .offset(offset)
+    q = select(Ticket).where(Ticket.client_telegram_id == telegram_id)
+    return await _fetch_page(
+        session, q, limit=limit, offset=offset, after_id=after_id, before_id=before_id
     )
-    return list(result.scalars().all())
 
 
-async def count_by_owner(session: AsyncSession, telegram_id: int) -> int:
-    result = await session.execute(
-        select(func.count(Ticket.id)).where(Ticket.client_telegram_id == telegram_id)
-    )
-    return result.scalar_one()
+async def list_by_owner_with_total(
+    session: AsyncSession, telegram_id: int, limit: int = 20
+) -> tuple[list[Ticket], int]:
+    q = select(Ticket).where(Ticket.client_telegram_id == telegram_id)
+    return await _fetch_first_page_with_total(session, q, limit)
 
 
-async def count_by_master(
-    session: AsyncSession, master_id: int,
-    status: str | None = None, statuses: list[str] | None = None
-) -> int:
-    q = select(func.count(Ticket.id)).where(Ticket.assigned_master_id == master_id)
+def _master_filter(q: Select, master_id: int, status: str | None, statuses: list[str] | None) -> Select:
+    q = q.where(Ticket.assigned_master_id == master_id)
     if statuses:
         q = q.where(Ticket.status.in_(statuses))
     elif status:
         q = q.where(Ticket.status == status)
-    result = await session.execute(q)
-    return result.scalar_one()
+    return q
 
 
 async def list_by_master(
     session: AsyncSession, master_id: int,
     status: str | None = None, statuses: list[str] | None = None,
-    limit: int = 20, offset: int = 0
+    limit: int = 20, offset: int = 0,
+    after_id: int | None = None, before_id: int | None = None,
 ) -> list[Ticket]:
-    q = select(Ticket).where(Ticket.assigned_master_id == master_id)
-    if statuses:
-        q = q.where(Ticket.status.in_(statuses))
-    elif status:
-        q = q.where(Ticket.status == status)
-    q = q.order_by(desc(Ticket.created_at)).limit(limit).offset(offset)
-    result = await session.execute(q)
-    return list(result.scalars().all())
+    q = _master_filter(select(Ticket), master_id, status, statuses)
+    return await _fetch_page(
+        session, q, limit=limit, offset=offset, after_id=after_id, before_id=before_id
+    )
 
 
-async def count_new_for_master(
-    session: AsyncSession, residential_complexes: list[str]
-) -> int:
-    """Count NEW and PENDING_APPROVAL tickets (not assigned) for master's residential complexes."""
-    q = select(func.count(Ticket.id)).where(
-        Ticket.status.in_(["new", "pending_approval"]),
-        Ticket.assigned_master_id.is_(None),
-        Ticket.residential_complex.in_(residential_complexes),
-    )
-    result = await session.execute(q)
-    return result.scalar_one()
+async def list_by_master_with_total(
+    session: AsyncSession, master_id: int,
+    status: str | None = None, statuses: list[str] | None = None,
+    limit: int = 20,
+) -> tuple[list[Ticket], int]:
+    q = _master_filter(select(Ticket), master_id, status, statuses)
+    return await _fetch_first_page_with_total(session, q, limit)
+
+
+def _new_for_master_filter(q: Select, residential_complexes: list[str]) -> Select:
+    # Same predicate as the partial index ix_tickets_master_inbox, so it is used
+    return q.where(MASTER_INBOX, Ticket.residential_complex.in_(residential_complexes))
 
 
 async def list_new_for_master(
     session: AsyncSession, residential_complexes: list[str],
-    limit: int = 20, offset: int = 0
+    limit: int = 20, offset: int = 0,
+    after_id: int | None = None, before_id: int | None = None,
 ) -> list[Ticket]:
     """List NEW and PENDING_APPROVAL tickets (not assigned) for master's residential complexes."""
-    q = (
-        select(Ticket)
-        .where(
-            Ticket.status.in_(["new", "pending_approval"]),
-            Ticket.assigned_master_id.is_(None),
-            Ticket.residential_complex.in_(residential_complexes),
-        )
-        .order_by(desc(Ticket.created_at))
-        .limit(limit)
-        .offset(offset)
+    q = _new_for_master_filter(select(Ticket), residential_complexes)
+    return await _fetch_page(
+        session, q, limit=limit, offset=offset, after_id=after_id, before_id=before_id
     )
-    result = await session.execute(q)
-    return list(result.scalars().all())
+
+
+async def list_new_for_master_with_total(
+    session: AsyncSession, residential_complexes: list[str], limit: int = 20
+) -> tuple[list[Ticket], int]:
+    q = _new_for_master_filter(select(Ticket), residential_complexes)
+    return await _fetch_first_page_with_total(session, q, limit)
 
 
 async def list_filtered(
@@ -119,32 +220,40 @@ async def list_filtered(
     date_to: date | None = None,
     limit: int = 20,
     offset: int = 0,
+    after_id: int | None = None,
+    before_id: int | None = None,
 ) -> list[Ticket]:
-    q = select(Ticket)
-    if status:
-        q = q.where(Ticket.status == status)
-    if residential_complex:
-        q = q.where(Ticket.residential_complex == residential_complex)
-    if master_id:
-        q = q.where(Ticket.assigned_master_id == master_id)
-    if date_from:
-        q = q.where(func.date(Ticket.created_at) >= date_from)
-    if date_to:
-        q = q.where(func.date(Ticket.created_at) <= date_to)
-    q = q.order_by(desc(Ticket.created_at)).limit(limit).offset(offset)
-    result = await session.execute(q)
-    return list(result.scalars().all())
+    q = _filtered(
+        select(Ticket), status, residential_complex, master_id, date_from, date_to
+    )
+    return await _fetch_page(
+        session, q, limit=limit, offset=offset, after_id=after_id, before_id=before_id
+    )
 
 
-async def count_filtered(
+async def list_filtered_with_total(
     session: AsyncSession,
     status: str | None = None,
     residential_complex: str | None = None,
     master_id: int | None = None,
     date_from: date | None = None,
     date_to: date | None = None,
-) -> int:
-    q = select(func.count(Ticket.id))
+    limit: int = 20,
+) -> tuple[list[Ticket], int]:
+    q = _filtered(
+        select(Ticket), status, residential_complex, master_id, date_from, date_to
+    )
+    return await _fetch_first_page_with_total(session, q, limit)
+
+
+def _filtered(
+    q: Select,
+    status: str | None,
+    residential_complex: str | None,
+    master_id: int | None,
+    date_from: date | None,
+    date_to: date | None,
+) -> Select:
     if status:
         q = q.where(Ticket.status == status)
     if residential_complex:
@@ -152,11 +261,15 @@ async def count_filtered(
     if master_id:
         q = q.where(Ticket.assigned_master_id == master_id)
     if date_from:
-        q = q.where(func.date(Ticket.created_at) >= date_from)
+        q = q.where(Ticket.created_at >= day_start(date_from))
     if date_to:
-        q = q.where(func.date(Ticket.created_at) <= date_to)
-    result = await session.execute(q)
-    return result.scalar_one()
+        q = q.where(Ticket.created_at < day_start(date_to + timedelta(days=1)))
+    return q
+
+
+async def list_recent(session: AsyncSession, limit: int = 10) -> list[Ticket]:
+    result = await session.execute(select(Ticket).order_by(desc(Ticket.created_at)).limit(limit))
+    return list(result.scalars().all())
 
 
 async def update_status(session: AsyncSession, ticket_pk: int, new_status: str) -> None:
@@ -227,20 +340,27 @@ async def get_approving_master_id(session: AsyncSession, ticket_pk: int) -> int
 
 
 async def count_today_by_owner(session: AsyncSession, telegram_id: int) -> int:
-    today = date.today()
+    start, end = day_range(local_today())
     result = await session.execute(
         select(func.count(Ticket.id)).where(
             Ticket.client_telegram_id == telegram_id,
-            func.date(Ticket.created_at) == today,
+            Ticket.created_at >= start,
+            Ticket.created_at < end,
         )
     )
     return result.scalar_one()
 
 
-async def generate_ticket_id(session: AsyncSession) -> str:
-    today = date.today()
-    count = await session.execute(
-        select(func.count(Ticket.id)).where(func.date(Ticket.created_at) == today)
-    )
-    num = count.scalar_one() + 1
-    return f"QSS-{today.strftime('%Y%m%d')}-{num:04d}"
+async def next_daily_number(session: AsyncSession, day: date) -> int:
+    """Atomically allocate the next ticket number for the given day.
+
+    A single UPSERT ... RETURNING: concurrent transactions serialize on the
+    day's counter row, so numbers are never handed out twice.
+    """
+    stmt = dialect.insert(session, TicketCounter).values(day=day, last_value=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TicketCounter.day],
+        set_={"last_value": TicketCounter.last_value + 1},
+    ).returning(TicketCounter.last_value)
+    result = await session.execute(stmt)
+    return result.scalar_one()
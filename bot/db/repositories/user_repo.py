@@ -0,0 +1,36 @@
+from sqlalchemy import BigInteger, and_, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from bot.db.models.admin import Admin
+from bot.db.models.master import Master
+from bot.db.models.owner import Owner
+
+
+async def get_accounts_by_telegram_id(
+    session: AsyncSession, telegram_id: int
+) -> tuple[Admin | None, Master | None, Owner | None]:
+    """Load the admin, active master and active owner rows for a Telegram ID.
+
+    One statement: a single-row driver is LEFT JOINed to all three tables
+    (telegram_id is unique in each), so every row comes back fully mapped.
+    A master's complexes follow in a second query, only when there is one.
+    """
+    lookup = select(literal(telegram_id, BigInteger).label("telegram_id")).subquery("lookup")
+    stmt = (
+        select(Admin, Master, Owner)
+        .options(selectinload(Master.complexes))
+        .select_from(lookup)
+        .outerjoin(Admin, Admin.telegram_id == lookup.c.telegram_id)
+        .outerjoin(
+            Master,
+            and_(Master.telegram_id == lookup.c.telegram_id, Master.is_active.is_(True)),
+        )
+        .outerjoin(
+            Owner,
+            and_(Owner.telegram_id == lookup.c.telegram_id, Owner.is_active.is_(True)),
+        )
+    )
+    result = await session.execute(stmt)
+    admin, master, owner = result.one()
+    return admin, master, owner
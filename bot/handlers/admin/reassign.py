@@ -9,8 +9,11 @@ from bot.callbacks.admin_cb import AdminReassignCB
 from bot.db.repositories import ticket_repo, master_repo
 from bot.keyboards.admin_kb import admin_main_menu
 from bot.services.notification_service import notify_master_new_ticket
+from bot.services.outbox import OutboxWriter
+from bot.services.ticket_service import reassign_ticket
 from bot.services.text_service import get_text
 from bot.utils.formatting import format_ticket_card
+from bot.utils.language import get_user_language
 
 logger = logging.getLogger(__name__)
 
@@ -36,15 +39,17 @@ async def reassign_master(
         return
 
     try:
-        await ticket_repo.reassign_master(session, ticket.id, master.id)
-        await ticket_repo.add_history(
+        await reassign_ticket(
             session,
             ticket_pk=ticket.id,
-            old_status=ticket.status,
-            new_status=ticket.status,
+            master_id=master.id,
+            current_status=ticket.status,
             changed_by_id=callback.from_user.id,
-            changed_by_role="admin",
-            comment=f"Мастер изменен на: {master.full_name}",
+            master_name=master.full_name,
+        )
+        card = format_ticket_card(ticket)
+        await notify_master_new_ticket(
+            OutboxWriter(session), master.telegram_id, card, ticket.id, recipient_lang=get_user_language(master),
         )
         await session.commit()
     except Exception:
@@ -53,10 +58,6 @@ async def reassign_master(
         await callback.answer(text, show_alert=True)
         return
 
-    card = format_ticket_card(ticket)
-    from bot.utils.language import get_user_language
-    await notify_master_new_ticket(bot, master.telegram_id, card, ticket.id, recipient_lang=get_user_language(master))
-
     text = await get_text(session, "admin_master_reassigned", ticket_id=ticket.ticket_id, master_name=master.full_name)
     await callback.message.edit_text(text, reply_markup=admin_main_menu())
     text = await get_text(session, "admin_master_assigned")
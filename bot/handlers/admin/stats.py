@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from aiogram.types import CallbackQuery
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.handlers.admin import admin_router as router
+from bot.callbacks.admin_cb import AdminStatsCB
+from bot.db.repositories import master_repo, stats_repo
+from bot.keyboards.admin_kb import stats_period_keyboard
+from bot.services.text_service import get_text
+from bot.utils.constants import CATEGORY_DISPLAY, COMPLEX_DISPLAY, STATUS_DISPLAY
+from bot.utils.dates import local_today
+from bot.utils.formatting import format_stats_lines
+
+
+@router.callback_query(AdminStatsCB.filter())
+async def show_stats(callback: CallbackQuery, callback_data: AdminStatsCB, session: AsyncSession, **kwargs):
+    # Reads only the daily rollup: cost depends on days × dimensions, not on tickets
+    date_to = local_today()
+    date_from = date_to - timedelta(days=max(callback_data.days, 1) - 1)
+    period = dict(date_from=date_from.strftime("%d.%m.%Y"), date_to=date_to.strftime("%d.%m.%Y"))
+
+    by_status = await stats_repo.totals_by(session, "status", date_from, date_to)
+    total = sum(row.tickets for row in by_status)
+    if not total:
+        text = await get_text(session, "admin_stats_empty", **period)
+        await callback.message.edit_text(text, reply_markup=stats_period_keyboard(callback_data.days))
+        await callback.answer()
+        return
+
+    by_complex = await stats_repo.totals_by(session, "residential_complex", date_from, date_to)
+    by_category = await stats_repo.totals_by(session, "category", date_from, date_to)
+    by_master = await stats_repo.totals_by(session, "master_id", date_from, date_to)
+
+    master_names = await master_repo.get_names(
+        session, [row.value for row in by_master if row.value != stats_repo.UNASSIGNED]
+    )
+    master_names[stats_repo.UNASSIGNED] = await get_text(session, "admin_stats_unassigned")
+
+    text = await get_text(
+        session, "admin_stats",
+        total=total,
+        by_status=format_stats_lines(by_status, STATUS_DISPLAY),
+        by_complex=format_stats_lines(by_complex, COMPLEX_DISPLAY),
+        by_category=format_stats_lines(by_category, CATEGORY_DISPLAY),
+        by_master=format_stats_lines(by_master, master_names, show_rating=True),
+        **period,
+    )
+    await callback.message.edit_text(text, reply_markup=stats_period_keyboard(callback_data.days))
+    await callback.answer()
@@ -12,7 +12,8 @@ from bot.db.repositories import ticket_repo, owner_repo
 from bot.utils.attachments import send_ticket_attachments
 from bot.utils.formatting import format_ticket_card, format_history
 from bot.utils.language import get_user_language
-from bot.services.ticket_service import change_status
+from bot.services.outbox import OutboxWriter
+from bot.services.ticket_service import assign_master, change_status
 from bot.services.text_service import get_text
 from bot.services.notification_service import notify_owner_car_plate_decision, notify_master_car_plate_in_progress
 
@@ -119,21 +120,22 @@ async def handle_admin_car_plate_decision(
 
         # Assign ticket to the approving master
         if master:
-            await ticket_repo.reassign_master(session, ticket.id, master.id)
+            await assign_master(session, ticket.id, master.id)
 
-        await session.commit()
+        outbox = OutboxWriter(session)
 
         # Notify owner about approval
         owner = await owner_repo.get_by_telegram_id(session, ticket.client_telegram_id)
         owner_lang = get_user_language(owner)
-        await notify_owner_car_plate_decision(bot, ticket.client_telegram_id, ticket.ticket_id, True, recipient_lang=owner_lang)
+        await notify_owner_car_plate_decision(outbox, ticket.client_telegram_id, ticket.ticket_id, True, recipient_lang=owner_lang)
 
         # Notify master that ticket is now in progress for them to add car plate
         if master:
-            from bot.utils.formatting import format_ticket_card
             card = format_ticket_card(ticket)
             master_lang = get_user_language(master)
-            await notify_master_car_plate_in_progress(bot, master.telegram_id, card, ticket.id, recipient_lang=master_lang)
+            await notify_master_car_plate_in_progress(outbox, master.telegram_id, card, ticket.id, recipient_lang=master_lang)
+
+        await session.commit()
 
         text = await get_text(session, "admin_car_plate_approved", ticket_id=ticket.ticket_id)
         await callback.message.edit_text(text, reply_markup=admin_main_menu())
@@ -150,11 +152,13 @@ async def handle_admin_car_plate_decision(
             changed_by_role="admin",
             comment="Администратор отклонил заявку на госномер",
         )
-        await session.commit()
 
         owner = await owner_repo.get_by_telegram_id(session, ticket.client_telegram_id)
         owner_lang = get_user_language(owner)
-        await notify_owner_car_plate_decision(bot, ticket.client_telegram_id, ticket.ticket_id, False, recipient_lang=owner_lang)
+        await notify_owner_car_plate_decision(
+            OutboxWriter(session), ticket.client_telegram_id, ticket.ticket_id, False, recipient_lang=owner_lang,
+        )
+        await session.commit()
 
         text = await get_text(session, "admin_car_plate_rejected", ticket_id=ticket.ticket_id)
         await callback.message.edit_text(text, reply_markup=admin_main_menu())
@@ -1,4 +1,4 @@
-from datetime import date, timedelta
+from datetime import timedelta
 
 from aiogram import F
 from aiogram.types import CallbackQuery
@@ -11,7 +11,8 @@ from bot.callbacks.navigation_cb import PageCB, AdminMenuCB
 from bot.keyboards.admin_kb import admin_ticket_list, admin_main_menu
 from bot.db.repositories import ticket_repo
 from bot.services.text_service import get_text
-from bot.utils.pagination import paginate
+from bot.utils.dates import local_today
+from bot.utils.pagination import PER_PAGE, keyset_args, page_count
 
 
 @router.callback_query(AdminMenuCB.filter(F.action == "all"))
@@ -45,10 +46,12 @@ async def admin_filter(callback: CallbackQuery, callback_data: AdminFilterCB, se
 
 @router.callback_query(PageCB.filter(F.scope == "admin_tickets"))
 async def paginate_admin_tickets(callback: CallbackQuery, callback_data: PageCB, session: AsyncSession, state: FSMContext, **kwargs):
-    await _show_admin_tickets(callback, session, state, page=callback_data.page)
+    await _show_admin_tickets(callback, session, state, page=callback_data.page, cursor=callback_data)
 
 
-async def _show_admin_tickets(callback: CallbackQuery, session: AsyncSession, state: FSMContext, page: int):
+async def _show_admin_tickets(
+    callback: CallbackQuery, session: AsyncSession, state: FSMContext, page: int, cursor: PageCB | None = None
+):
     data = await state.get_data()
     status = data.get("admin_filter_status")
     residential_complex = data.get("admin_filter_complex")
@@ -57,7 +60,7 @@ async def _show_admin_tickets(callback: CallbackQuery, session: AsyncSession, st
 
     date_from = None
     date_to = None
-    today = date.today()
+    today = local_today()
     if date_filter == "today":
         date_from = today
         date_to = today
@@ -68,14 +71,22 @@ async def _show_admin_tickets(callback: CallbackQuery, session: AsyncSession, st
         date_from = today - timedelta(days=30)
         date_to = today
 
-    total = await ticket_repo.count_filtered(
-        session,
+    filters = dict(
         status=status,
         residential_complex=residential_complex,
         master_id=master_id,
         date_from=date_from,
         date_to=date_to,
     )
+    if cursor and cursor.total:
+        total = cursor.total
+        tickets = await ticket_repo.list_filtered(session, **filters, limit=PER_PAGE, **keyset_args(cursor))
+        if not tickets:
+            await _show_admin_tickets(callback, session, state, page=1)
+            return
+    else:
+        page = 1
+        tickets, total = await ticket_repo.list_filtered_with_total(session, **filters, limit=PER_PAGE)
 
     if total == 0:
         text = await get_text(session, "admin_no_tickets")
@@ -83,17 +94,8 @@ async def _show_admin_tickets(callback: CallbackQuery, session: AsyncSession, st
         await callback.answer()
         return
 
-    offset, limit, total_pages = paginate(total, page)
-    tickets = await ticket_repo.list_filtered(
-        session,
-        status=status,
-        residential_complex=residential_complex,
-        master_id=master_id,
-        date_from=date_from,
-        date_to=date_to,
-        limit=limit,
-        offset=offset,
-    )
+    total_pages = page_count(total)
+    page = min(page, total_pages)
 
     filter_desc = ""
     if status:
@@ -107,5 +109,5 @@ async def _show_admin_tickets(callback: CallbackQuery, session: AsyncSession, st
         filter_desc += f" ({date_labels.get(date_filter, date_filter)})"
 
     text = await get_text(session, "admin_tickets_page", filter=filter_desc, page=page, total=total_pages)
-    await callback.message.edit_text(text, reply_markup=admin_ticket_list(tickets, page, total_pages))
+    await callback.message.edit_text(text, reply_markup=admin_ticket_list(tickets, page, total_pages, total))
     await callback.answer()
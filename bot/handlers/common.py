@@ -6,11 +6,13 @@ from aiogram.types import Message, ReplyKeyboardRemove, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bot.db.repositories import recipient_repo
 from bot.keyboards.common import contact_keyboard, language_selector
 from bot.keyboards.owner_kb import owner_main_menu
 from bot.keyboards.master_kb import master_main_menu
 from bot.keyboards.admin_kb import admin_main_menu
 from bot.services.auth_service import authenticate_by_phone
+from bot.services.role_cache import notify_roles_changed, role_cache
 from bot.services.text_service import get_text
 from bot.states.auth import AuthState
 from bot.utils.constants import UserRole
@@ -81,6 +83,10 @@ async def process_contact(
         lang = data.get("chosen_language", "ru")
         if hasattr(user_obj, "language"):
             user_obj.language = lang
+            role_cache.invalidate(telegram_id)
+            await notify_roles_changed(session, telegram_id)
+            if role in (UserRole.MASTER, UserRole.ADMIN):
+                await recipient_repo.notify_changed(session)
         current_language.set(lang)
 
         await state.clear()
@@ -167,6 +173,11 @@ async def change_language_cb(
     # Save language to DB
     if user_obj and hasattr(user_obj, "language"):
         user_obj.language = lang
+        role_cache.invalidate(callback.from_user.id)
+        await notify_roles_changed(session, callback.from_user.id)
+        if user_role in (UserRole.MASTER, UserRole.ADMIN):
+            # Notifications are sent in the recipient's language
+            await recipient_repo.notify_changed(session)
 
     # Show updated menu
     if user_role == UserRole.ADMIN:
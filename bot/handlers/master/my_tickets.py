@@ -11,7 +11,7 @@ from bot.keyboards.master_kb import master_ticket_list, master_main_menu, master
 from bot.db.repositories import ticket_repo
 from bot.services.text_service import get_text
 from bot.utils.attachments import send_ticket_attachments
-from bot.utils.pagination import paginate
+from bot.utils.pagination import PER_PAGE, keyset_args, page_count
 from bot.utils.constants import STATUS_DISPLAY
 from bot.utils.formatting import format_ticket_card
 
@@ -41,41 +41,43 @@ async def paginate_master_tickets(callback: CallbackQuery, callback_data: PageCB
     page = callback_data.page
 
     if scope == "master_new":
-        await _show_new_tickets_by_complex(callback, session, user_obj, page=page)
+        await _show_new_tickets_by_complex(callback, session, user_obj, page=page, cursor=callback_data)
         return
 
     if scope == "master_completed":
         # Show both "completed" and "closed" (rated) tickets
-        await _show_master_tickets(callback, session, user_obj, statuses=["completed", "closed"], scope=scope, page=page)
+        await _show_master_tickets(callback, session, user_obj, statuses=["completed", "closed"], scope=scope, page=page, cursor=callback_data)
         return
 
     if scope == "master_active":
-        await _show_master_tickets(callback, session, user_obj, statuses=["in_progress", "master_approved", "master_rejected"], scope=scope, page=page)
+        await _show_master_tickets(callback, session, user_obj, statuses=["in_progress", "master_approved", "master_rejected"], scope=scope, page=page, cursor=callback_data)
         return
 
-    await _show_master_tickets(callback, session, user_obj, status="in_progress", scope=scope, page=page)
+    await _show_master_tickets(callback, session, user_obj, status="in_progress", scope=scope, page=page, cursor=callback_data)
 
 
-def _parse_master_complexes(user_obj) -> list[str]:
-    if not user_obj or not user_obj.residential_complex:
-        return []
-    return [c.strip() for c in user_obj.residential_complex.split(",") if c.strip()]
-
-
-async def _show_new_tickets_by_complex(callback, session, user_obj, page=1):
+async def _show_new_tickets_by_complex(callback, session, user_obj, page=1, cursor: PageCB | None = None):
     if not user_obj:
         text = await get_text(session, "error_auth")
         await callback.answer(text, show_alert=True)
         return
 
-    complexes = _parse_master_complexes(user_obj)
+    complexes = user_obj.complex_names
     if not complexes:
         text = await get_text(session, "master_no_complexes")
         await callback.message.edit_text(text, reply_markup=master_main_menu())
         await callback.answer()
         return
 
-    total = await ticket_repo.count_new_for_master(session, complexes)
+    if cursor and cursor.total:
+        total = cursor.total
+        tickets = await ticket_repo.list_new_for_master(session, complexes, limit=PER_PAGE, **keyset_args(cursor))
+        if not tickets:
+            await _show_new_tickets_by_complex(callback, session, user_obj)
+            return
+    else:
+        page = 1
+        tickets, total = await ticket_repo.list_new_for_master_with_total(session, complexes, limit=PER_PAGE)
 
     if total == 0:
         text = await get_text(session, "master_no_new")
@@ -83,21 +85,33 @@ async def _show_new_tickets_by_complex(callback, session, user_obj, page=1):
         await callback.answer()
         return
 
-    offset, limit, total_pages = paginate(total, page)
-    tickets = await ticket_repo.list_new_for_master(session, complexes, limit=limit, offset=offset)
+    total_pages = page_count(total)
+    page = min(page, total_pages)
 
     text = await get_text(session, "master_new_tickets", page=page, total=total_pages)
-    await callback.message.edit_text(text, reply_markup=master_ticket_list(tickets, page, total_pages, "master_new"))
+    await callback.message.edit_text(text, reply_markup=master_ticket_list(tickets, page, total_pages, "master_new", total))
     await callback.answer()
 
 
-async def _show_master_tickets(callback, session, user_obj, scope, page=1, status=None, statuses=None):
+async def _show_master_tickets(callback, session, user_obj, scope, page=1, status=None, statuses=None, cursor: PageCB | None = None):
     if not user_obj:
         text = await get_text(session, "error_auth")
         await callback.answer(text, show_alert=True)
         return
 
-    total = await ticket_repo.count_by_master(session, user_obj.id, status=status, statuses=statuses)
+    if cursor and cursor.total:
+        total = cursor.total
+        tickets = await ticket_repo.list_by_master(
+            session, user_obj.id, status=status, statuses=statuses, limit=PER_PAGE, **keyset_args(cursor)
+        )
+        if not tickets:
+            await _show_master_tickets(callback, session, user_obj, scope, status=status, statuses=statuses)
+            return
+    else:
+        page = 1
+        tickets, total = await ticket_repo.list_by_master_with_total(
+            session, user_obj.id, status=status, statuses=statuses, limit=PER_PAGE
+        )
 
     # Determine display name for the scope
     scope_display = {
@@ -112,12 +126,12 @@ async def _show_master_tickets(callback, session, user_obj, scope, page=1, statu
         await callback.answer()
         return
 
-    offset, limit, total_pages = paginate(total, page)
-    tickets = await ticket_repo.list_by_master(session, user_obj.id, status=status, statuses=statuses, limit=limit, offset=offset)
+    total_pages = page_count(total)
+    page = min(page, total_pages)
 
     status_name = scope_display.get(scope) or STATUS_DISPLAY.get(status, status)
     text = await get_text(session, "master_tickets_page", status=status_name, page=page, total=total_pages)
-    await callback.message.edit_text(text, reply_markup=master_ticket_list(tickets, page, total_pages, scope))
+    await callback.message.edit_text(text, reply_markup=master_ticket_list(tickets, page, total_pages, scope, total))
     await callback.answer()
 
 
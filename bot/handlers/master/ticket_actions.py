@@ -7,7 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from bot.handlers.master import master_router as router
 from bot.callbacks.ticket_cb import MasterActionCB, CarPlateApprovalCB
 from bot.db.repositories import ticket_repo, owner_repo
-from bot.services.ticket_service import change_status
+from bot.services.outbox import OutboxWriter
+from bot.services.ticket_service import assign_master, change_status
 from bot.utils.language import get_user_language
 from bot.services.text_service import get_text
 from bot.services.notification_service import (
@@ -56,7 +57,15 @@ async def handle_master_action(
             )
 
             if not ticket.assigned_master_id and user_obj:
-                await ticket_repo.reassign_master(session, ticket.id, user_obj.id)
+                await assign_master(session, ticket.id, user_obj.id)
+
+            master_name = user_obj.full_name if user_obj else "мастер"
+            owner = await owner_repo.get_by_telegram_id(session, ticket.client_telegram_id)
+            owner_lang = get_user_language(owner)
+            await notify_owner_status_changed(
+                OutboxWriter(session), ticket.client_telegram_id, ticket.ticket_id,
+                "in_progress", master_name=master_name, recipient_lang=owner_lang,
+            )
 
             await session.commit()
         except Exception:
@@ -65,14 +74,6 @@ async def handle_master_action(
             await callback.answer(text, show_alert=True)
             return
 
-        master_name = user_obj.full_name if user_obj else "мастер"
-        owner = await owner_repo.get_by_telegram_id(session, ticket.client_telegram_id)
-        owner_lang = get_user_language(owner)
-        await notify_owner_status_changed(
-            bot, ticket.client_telegram_id, ticket.ticket_id,
-            "in_progress", master_name=master_name, recipient_lang=owner_lang,
-        )
-
         text = await get_text(session, "master_ticket_accepted", ticket_id=ticket.ticket_id)
         await callback.message.edit_text(text, reply_markup=master_main_menu())
         toast = await get_text(session, "toast_ticket_accepted")
@@ -94,6 +95,13 @@ async def handle_master_action(
                 changed_by_role="master",
                 comment="Мастер выполнил заявку",
             )
+
+            owner = await owner_repo.get_by_telegram_id(session, ticket.client_telegram_id)
+            owner_lang = get_user_language(owner)
+            await notify_owner_completed(
+                OutboxWriter(session), ticket.client_telegram_id, ticket.ticket_id, ticket.id,
+                recipient_lang=owner_lang,
+            )
             await session.commit()
         except Exception:
             logger.exception("Failed to complete ticket %s", ticket.ticket_id)
@@ -101,13 +109,6 @@ async def handle_master_action(
             await callback.answer(text, show_alert=True)
             return
 
-        owner = await owner_repo.get_by_telegram_id(session, ticket.client_telegram_id)
-        owner_lang = get_user_language(owner)
-        await notify_owner_completed(
-            bot, ticket.client_telegram_id, ticket.ticket_id, ticket.id,
-            recipient_lang=owner_lang,
-        )
-
         text = await get_text(session, "master_ticket_completed", ticket_id=ticket.ticket_id)
         await callback.message.edit_text(text, reply_markup=master_main_menu())
         toast = await get_text(session, "toast_ticket_completed")
@@ -155,13 +156,14 @@ async def handle_car_plate_approval(
 
         # Assign ticket to this master so it appears in their active list
         if user_obj:
-            await ticket_repo.reassign_master(session, ticket.id, user_obj.id)
-
-        await session.commit()
+            await assign_master(session, ticket.id, user_obj.id)
 
         card = format_ticket_card(ticket)
         contract_photo = getattr(ticket, "parking_contract_photo", None)
-        await notify_admin_car_plate_review(bot, session, card, ticket.id, "approve", contract_photo=contract_photo)
+        await notify_admin_car_plate_review(
+            OutboxWriter(session), session, card, ticket.id, "approve", contract_photo=contract_photo,
+        )
+        await session.commit()
 
         text = await get_text(session, "master_car_plate_approved", ticket_id=ticket.ticket_id)
         await callback.message.edit_text(text, reply_markup=master_main_menu())
@@ -178,11 +180,13 @@ async def handle_car_plate_approval(
             changed_by_role="master",
             comment="Мастер отклонил заявку на госномер",
         )
-        await session.commit()
 
         card = format_ticket_card(ticket)
         contract_photo = getattr(ticket, "parking_contract_photo", None)
-        await notify_admin_car_plate_review(bot, session, card, ticket.id, "reject", contract_photo=contract_photo)
+        await notify_admin_car_plate_review(
+            OutboxWriter(session), session, card, ticket.id, "reject", contract_photo=contract_photo,
+        )
+        await session.commit()
 
         text = await get_text(session, "master_car_plate_rejected", ticket_id=ticket.ticket_id)
         await callback.message.edit_text(text, reply_markup=master_main_menu())
@@ -27,6 +27,8 @@ from bot.utils.constants import (
 )
 from bot.utils.formatting import format_ticket_confirmation
 from bot.services import ticket_service, notification_service
+from bot.services.outbox import OutboxWriter
+from bot.services.recipient_directory import recipient_directory
 from bot.services.text_service import get_text
 from bot.db.repositories import owner_repo
 
@@ -431,8 +433,8 @@ async def process_confirm(
     data = await state.get_data()
 
     # Find all masters for this complex (for notifications only, NOT for assignment)
-    from bot.db.repositories import master_repo
-    masters = await master_repo.get_by_complex(session, data["residential_complex"])
+    # and all admins, from the in-memory directory
+    masters, admins = await recipient_directory.new_ticket_recipients(session, data["residential_complex"])
 
     # Do NOT auto-assign master - master will accept the ticket themselves
 
@@ -442,6 +444,17 @@ async def process_confirm(
 
     try:
         ticket = await ticket_service.create_ticket(session, data)
+
+        # Queue notifications to ALL masters for this complex and all admins;
+        # the outbox worker sends them only if the ticket is committed
+        from bot.utils.formatting import format_ticket_card
+        card = format_ticket_card(ticket)
+        contract_photo = getattr(ticket, "parking_contract_photo", None)
+        outbox = OutboxWriter(session)
+        await notification_service.notify_masters_new_ticket(
+            outbox, masters, card, ticket.id, is_car_plate=is_car_plate, contract_photo=contract_photo,
+        )
+        await notification_service.notify_admins_new_ticket(outbox, session, card, admins=admins)
         await session.commit()
     except Exception:
         logger.exception("Failed to create ticket for user %s", callback.from_user.id)
@@ -457,28 +470,5 @@ async def process_confirm(
         text = await get_text(session, "create_submitted", ticket_id=ticket.ticket_id)
 
     await callback.message.edit_text(text, reply_markup=owner_main_menu())
-
-    # Notify ALL masters for this complex
-    if masters:
-        from bot.utils.formatting import format_ticket_card
-        card = format_ticket_card(ticket)
-        contract_photo = getattr(ticket, "parking_contract_photo", None)
-        for master in masters:
-            from bot.utils.language import get_user_language
-            master_lang = get_user_language(master)
-            if is_car_plate:
-                await notification_service.notify_master_car_plate_approval(
-                    bot, master.telegram_id, card, ticket.id, contract_photo=contract_photo,
-                    recipient_lang=master_lang,
-                )
-            else:
-                await notification_service.notify_master_new_ticket(
-                    bot, master.telegram_id, card, ticket.id, recipient_lang=master_lang,
-                )
-
-    from bot.utils.formatting import format_ticket_card
-    card = format_ticket_card(ticket)
-    await notification_service.notify_admins_new_ticket(bot, session, card)
-
     toast = await get_text(session, "toast_ticket_submitted")
     await callback.answer(toast)
@@ -8,7 +8,7 @@ from bot.callbacks.navigation_cb import PageCB, OwnerMenuCB, MenuCB
 from bot.keyboards.owner_kb import owner_main_menu, ticket_list_keyboard
 from bot.db.repositories import ticket_repo
 from bot.services.text_service import get_text
-from bot.utils.pagination import paginate, PER_PAGE
+from bot.utils.pagination import PER_PAGE, keyset_args, page_count
 from bot.utils.constants import INSTRUCTION_HIK_CONNECT, INSTRUCTION_EASYVIEWER
 
 
@@ -20,24 +20,34 @@ async def my_tickets(callback: CallbackQuery, session: AsyncSession, **kwargs):
 
 @router.callback_query(PageCB.filter(F.scope == "owner_tickets"))
 async def paginate_tickets(callback: CallbackQuery, callback_data: PageCB, session: AsyncSession, **kwargs):
-    await _show_tickets_page(callback, session, page=callback_data.page)
+    await _show_tickets_page(callback, session, page=callback_data.page, cursor=callback_data)
     await callback.answer()
 
 
-async def _show_tickets_page(callback: CallbackQuery, session: AsyncSession, page: int):
+async def _show_tickets_page(callback: CallbackQuery, session: AsyncSession, page: int, cursor: PageCB | None = None):
     tg_id = callback.from_user.id
-    total = await ticket_repo.count_by_owner(session, tg_id)
+    if cursor and cursor.total:
+        # Later pages reuse the count carried in the callback
+        total = cursor.total
+        tickets = await ticket_repo.list_by_owner(session, tg_id, limit=PER_PAGE, **keyset_args(cursor))
+        if not tickets:
+            # The list changed under the cursor — start over
+            await _show_tickets_page(callback, session, page=1)
+            return
+    else:
+        page = 1
+        tickets, total = await ticket_repo.list_by_owner_with_total(session, tg_id, limit=PER_PAGE)
 
     if total == 0:
         text = await get_text(session, "owner_no_tickets")
         await callback.message.edit_text(text, reply_markup=owner_main_menu())
         return
 
-    offset, limit, total_pages = paginate(total, page)
-    tickets = await ticket_repo.list_by_owner(session, tg_id, limit=limit, offset=offset)
+    total_pages = page_count(total)
+    page = min(page, total_pages)
 
     text = await get_text(session, "owner_tickets_page", page=page, total=total_pages)
-    await callback.message.edit_text(text, reply_markup=ticket_list_keyboard(tickets, page, total_pages))
+    await callback.message.edit_text(text, reply_markup=ticket_list_keyboard(tickets, page, total_pages, total))
 
 
 @router.callback_query(OwnerMenuCB.filter(F.action == "instructions"))
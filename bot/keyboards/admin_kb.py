@@ -1,7 +1,8 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
-from bot.callbacks.admin_cb import AdminFilterCB, AdminTicketCB, AdminReassignCB
-from bot.callbacks.navigation_cb import PageCB, AdminMenuCB, MenuCB
+from bot.callbacks.admin_cb import AdminFilterCB, AdminTicketCB, AdminReassignCB, AdminStatsCB
+from bot.callbacks.navigation_cb import AdminMenuCB, MenuCB
+from bot.keyboards.common import page_nav_row
 from bot.utils.constants import (
     ResidentialComplex, COMPLEX_DISPLAY, STATUS_DISPLAY, TicketStatus,
 )
@@ -21,6 +22,7 @@ def admin_main_menu() -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="Фильтр по ЖК", callback_data=AdminMenuCB(action="filter_complex").pack())],
         [InlineKeyboardButton(text="Фильтр по мастеру", callback_data=AdminMenuCB(action="filter_master").pack())],
         [InlineKeyboardButton(text="Фильтр по дате", callback_data=AdminMenuCB(action="filter_date").pack())],
+        [InlineKeyboardButton(text="Статистика", callback_data=AdminStatsCB(days=30).pack())],
         [InlineKeyboardButton(text="Тіл / Язык", callback_data=AdminMenuCB(action="change_lang").pack())],
     ])
 
@@ -60,7 +62,21 @@ def date_filter_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
-def admin_ticket_list(tickets: list, page: int, total_pages: int) -> InlineKeyboardMarkup:
+def stats_period_keyboard(days: int) -> InlineKeyboardMarkup:
+    periods = [(7, "7 дней"), (30, "30 дней"), (90, "90 дней")]
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=f"• {label} •" if period == days else label,
+                callback_data=AdminStatsCB(days=period).pack(),
+            )
+            for period, label in periods
+        ],
+        [InlineKeyboardButton(text="Назад", callback_data=MenuCB(action="admin").pack())],
+    ])
+
+
+def admin_ticket_list(tickets: list, page: int, total_pages: int, total: int = 0) -> InlineKeyboardMarkup:
     buttons = []
     for t in tickets:
         status_txt = STATUS_DISPLAY.get(t.status, t.status)
@@ -70,17 +86,7 @@ def admin_ticket_list(tickets: list, page: int, total_pages: int) -> InlineKeybo
                 callback_data=AdminTicketCB(action="view", ticket_pk=t.id).pack(),
             )
         ])
-    nav = []
-    if page > 1:
-        nav.append(InlineKeyboardButton(
-            text="◀ Назад",
-            callback_data=PageCB(scope="admin_tickets", page=page - 1).pack(),
-        ))
-    if page < total_pages:
-        nav.append(InlineKeyboardButton(
-            text="Вперед ▶",
-            callback_data=PageCB(scope="admin_tickets", page=page + 1).pack(),
-        ))
+    nav = page_nav_row("admin_tickets", tickets, page, total_pages, total)
     if nav:
         buttons.append(nav)
     buttons.append([InlineKeyboardButton(text="Меню админа", callback_data=MenuCB(action="admin").pack())])
@@ -4,7 +4,7 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     InlineKeyboardButton,
 )
-from bot.callbacks.navigation_cb import BackCB, CancelCB, LanguageCB
+from bot.callbacks.navigation_cb import BackCB, CancelCB, LanguageCB, PageCB
 from bot.services.text_service import get_text_sync
 
 
@@ -41,3 +41,21 @@ def back_button(target: str) -> InlineKeyboardButton:
 
 def skip_button(text: str = "Пропустить", callback_data: str = "skip") -> InlineKeyboardButton:
     return InlineKeyboardButton(text=text, callback_data=callback_data)
+
+
+def page_nav_row(scope: str, tickets: list, page: int, total_pages: int, total: int) -> list[InlineKeyboardButton]:
+    """Prev/next buttons carrying keyset cursors and the cached row count."""
+    nav = []
+    if page > 1 and tickets:
+        # Page 1 is always loaded fresh: no cursor and no count, so it re-counts
+        if page > 2:
+            back = PageCB(scope=scope, page=page - 1, total=total, before=tickets[0].id)
+        else:
+            back = PageCB(scope=scope, page=1)
+        nav.append(InlineKeyboardButton(text="◀ Назад", callback_data=back.pack()))
+    if page < total_pages and tickets:
+        nav.append(InlineKeyboardButton(
+            text="Вперед ▶",
+            callback_data=PageCB(scope=scope, page=page + 1, total=total, after=tickets[-1].id).pack(),
+        ))
+    return nav
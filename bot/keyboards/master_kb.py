@@ -1,7 +1,8 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from bot.callbacks.ticket_cb import TicketViewCB, MasterActionCB, CarPlateApprovalCB
-from bot.callbacks.navigation_cb import PageCB, MasterMenuCB, MenuCB
+from bot.callbacks.navigation_cb import MasterMenuCB, MenuCB
+from bot.keyboards.common import page_nav_row
 from bot.utils.constants import CATEGORY_DISPLAY, TicketCategory
 
 
@@ -59,7 +60,7 @@ def master_ticket_actions(ticket_pk: int, status: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def master_ticket_list(tickets: list, page: int, total_pages: int, scope: str) -> InlineKeyboardMarkup:
+def master_ticket_list(tickets: list, page: int, total_pages: int, scope: str, total: int = 0) -> InlineKeyboardMarkup:
     buttons = []
     for t in tickets:
         # Show category in Russian
@@ -73,17 +74,7 @@ def master_ticket_list(tickets: list, page: int, total_pages: int, scope: str) -
                 callback_data=TicketViewCB(ticket_pk=t.id).pack(),
             )
         ])
-    nav = []
-    if page > 1:
-        nav.append(InlineKeyboardButton(
-            text="◀ Назад",
-            callback_data=PageCB(scope=scope, page=page - 1).pack(),
-        ))
-    if page < total_pages:
-        nav.append(InlineKeyboardButton(
-            text="Вперед ▶",
-            callback_data=PageCB(scope=scope, page=page + 1).pack(),
-        ))
+    nav = page_nav_row(scope, tickets, page, total_pages, total)
     if nav:
         buttons.append(nav)
     buttons.append([InlineKeyboardButton(text="Меню мастера", callback_data=MenuCB(action="master").pack())])
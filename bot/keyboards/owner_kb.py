@@ -5,7 +5,8 @@ from bot.callbacks.ticket_cb import (
     ConfirmCB, PhotoDoneCB, KeyCountCB, KeyTypeCB, GateCB,
     CameraInstructionCB, SkipCB, TicketViewCB, TicketRateCB,
 )
-from bot.callbacks.navigation_cb import PageCB, OwnerMenuCB, MenuCB, CancelCB
+from bot.callbacks.navigation_cb import OwnerMenuCB, MenuCB, CancelCB
+from bot.keyboards.common import page_nav_row
 from bot.utils.constants import (
     ResidentialComplex, COMPLEX_DISPLAY, COMPLEX_CATEGORIES,
     CATEGORY_DISPLAY, STATUS_DISPLAY, COMPLEX_BLOCKS, ALASHA_ENTRANCES,
@@ -188,7 +189,7 @@ def rating_keyboard(ticket_pk: int) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[row])
 
 
-def ticket_list_keyboard(tickets: list, page: int, total_pages: int) -> InlineKeyboardMarkup:
+def ticket_list_keyboard(tickets: list, page: int, total_pages: int, total: int = 0) -> InlineKeyboardMarkup:
     buttons = []
     for t in tickets:
         status_txt = STATUS_DISPLAY.get(t.status, t.status)
@@ -199,17 +200,7 @@ def ticket_list_keyboard(tickets: list, page: int, total_pages: int) -> InlineKe
             )
         ])
 
-    nav = []
-    if page > 1:
-        nav.append(InlineKeyboardButton(
-            text="◀ Назад",
-            callback_data=PageCB(scope="owner_tickets", page=page - 1).pack(),
-        ))
-    if page < total_pages:
-        nav.append(InlineKeyboardButton(
-            text="Вперед ▶",
-            callback_data=PageCB(scope="owner_tickets", page=page + 1).pack(),
-        ))
+    nav = page_nav_row("owner_tickets", tickets, page, total_pages, total)
     if nav:
         buttons.append(nav)
 
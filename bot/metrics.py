@@ -0,0 +1,135 @@
+"""Prometheus metrics for the bot process, served on METRICS_HOST:METRICS_PORT.
+
+Everything is recorded per update where possible, so a slow path shows up
+as one handler, middleware, query count or Telegram method standing out:
+
+- qss_bot_update_seconds: whole update, all middlewares included
+- qss_bot_handler_seconds: one handler (bot.middlewares.metrics on the routers)
+- qss_bot_middleware_seconds: a middleware's own time, without what it wraps
+- qss_bot_db_queries_per_update / qss_bot_db_seconds_per_update
+- qss_bot_telegram_api_seconds / qss_bot_telegram_api_errors_total: every
+  Bot API call (handlers, ``_safe_send``, the outbox worker)
+- qss_bot_fsm_transitions_total: dialog state changes, from -> to
+- qss_bot_update_queue_*: the ChatScheduler's pending and running updates
+  and its per-chat queue depth (deepest now, and deepest since the last
+  stats log)
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.services.update_scheduler import ChatScheduler
+
+logger = logging.getLogger(__name__)
+
+# Middlewares and most handlers take well under a millisecond
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+UPDATE_SECONDS = Histogram("qss_bot_update_seconds", "Time to process one update", ["event_type"])
+HANDLER_SECONDS = Histogram(
+    "qss_bot_handler_seconds", "Time spent in a handler", ["handler", "status"], buckets=FAST_BUCKETS + (2.5, 5.0, 10.0)
+)
+MIDDLEWARE_SECONDS = Histogram(
+    "qss_bot_middleware_seconds", "Time spent in a middleware itself", ["middleware"], buckets=FAST_BUCKETS
+)
+DB_QUERIES = Histogram(
+    "qss_bot_db_queries_per_update", "SQL statements run by one update", buckets=(0, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+)
+DB_SECONDS = Histogram("qss_bot_db_seconds_per_update", "Time one update spent in SQL statements", buckets=FAST_BUCKETS)
+TELEGRAM_SECONDS = Histogram("qss_bot_telegram_api_seconds", "Bot API call latency", ["method"])
+TELEGRAM_ERRORS = Counter("qss_bot_telegram_api_errors_total", "Failed Bot API calls", ["method", "error"])
+FSM_TRANSITIONS = Counter("qss_bot_fsm_transitions_total", "Dialog state changes", ["from_state", "to_state"])
+QUEUE_PENDING = Gauge("qss_bot_update_queue_pending", "Updates queued or running")
+QUEUE_RUNNING = Gauge("qss_bot_update_queue_running", "Updates being processed")
+QUEUE_CHATS = Gauge("qss_bot_update_queue_chats", "Chats with updates queued or running")
+QUEUE_MAX_DEPTH = Gauge("qss_bot_update_queue_max_depth", "Updates queued or running in the busiest chat")
+QUEUE_PEAK_DEPTH = Gauge(
+    "qss_bot_update_queue_peak_depth", "Deepest chat queue since the last stats log (DB_POOL_STATS_INTERVAL)"
+)
+
+UNSET: Any = object()
+
+
+@dataclass(slots=True)
+class UpdateStats:
+    """What one update did, collected while it runs."""
+
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    state: str | None = UNSET  # the last state set, if any
+
+
+current_update: ContextVar[UpdateStats | None] = ContextVar("metrics_update", default=None)
+
+
+def state_label(state: str | None) -> str:
+    return state or "none"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count statements and their time against the update being processed (if any)."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_start"].pop()
+        stats = current_update.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _error(context):
+        starts = context.connection.info.get("metrics_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+
+def instrument_scheduler(scheduler: ChatScheduler) -> None:
+    """Read the queue gauges from ``scheduler`` on every scrape; reading never resets the peak."""
+    QUEUE_PENDING.set_function(lambda: scheduler.pending)
+    QUEUE_RUNNING.set_function(lambda: scheduler.running)
+    QUEUE_CHATS.set_function(lambda: scheduler.chats)
+    QUEUE_MAX_DEPTH.set_function(lambda: scheduler.max_depth)
+    QUEUE_PEAK_DEPTH.set_function(lambda: scheduler.peak_depth)
+
+
+class MeteredStorage(BaseStorage):
+    """FSM storage wrapper that notes state changes for the current update."""
+
+    def __init__(self, storage: BaseStorage) -> None:
+        self.storage = storage
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self.storage.set_state(key, state)
+        stats = current_update.get()
+        if stats is not None:
+            stats.state = state.state if isinstance(state, State) else state
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return await self.storage.get_data(key)
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+
+def start_server(host: str, port: int) -> None:
+    start_http_server(port, addr=host)
+    logger.info("Metrics served on http://%s:%d/metrics", host, port)
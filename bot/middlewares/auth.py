@@ -4,10 +4,14 @@ from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Update
 
 from bot.services.auth_service import resolve_role
+from bot.services.role_cache import RoleCache
 from bot.utils.language import current_language, DEFAULT_LANGUAGE, get_user_language
 
 
 class AuthMiddleware(BaseMiddleware):
+    def __init__(self, role_cache: RoleCache | None = None):
+        self.role_cache = role_cache
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
@@ -19,7 +23,7 @@ class AuthMiddleware(BaseMiddleware):
         session = data.get("session")
 
         if user and session:
-            role, user_obj = await resolve_role(session, user.id)
+            role, user_obj = await self._resolve(session, user.id)
             data["user_role"] = role
             data["user_obj"] = user_obj
 
@@ -37,3 +41,19 @@ class AuthMiddleware(BaseMiddleware):
             return await handler(event, data)
         finally:
             current_language.reset(token)
+
+    async def _resolve(self, session, telegram_id: int) -> tuple[str | None, object | None]:
+        if self.role_cache is None:
+            return await resolve_role(session, telegram_id)
+
+        cached = self.role_cache.get(telegram_id)
+        if cached is not None:
+            role, user_obj = cached
+            if user_obj is not None:
+                # Attach the detached copy so handler changes are persisted
+                session.add(user_obj)
+            return role, user_obj
+
+        role, user_obj = await resolve_role(session, telegram_id)
+        self.role_cache.set(telegram_id, role, user_obj)
+        return role, user_obj
@@ -4,6 +4,8 @@ from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from bot.db.lazy_session import LazySession
+
 
 class DbSessionMiddleware(BaseMiddleware):
     def __init__(self, session_pool: async_sessionmaker) -> None:
@@ -15,12 +17,18 @@ class DbSessionMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        async with self.session_pool() as session:
-            data["session"] = session
-            try:
-                result = await handler(event, data)
+        # The session (and its pooled connection) is only created if the
+        # update actually touches the DB
+        session = LazySession(self.session_pool)
+        data["session"] = session
+        try:
+            result = await handler(event, data)
+            if session.has_pending_work():
                 await session.commit()
-                return result
-            except Exception:
+            return result
+        except Exception:
+            if session.has_pending_work():
                 await session.rollback()
-                raise
+            raise
+        finally:
+            await session.close()
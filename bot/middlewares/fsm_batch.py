@@ -0,0 +1,27 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from bot.services.fsm_storage import DbStorage
+
+
+class FsmBatchMiddleware(BaseMiddleware):
+    """Flush all FSM writes of an update once, after its handler has run.
+
+    Register it before aiogram's FSMContextMiddleware (``Dispatcher(...,
+    disable_fsm=True)``, then ``dp.fsm``), so the state that middleware
+    reads is loaded in the batch and the handlers reuse it.
+    """
+
+    def __init__(self, storage: DbStorage) -> None:
+        self.storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with self.storage.batch():
+            return await handler(event, data)
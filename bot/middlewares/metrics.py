@@ -0,0 +1,126 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware, Bot, Router
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+from aiogram.types import TelegramObject, Update
+
+from bot import metrics
+from bot.metrics import UpdateStats, current_update
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Outer update middleware: total time, DB usage and FSM transition per update.
+
+    Register it before the other outer middlewares, FSMContextMiddleware
+    included (``Dispatcher(..., disable_fsm=True)``, then ``dp.fsm``), so
+    its time and query count include them.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        stats = UpdateStats()
+        token = current_update.set(stats)
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            current_update.reset(token)
+            event_type = event.event_type if isinstance(event, Update) else type(event).__name__
+            metrics.UPDATE_SECONDS.labels(event_type).observe(time.perf_counter() - start)
+            metrics.DB_QUERIES.observe(stats.db_queries)
+            metrics.DB_SECONDS.observe(stats.db_seconds)
+            # raw_state is what FSMContextMiddleware (inside this one) loaded before the handler ran
+            before = data.get("raw_state")
+            if stats.state is not metrics.UNSET and stats.state != before:
+                metrics.FSM_TRANSITIONS.labels(metrics.state_label(before), metrics.state_label(stats.state)).inc()
+
+
+class TimedMiddleware(BaseMiddleware):
+    """Wraps a middleware and records its own time, without the handler it calls."""
+
+    def __init__(self, middleware: BaseMiddleware) -> None:
+        self.middleware = middleware
+        self.name = type(middleware).__name__
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        inner = 0.0
+
+        async def timed_handler(event: TelegramObject, data: dict[str, Any]) -> Any:
+            nonlocal inner
+            start = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                inner += time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            return await self.middleware(timed_handler, event, data)
+        finally:
+            metrics.MIDDLEWARE_SECONDS.labels(self.name).observe(time.perf_counter() - start - inner)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Inner middleware: latency of the handler that matched, by its name."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        callback = data["handler"].callback
+        name = f"{callback.__module__.removeprefix('bot.handlers.')}.{callback.__qualname__}"
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except SkipHandler:
+            status = "skipped"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            metrics.HANDLER_SECONDS.labels(name, status).observe(time.perf_counter() - start)
+
+
+def instrument_router(router: Router) -> None:
+    """Time every handler of the router and its sub-routers (inner middlewares are inherited)."""
+    middleware = HandlerMetricsMiddleware()
+    for name, observer in router.observers.items():
+        if name != "update":
+            observer.middleware(middleware)
+
+
+class TelegramMetricsMiddleware(BaseRequestMiddleware):
+    """Bot session middleware: latency and errors of every Bot API call."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        name = type(method).__name__
+        start = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            metrics.TELEGRAM_ERRORS.labels(name, type(e).__name__).inc()
+            raise
+        finally:
+            metrics.TELEGRAM_SECONDS.labels(name).observe(time.perf_counter() - start)
@@ -1,14 +1,66 @@
+import logging
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any, Awaitable, Callable
 
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject, Message
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from bot.services.text_service import get_text_sync
+from bot.utils.constants import UserRole
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Limit:
+    rate: float  # sustained events per second
+    burst: int  # events allowed back to back
+
+
+LIMITS: dict[UserRole | None, Limit] = {
+    None: Limit(rate=1.0, burst=3),  # not registered yet
+    UserRole.OWNER: Limit(rate=1.0, burst=5),
+    UserRole.MASTER: Limit(rate=2.0, burst=8),
+    UserRole.ADMIN: Limit(rate=4.0, burst=15),
+}
+MAXSIZE: int = 10_000
 
 
 class ThrottlingMiddleware(BaseMiddleware):
-    def __init__(self, rate_limit: float = 0.5) -> None:
-        self.rate_limit = rate_limit
-        self._cache: dict[int, float] = {}
+    """Per-user token bucket over messages and callback queries.
+
+    Each user costs one entry in a bounded LRU: the GCRA "theoretical
+    arrival time" plus whether they were already warned. Evicting a user
+    is harmless, since a bucket left alone that long is full again anyway.
+    Register the same instance on ``message`` and ``callback_query`` so
+    both draw from one bucket.
+    """
+
+    def __init__(self, limits: dict[UserRole | None, Limit] | None = None, maxsize: int = MAXSIZE) -> None:
+        limits = {**LIMITS, **(limits or {})}
+        # (emission interval, burst tolerance) in seconds, per role
+        self._params = {role: (1 / l.rate, (l.burst - 1) / l.rate) for role, l in limits.items()}
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[int, tuple[float, bool]] = OrderedDict()
+
+    def _check(self, user_id: int, interval: float, tolerance: float) -> tuple[bool, bool]:
+        """Take a token. Returns ``(allowed, warn)``; ``warn`` only for the first refusal in a row."""
+        now = time.monotonic()
+        buckets = self._buckets
+        tat, warned = buckets.get(user_id, (now, False))
+        if tat < now:
+            tat = now
+        if tat - now > tolerance:
+            buckets[user_id] = (tat, True)
+            buckets.move_to_end(user_id)
+            return False, not warned
+        buckets[user_id] = (tat + interval, False)
+        buckets.move_to_end(user_id)
+        if len(buckets) > self.maxsize:
+            buckets.popitem(last=False)
+        return True, False
 
     async def __call__(
         self,
@@ -16,12 +68,18 @@ class ThrottlingMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        if isinstance(event, Message) and event.from_user:
-            user_id = event.from_user.id
-            now = time.monotonic()
-            last = self._cache.get(user_id, 0)
-            if now - last < self.rate_limit:
-                return  # silently drop
-            self._cache[user_id] = now
-
-        return await handler(event, data)
+        if not isinstance(event, (Message, CallbackQuery)) or not event.from_user:
+            return await handler(event, data)
+
+        interval, tolerance = self._params.get(data.get("user_role")) or self._params[None]
+        allowed, warn = self._check(event.from_user.id, interval, tolerance)
+        if allowed:
+            return await handler(event, data)
+
+        # A callback must be answered anyway to stop the button spinner; a
+        # message gets one reply per burst so the warning isn't a flood itself
+        if isinstance(event, CallbackQuery) or warn:
+            try:
+                await event.answer(get_text_sync("toast_slow_down"))
+            except Exception as e:
+                logger.debug("Failed to send throttling notice to %s: %s", event.from_user.id, e)
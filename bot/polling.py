@@ -0,0 +1,60 @@
+"""Long polling through a ``ChatScheduler``.
+
+aiogram's ``start_polling`` runs every update as an independent task, so
+two updates from one chat can interleave. Here each fetched batch is
+queued on the scheduler, and fetching pauses while its queue is full.
+"""
+import asyncio
+import logging
+import signal
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import GetUpdates
+from aiogram.utils.backoff import Backoff, BackoffConfig
+
+from bot.services.update_scheduler import ChatScheduler
+
+logger = logging.getLogger(__name__)
+
+POLLING_TIMEOUT: int = 30
+BACKOFF = BackoffConfig(min_delay=1.0, max_delay=5.0, factor=1.3, jitter=0.1)
+
+
+async def _poll(dp: Dispatcher, bot: Bot, scheduler: ChatScheduler) -> None:
+    backoff = Backoff(BACKOFF)
+    get_updates = GetUpdates(timeout=POLLING_TIMEOUT, allowed_updates=dp.resolve_used_update_types())
+    # The HTTP request must outlive the long poll itself
+    request_timeout = int(bot.session.timeout + POLLING_TIMEOUT)
+    while True:
+        await scheduler.wait_for_room()
+        try:
+            updates = await bot(get_updates, request_timeout=request_timeout)
+        except Exception as e:
+            logger.error("Failed to fetch updates - %s: %s, retrying in %.1fs", type(e).__name__, e, backoff.next_delay)
+            await backoff.asleep()
+            continue
+        backoff.reset()
+        for update in updates:
+            scheduler.submit(update)
+            # Confirmed with the next getUpdates call
+            get_updates.offset = update.update_id + 1
+
+
+async def run_polling(dp: Dispatcher, bot: Bot, scheduler: ChatScheduler) -> None:
+    # getUpdates fails while a webhook from an earlier run is set
+    await bot.delete_webhook()
+
+    await dp.emit_startup(bot=bot, dispatcher=dp, **dp.workflow_data)
+    poller = asyncio.create_task(_poll(dp, bot, scheduler))
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, poller.cancel)
+    logger.info("Polling started")
+    try:
+        await poller
+    except asyncio.CancelledError:
+        logger.info("Polling stopped, finishing queued updates...")
+    finally:
+        await scheduler.close()
+        await dp.emit_shutdown(bot=bot, dispatcher=dp, **dp.workflow_data)
+        await bot.session.close()
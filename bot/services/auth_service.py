@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.db.repositories import owner_repo, master_repo, admin_repo
+from bot.db.repositories import owner_repo, master_repo, admin_repo, user_repo
+from bot.services.role_cache import notify_roles_changed, role_cache
 from bot.utils.constants import UserRole
 
 
@@ -9,18 +10,13 @@ async def resolve_role(session: AsyncSession, telegram_id: int) -> tuple[str | N
 
     Priority: admin > master > owner.
     """
-    admin = await admin_repo.get_by_telegram_id(session, telegram_id)
+    admin, master, owner = await user_repo.get_accounts_by_telegram_id(session, telegram_id)
     if admin:
         return UserRole.ADMIN, admin
-
-    master = await master_repo.get_by_telegram_id(session, telegram_id)
     if master:
         return UserRole.MASTER, master
-
-    owner = await owner_repo.get_by_telegram_id(session, telegram_id)
     if owner:
         return UserRole.OWNER, owner
-
     return None, None
 
 
@@ -30,7 +26,10 @@ async def authenticate_by_phone(
     """Look up phone in owners table, link telegram_id if found."""
     owner = await owner_repo.get_by_phone(session, phone)
     if owner:
+        previous_telegram_id = owner.telegram_id
         await owner_repo.link_telegram_id(session, owner.id, telegram_id)
+        role_cache.invalidate(previous_telegram_id, telegram_id)
+        await notify_roles_changed(session, previous_telegram_id, telegram_id)
         # Check if also admin or master
         admin = await admin_repo.get_by_telegram_id(session, telegram_id)
         if admin:
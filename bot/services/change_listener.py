@@ -0,0 +1,71 @@
+"""Applies changes made by other processes to this process's caches as they happen.
+
+Writers NOTIFY a channel in the same transaction as the change (e.g.
+``bot_text_repo.notify_changed`` from the admin panel). Every bot process
+LISTENs on one dedicated asyncpg connection, outside the pool, and hands
+each batch of payloads to the channel's handler. Notifications sent
+while the connection is down are lost, so every connect starts by
+passing ALL to every handler; that also covers changes made between the
+startup loads and the first LISTEN.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import asyncpg
+
+from bot.config import settings
+from bot.db.notify import ALL
+
+logger = logging.getLogger(__name__)
+
+PING_INTERVAL: float = 30.0  # seconds without notifications before checking the connection
+RECONNECT_DELAY: float = 1.0  # seconds, doubled after every failed attempt
+RECONNECT_DELAY_MAX: float = 60.0
+
+Handler = Callable[[list[str]], Awaitable[None]]
+
+
+async def run_change_listener(handlers: dict[str, Handler], dsn: str | None = None) -> None:
+    """Listen on every channel in ``handlers`` forever, reconnecting with backoff."""
+    dsn = dsn or settings.db_dsn
+    delay = RECONNECT_DELAY
+    synced = False
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(dsn)
+            queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+            for channel in handlers:
+                await conn.add_listener(
+                    channel, lambda _conn, _pid, channel, payload: queue.put_nowait((channel, payload)),
+                )
+            if not synced:
+                for handler in handlers.values():
+                    await handler([ALL])
+                synced = True
+            delay = RECONNECT_DELAY
+            logger.info("Listening for changes on %s", ", ".join(handlers))
+            while True:
+                try:
+                    batch = [await asyncio.wait_for(queue.get(), PING_INTERVAL)]
+                except asyncio.TimeoutError:
+                    # A half-open connection delivers nothing and raises nothing
+                    await conn.fetchval("SELECT 1")
+                    continue
+                # An edit of both languages or a burst of edits: one reload
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                by_channel: dict[str, list[str]] = {}
+                for channel, payload in batch:
+                    by_channel.setdefault(channel, []).append(payload)
+                for channel, payloads in by_channel.items():
+                    await handlers[channel](payloads)
+        except Exception as e:
+            synced = False
+            logger.warning("Change listener failed: %s; reconnecting in %.0fs", e, delay)
+        finally:
+            if conn is not None:
+                conn.terminate()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, RECONNECT_DELAY_MAX)
@@ -0,0 +1,85 @@
+"""Admin dashboard figures, loaded concurrently and cached for a few seconds."""
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.db.repositories import master_repo, owner_repo, stats_repo, ticket_repo
+from bot.utils.dates import local_today
+
+DASHBOARD_CACHE_TTL: float = 5.0  # seconds
+RECENT_TICKETS_LIMIT = 10
+BREAKDOWN_DAYS = 30
+# Sessions one load may hold at once; keep below ADMIN_DB_POOL_SIZE so page
+# requests still get a connection while the dashboard loads
+DASHBOARD_CONCURRENCY = 2
+
+
+class DashboardCache:
+    """Holds the last dashboard snapshot for ``ttl`` seconds.
+
+    Reloads are single-flight: concurrent requests after expiry wait for one
+    load instead of each querying the database.
+    """
+
+    def __init__(self, ttl: float = DASHBOARD_CACHE_TTL):
+        self.ttl = ttl
+        self._data: dict[str, Any] | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    async def get(self, session_pool: async_sessionmaker) -> dict[str, Any]:
+        if self._data is not None and self._expires_at > time.monotonic():
+            return self._data
+        async with self._lock:
+            if self._data is None or self._expires_at <= time.monotonic():
+                self._data = await load_dashboard(session_pool)
+                self._expires_at = time.monotonic() + self.ttl
+                self.loads += 1
+        return self._data
+
+    def clear(self) -> None:
+        self._data = None
+        self._expires_at = 0.0
+
+
+async def _run(
+    session_pool: async_sessionmaker, limit: asyncio.Semaphore, query: Callable[..., Awaitable[Any]], *args
+) -> Any:
+    # A session can't run statements concurrently, so each query gets its own
+    async with limit, session_pool() as session:
+        return await query(session, *args)
+
+
+async def load_dashboard(session_pool: async_sessionmaker) -> dict[str, Any]:
+    today = local_today()
+    first = today - timedelta(days=BREAKDOWN_DAYS - 1)
+    limit = asyncio.Semaphore(DASHBOARD_CONCURRENCY)
+    summary, by_complex, by_category, total_owners, total_masters, recent = await asyncio.gather(
+        _run(session_pool, limit, stats_repo.status_summary),
+        _run(session_pool, limit, stats_repo.totals_by, "residential_complex", first, today),
+        _run(session_pool, limit, stats_repo.totals_by, "category", first, today),
+        _run(session_pool, limit, owner_repo.count_all),
+        _run(session_pool, limit, master_repo.count_all),
+        _run(session_pool, limit, ticket_repo.list_recent, RECENT_TICKETS_LIMIT),
+    )
+    return {
+        "stats": {
+            "total_tickets": summary["total"],
+            "new_tickets": summary["new"],
+            "in_progress": summary["in_progress"],
+            "completed": summary["completed"],
+            "total_owners": total_owners or 0,
+            "total_masters": total_masters or 0,
+        },
+        "by_complex": by_complex,
+        "by_category": by_category,
+        "breakdown_days": BREAKDOWN_DAYS,
+        "recent_tickets": recent,
+    }
+
+
+dashboard_cache = DashboardCache()
@@ -0,0 +1,138 @@
+"""Rate-limited parallel delivery of bot messages to many chats.
+
+Telegram allows roughly 30 messages per second per bot and about one per
+second to the same chat. Deliveries to different chats run concurrently
+under a global token bucket; deliveries to one chat go out in order
+under that chat's own bucket.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_RATE: float = 30.0  # messages per second, all chats
+CHAT_RATE: float = 1.0  # messages per second, one chat
+CHAT_BURST: int = 3
+MAX_ATTEMPTS: int = 3
+CHAT_BUCKETS_MAXSIZE: int = 10_000
+
+
+class TokenBucket:
+    """Token bucket of ``rate`` tokens per second and burst ``capacity``.
+
+    Implemented as GCRA: ``acquire`` reserves the next free slot before it
+    awaits anything, so callers are served in order without a lock.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._interval = 1 / rate
+        self._tolerance = (capacity - 1) * self._interval
+        self._tat = 0.0  # theoretical arrival time of the next token
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self._interval
+        return max(0.0, tat - self._tolerance - now)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def block(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` (Telegram's ``retry_after``)."""
+        self._tat = max(self._tat, time.monotonic() + seconds + self._tolerance)
+
+
+@dataclass(frozen=True, slots=True)
+class Delivery:
+    """One Bot API call to one chat, e.g. ``Delivery(42, "send_message", {"text": "hi"})``."""
+
+    chat_id: int
+    method: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class DeliveryResult:
+    chat_id: int
+    method: str
+    ok: bool
+    attempts: int
+    error: str | None = None
+    retryable: bool = False  # worth trying again later (flood limit, network, 5xx)
+
+
+class FanoutDispatcher:
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_RATE,
+        chat_rate: float = CHAT_RATE,
+        chat_burst: int = CHAT_BURST,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_attempts = max_attempts
+        self._chat_buckets: OrderedDict[int, TokenBucket] = OrderedDict()
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+            while len(self._chat_buckets) > CHAT_BUCKETS_MAXSIZE:
+                self._chat_buckets.popitem(last=False)
+        self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    async def send_all(self, bot: Bot, deliveries: list[Delivery]) -> list[DeliveryResult]:
+        """Send everything and return one result per delivery, in input order."""
+        by_chat: dict[int, list[int]] = {}
+        for i, delivery in enumerate(deliveries):
+            by_chat.setdefault(delivery.chat_id, []).append(i)
+
+        results: list[DeliveryResult | None] = [None] * len(deliveries)
+
+        async def send_chat(indexes: list[int]) -> None:
+            for i in indexes:
+                results[i] = await self.send(bot, deliveries[i])
+
+        await asyncio.gather(*(send_chat(indexes) for indexes in by_chat.values()))
+        return results
+
+    async def send(self, bot: Bot, delivery: Delivery) -> DeliveryResult:
+        chat_bucket = self._chat_bucket(delivery.chat_id)
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            await chat_bucket.acquire()
+            await self.global_bucket.acquire()
+            try:
+                await getattr(bot, delivery.method)(delivery.chat_id, **delivery.kwargs)
+                return DeliveryResult(delivery.chat_id, delivery.method, True, attempt)
+            except TelegramRetryAfter as e:
+                logger.info("Flood limit for %s, retrying in %ss", delivery.chat_id, e.retry_after)
+                chat_bucket.block(e.retry_after)
+                error = str(e)
+            except (TelegramNetworkError, TelegramServerError) as e:
+                logger.warning("Failed to %s to %s: %s", delivery.method, delivery.chat_id, e)
+                return DeliveryResult(delivery.chat_id, delivery.method, False, attempt, str(e), retryable=True)
+            except Exception as e:
+                # Blocked bot, deleted chat, bad request: retrying won't help
+                logger.warning("Failed to %s to %s: %s", delivery.method, delivery.chat_id, e)
+                return DeliveryResult(delivery.chat_id, delivery.method, False, attempt, str(e))
+        return DeliveryResult(delivery.chat_id, delivery.method, False, self.max_attempts, error, retryable=True)
+
+
+dispatcher = FanoutDispatcher()
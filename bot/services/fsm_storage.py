@@ -0,0 +1,124 @@
+"""aiogram FSM storage kept in the ``fsm_states`` table.
+
+State survives restarts and is shared by every bot process. Handlers call
+``state.update_data`` several times per update, so inside ``batch()``
+reads are cached and writes are buffered per key, then flushed in one
+transaction when the update is done. With FsmBatchMiddleware wrapping
+aiogram's FSMContextMiddleware (which reads the state before any filter
+runs), a typical update costs one SELECT and one UPSERT however many FSM
+calls it makes; outside a batch every call is a statement of its own.
+"""
+import copy
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.db.repositories import fsm_repo
+
+_UNKNOWN: Any = object()  # not read from the DB yet
+
+
+@dataclass(slots=True)
+class _Entry:
+    state: str | None = _UNKNOWN
+    data: dict[str, Any] = _UNKNOWN
+    dirty: set[str] = field(default_factory=set)
+
+
+_batch: ContextVar[dict[str, _Entry] | None] = ContextVar("fsm_write_batch", default=None)
+
+
+class DbStorage(BaseStorage):
+    def __init__(self, session_pool: async_sessionmaker, key_builder: KeyBuilder | None = None) -> None:
+        self.session_pool = session_pool
+        self.key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Coalesce the FSM reads and writes made inside the block.
+
+        Pending writes are flushed on exit even if the block raised, so a
+        failing handler keeps the state it set, as with ``MemoryStorage``.
+        """
+        if _batch.get() is not None:
+            yield
+            return
+        pending: dict[str, _Entry] = {}
+        token = _batch.set(pending)
+        try:
+            yield
+        finally:
+            _batch.reset(token)
+            await self._flush(pending)
+
+    async def _flush(self, pending: dict[str, _Entry]) -> None:
+        dirty = {key: entry for key, entry in pending.items() if entry.dirty}
+        if not dirty:
+            return
+        async with self.session_pool() as session:
+            for key, entry in dirty.items():
+                await self._write(session, key, entry)
+            await session.commit()
+
+    @staticmethod
+    async def _write(session, key: str, entry: _Entry) -> None:
+        if entry.state is None and entry.data == {}:
+            # state.clear(): nothing left worth a row
+            await fsm_repo.delete_key(session, key)
+        else:
+            await fsm_repo.upsert(session, key, **{name: getattr(entry, name) for name in entry.dirty})
+
+    async def _load(self, key: str) -> _Entry:
+        pending = _batch.get()
+        entry = pending.get(key) if pending is not None else None
+        if entry is None:
+            entry = _Entry()
+            if pending is not None:
+                pending[key] = entry
+        if entry.state is _UNKNOWN or entry.data is _UNKNOWN:
+            async with self.session_pool() as session:
+                row = await fsm_repo.get(session, key)
+            state, data = row or (None, {})
+            if entry.state is _UNKNOWN:
+                entry.state = state
+            if entry.data is _UNKNOWN:
+                entry.data = data
+        return entry
+
+    async def _set(self, key: StorageKey, name: str, value: Any) -> None:
+        storage_key = self.key_builder.build(key)
+        pending = _batch.get()
+        if pending is None:
+            entry = _Entry(dirty={name})
+            setattr(entry, name, value)
+            async with self.session_pool() as session:
+                await self._write(session, storage_key, entry)
+                await session.commit()
+            return
+        entry = pending.setdefault(storage_key, _Entry())
+        setattr(entry, name, value)
+        entry.dirty.add(name)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._set(key, "state", state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return (await self._load(self.key_builder.build(key))).state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise TypeError(f"Data must be a dict, not {type(data).__name__}")
+        await self._set(key, "data", dict(data))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        # Deep copy: handlers append to lists they got from get_data()
+        return copy.deepcopy((await self._load(self.key_builder.build(key))).data)
+
+    async def close(self) -> None:
+        # The session pool belongs to the application
+        pass
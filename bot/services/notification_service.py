@@ -2,13 +2,18 @@ import logging
 from contextlib import contextmanager
 
 from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.callbacks.ticket_cb import TicketRateCB, MasterActionCB, CarPlateApprovalCB
 from bot.db.repositories import admin_repo
+from bot.services import fanout
+from bot.services.fanout import Delivery, DeliveryResult
+from bot.services.outbox import OutboxWriter
+from bot.services.recipient_directory import recipient_directory
 from bot.services.text_service import get_text_sync
 from bot.utils.constants import STATUS_DISPLAY
-from bot.utils.language import current_language, DEFAULT_LANGUAGE
+from bot.utils.language import current_language, get_user_language, DEFAULT_LANGUAGE
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +28,13 @@ def _with_lang(lang: str):
         current_language.reset(token)
 
 
+async def _admins(session: AsyncSession) -> list:
+    """All admins, from the recipient directory once it is loaded."""
+    if recipient_directory.loaded:
+        return recipient_directory.admins()
+    return await admin_repo.get_all(session)
+
+
 async def _safe_send(bot: Bot, chat_id: int, text: str, **kwargs) -> bool:
     try:
         await bot.send_message(chat_id, text, **kwargs)
@@ -52,6 +64,54 @@ async def _safe_send_document(bot: Bot, chat_id: int, document: str, caption: st
         return False
 
 
+async def _deliver(bot: Bot | OutboxWriter, deliveries: list[Delivery]) -> list[DeliveryResult]:
+    """Queue in the outbox when given one, otherwise send right away."""
+    if isinstance(bot, OutboxWriter):
+        bot.enqueue(deliveries)
+        return []
+    return await fanout.dispatcher.send_all(bot, deliveries)
+
+
+def _message(chat_id: int, text: str, **kwargs) -> Delivery:
+    return Delivery(chat_id, "send_message", {"text": text, **kwargs})
+
+
+def _photo(chat_id: int, photo: str, caption: str | None = None) -> Delivery:
+    return Delivery(chat_id, "send_photo", {"photo": photo, "caption": caption})
+
+
+def _master_ticket_keyboard(ticket_pk: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text="Принять",
+                callback_data=MasterActionCB(ticket_pk=ticket_pk, action="accept").pack(),
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text="Выполнена",
+                callback_data=MasterActionCB(ticket_pk=ticket_pk, action="complete").pack(),
+            ),
+        ],
+    ])
+
+
+def _car_plate_approval_keyboard(ticket_pk: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text="✅ Одобрить",
+                callback_data=CarPlateApprovalCB(ticket_pk=ticket_pk, action="approve").pack(),
+            ),
+            InlineKeyboardButton(
+                text="❌ Отклонить",
+                callback_data=CarPlateApprovalCB(ticket_pk=ticket_pk, action="reject").pack(),
+            ),
+        ],
+    ])
+
+
 async def notify_owner_ticket_created(
     bot: Bot, owner_telegram_id: int, ticket_id: str, recipient_lang: str = "ru",
 ) -> None:
@@ -77,8 +137,6 @@ async def notify_owner_completed(
     bot: Bot, owner_telegram_id: int, ticket_id: str, ticket_pk: int,
     recipient_lang: str = "ru",
 ) -> None:
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(
@@ -97,53 +155,46 @@ async def notify_master_new_ticket(
     bot: Bot, master_telegram_id: int, ticket_card: str, ticket_pk: int,
     recipient_lang: str = "ru",
 ) -> None:
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(
-                text="Принять",
-                callback_data=MasterActionCB(ticket_pk=ticket_pk, action="accept").pack(),
-            ),
-        ],
-        [
-            InlineKeyboardButton(
-                text="Выполнена",
-                callback_data=MasterActionCB(ticket_pk=ticket_pk, action="complete").pack(),
-            ),
-        ],
-    ])
-    await _safe_send(bot, master_telegram_id, ticket_card, reply_markup=keyboard)
+    await _safe_send(bot, master_telegram_id, ticket_card, reply_markup=_master_ticket_keyboard(ticket_pk))
+
+
+async def notify_masters_new_ticket(
+    bot: Bot, masters: list, ticket_card: str, ticket_pk: int,
+    is_car_plate: bool = False, contract_photo: str | None = None,
+) -> list[DeliveryResult]:
+    """Send a new ticket to every master of the complex in parallel."""
+    deliveries = []
+    for master in masters:
+        if not is_car_plate:
+            deliveries.append(_message(master.telegram_id, ticket_card, reply_markup=_master_ticket_keyboard(ticket_pk)))
+            continue
+        with _with_lang(get_user_language(master)):
+            text = get_text_sync("notify_car_plate_approval", card=ticket_card)
+        if contract_photo:
+            deliveries.append(_photo(master.telegram_id, contract_photo, caption="📎 Договор паркинга"))
+        deliveries.append(_message(master.telegram_id, text, reply_markup=_car_plate_approval_keyboard(ticket_pk)))
+    return await _deliver(bot, deliveries)
 
 
 async def notify_admins_new_ticket(
-    bot: Bot, session: AsyncSession, ticket_card: str
-) -> None:
-    admins = await admin_repo.get_all(session)
+    bot: Bot, session: AsyncSession, ticket_card: str, admins: list | None = None
+) -> list[DeliveryResult]:
+    """Send a new ticket to every admin; pass ``admins`` if already fetched."""
+    if admins is None:
+        admins = await _admins(session)
+    deliveries = []
     for admin in admins:
         with _with_lang(getattr(admin, "language", "ru")):
             text = get_text_sync("notify_admin_new_ticket", card=ticket_card)
-        await _safe_send(bot, admin.telegram_id, text)
+        deliveries.append(_message(admin.telegram_id, text))
+    return await _deliver(bot, deliveries)
 
 
 async def notify_master_car_plate_approval(
     bot: Bot, master_telegram_id: int, ticket_card: str, ticket_pk: int,
     contract_photo: str | None = None, recipient_lang: str = "ru",
 ) -> None:
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(
-                text="✅ Одобрить",
-                callback_data=CarPlateApprovalCB(ticket_pk=ticket_pk, action="approve").pack(),
-            ),
-            InlineKeyboardButton(
-                text="❌ Отклонить",
-                callback_data=CarPlateApprovalCB(ticket_pk=ticket_pk, action="reject").pack(),
-            ),
-        ],
-    ])
+    keyboard = _car_plate_approval_keyboard(ticket_pk)
     with _with_lang(recipient_lang):
         text = get_text_sync("notify_car_plate_approval", card=ticket_card)
 
@@ -157,9 +208,7 @@ async def notify_master_car_plate_approval(
 async def notify_admin_car_plate_review(
     bot: Bot, session: AsyncSession, ticket_card: str, ticket_pk: int, master_decision: str,
     contract_photo: str | None = None
-) -> None:
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
+) -> list[DeliveryResult]:
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(
@@ -172,15 +221,17 @@ async def notify_admin_car_plate_review(
             ),
         ],
     ])
-    admins = await admin_repo.get_all(session)
+    admins = await _admins(session)
+    deliveries = []
     for admin in admins:
         with _with_lang(getattr(admin, "language", "ru")):
             decision_text = "Одобрил" if master_decision == "approve" else "Отклонил"
             text = get_text_sync("notify_car_plate_admin_review", decision=decision_text, card=ticket_card)
-        # Send contract photo first if available
+        # Contract photo goes first; the dispatcher keeps per-chat order
         if contract_photo:
-            await _safe_send_photo(bot, admin.telegram_id, contract_photo, caption="📎 Договор паркинга")
-        await _safe_send(bot, admin.telegram_id, text, reply_markup=keyboard)
+            deliveries.append(_photo(admin.telegram_id, contract_photo, caption="📎 Договор паркинга"))
+        deliveries.append(_message(admin.telegram_id, text, reply_markup=keyboard))
+    return await _deliver(bot, deliveries)
 
 
 async def notify_owner_car_plate_decision(
@@ -200,8 +251,6 @@ async def notify_master_car_plate_in_progress(
     recipient_lang: str = "ru",
 ) -> None:
     """Notify master that admin approved car plate and ticket is now in progress."""
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(
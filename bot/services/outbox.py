@@ -0,0 +1,113 @@
+"""Transactional notification outbox.
+
+Handlers hand an ``OutboxWriter`` to the notification functions instead of
+the ``Bot``: every send becomes a ``notification_outbox`` row in the
+handler's own transaction, so a notification exists if and only if the
+change it reports was committed. ``run_outbox_worker`` delivers the rows
+in the background through the rate-limited fan-out dispatcher.
+"""
+import asyncio
+import logging
+from typing import Any
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.config import settings
+from bot.db.models.notification_outbox import NotificationOutbox
+from bot.db.repositories import outbox_repo
+from bot.services import fanout
+from bot.services.fanout import Delivery
+
+logger = logging.getLogger(__name__)
+
+
+def _serialize(kwargs: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: value.model_dump(mode="json", exclude_none=True) if isinstance(value, BaseModel) else value
+        for key, value in kwargs.items()
+    }
+
+
+def _deserialize(payload: dict[str, Any]) -> dict[str, Any]:
+    kwargs = dict(payload)
+    if kwargs.get("reply_markup") is not None:
+        kwargs["reply_markup"] = InlineKeyboardMarkup.model_validate(kwargs["reply_markup"])
+    return kwargs
+
+
+class OutboxWriter:
+    """Stand-in for ``Bot`` that queues sends in the given session."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    def enqueue(self, deliveries: list[Delivery]) -> None:
+        for delivery in deliveries:
+            self.session.add(NotificationOutbox(
+                chat_id=delivery.chat_id,
+                method=delivery.method,
+                payload=_serialize(delivery.kwargs),
+            ))
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> None:
+        self.enqueue([Delivery(chat_id, "send_message", {"text": text, **kwargs})])
+
+    async def send_photo(self, chat_id: int, photo: str, **kwargs) -> None:
+        self.enqueue([Delivery(chat_id, "send_photo", {"photo": photo, **kwargs})])
+
+    async def send_document(self, chat_id: int, document: str, **kwargs) -> None:
+        self.enqueue([Delivery(chat_id, "send_document", {"document": document, **kwargs})])
+
+
+def backoff_delay(attempts: int) -> float:
+    """Seconds before retry number ``attempts`` (1-based): base, 2×base, 4×base, ..."""
+    return min(settings.outbox_backoff_base * 2 ** (attempts - 1), settings.outbox_backoff_max)
+
+
+async def drain_once(bot: Bot, session_pool: async_sessionmaker, batch_size: int) -> int:
+    """Deliver one batch of due rows. Returns how many rows were claimed.
+
+    The batch is leased in one short transaction, sent with no
+    transaction or connection held (``send_all`` may sleep on RetryAfter),
+    then settled in a second one. Delivery is at-least-once: a crash
+    before settling resends the batch once its lease runs out.
+    """
+    async with session_pool() as session:
+        rows = await outbox_repo.claim_due(session, batch_size, settings.outbox_lease)
+        await session.commit()
+    if not rows:
+        return 0
+
+    deliveries = [Delivery(row.chat_id, row.method, _deserialize(row.payload)) for row in rows]
+    results = await fanout.dispatcher.send_all(bot, deliveries)
+
+    sent = []
+    async with session_pool() as session:
+        for row, result in zip(rows, results):
+            if result.ok:
+                sent.append(row.id)
+                continue
+            session.add(row)
+            if result.retryable and row.attempts + 1 < settings.outbox_max_attempts:
+                outbox_repo.schedule_retry(row, result.error, backoff_delay(row.attempts + 1))
+            else:
+                logger.warning("Dropping outbox message %d to %s: %s", row.id, row.chat_id, result.error)
+                outbox_repo.mark_failed(row, result.error)
+        await outbox_repo.delete_by_ids(session, sent)
+        await session.commit()
+    return len(rows)
+
+
+async def run_outbox_worker(bot: Bot, session_pool: async_sessionmaker) -> None:
+    """Drain the outbox forever; full batches are followed immediately by the next."""
+    while True:
+        try:
+            claimed = await drain_once(bot, session_pool, settings.outbox_batch_size)
+        except Exception:
+            logger.exception("Outbox worker iteration failed")
+            claimed = 0
+        if claimed < settings.outbox_batch_size:
+            await asyncio.sleep(settings.outbox_poll_interval)
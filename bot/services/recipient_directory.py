@@ -0,0 +1,65 @@
+"""In-process directory of notification recipients: active masters per complex, and admins.
+
+Both lists change maybe weekly, so new-ticket fan-out reads them from
+memory. The directory is loaded at startup and reloaded whole whenever
+someone NOTIFYs ``recipients`` (``recipient_repo.notify_changed``): the
+admin panel after editing masters or admins, the bot after a master or
+admin switches language.
+"""
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.db.repositories import recipient_repo
+from bot.db.repositories.recipient_repo import Recipient
+
+logger = logging.getLogger(__name__)
+
+
+class RecipientDirectory:
+    def __init__(self) -> None:
+        self._masters: dict[str, list[Recipient]] = {}
+        self._admins: list[Recipient] = []
+        self.loaded = False
+        self._lock = asyncio.Lock()
+
+    async def load(self, session: AsyncSession) -> None:
+        masters, admins = await recipient_repo.get_all(session)
+        by_complex: dict[str, list[Recipient]] = {}
+        for residential_complex, recipient in masters:
+            by_complex.setdefault(residential_complex, []).append(recipient)
+        # Swap whole lists, so readers never see a half-built directory
+        self._masters, self._admins = by_complex, admins
+        self.loaded = True
+        logger.info(
+            "Loaded %d masters and %d admins into the recipient directory",
+            len({recipient for _, recipient in masters}), len(admins),
+        )
+
+    async def refresh(self, session_pool: async_sessionmaker) -> None:
+        """Reload in a session of its own; one reload at a time."""
+        async with self._lock:
+            async with session_pool() as session:
+                await self.load(session)
+
+    async def apply_changes(self, session_pool: async_sessionmaker, payloads: list[str]) -> None:
+        """Change listener handler: any change reloads everything (a few dozen rows)."""
+        await self.refresh(session_pool)
+
+    def masters(self, residential_complex: str) -> list[Recipient]:
+        return self._masters.get(residential_complex, [])
+
+    def admins(self) -> list[Recipient]:
+        return self._admins
+
+    async def new_ticket_recipients(
+        self, session: AsyncSession, residential_complex: str
+    ) -> tuple[list[Recipient], list[Recipient]]:
+        """Masters of the complex and all admins; from the DB until the directory is loaded."""
+        if not self.loaded:
+            return await recipient_repo.new_ticket_recipients(session, residential_complex)
+        return self.masters(residential_complex), self.admins()
+
+
+recipient_directory = RecipientDirectory()
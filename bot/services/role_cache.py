@@ -0,0 +1,147 @@
+"""In-process cache of resolved user roles, keyed by Telegram ID.
+
+Each bot process has its own cache. Whoever changes an owner, master or
+admin calls ``notify_roles_changed`` in the same transaction; every bot
+process listens on ``roles`` (``RoleCache.apply_changes``) and drops
+those entries, so a deactivated account loses its role right away
+rather than after the TTL.
+"""
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from bot.db.notify import ALL, notify
+
+ROLE_CACHE_TTL: int = 60  # seconds
+ROLE_CACHE_MAXSIZE: int = 10_000
+
+# NOTIFY channel for account changes; the payload is a JSON list of Telegram IDs
+CHANNEL = "roles"
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    role: str | None
+    model: type | None
+    values: dict[str, Any] | None
+    # Collections that were loaded (e.g. Master.complexes): key -> (child model, child column values)
+    collections: dict[str, tuple[type, list[dict[str, Any]]]] | None
+    expires_at: float
+
+
+def _columns(obj: object) -> dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _snapshot(user_obj: object | None) -> tuple[type | None, dict[str, Any] | None, dict | None]:
+    if user_obj is None:
+        return None, None, None
+    state = inspect(user_obj)
+    collections = {
+        rel.key: (rel.mapper.class_, [_columns(child) for child in getattr(user_obj, rel.key)])
+        for rel in state.mapper.relationships
+        if rel.uselist and rel.key not in state.unloaded
+    }
+    return state.mapper.class_, _columns(user_obj), collections
+
+
+def _detached(model: type, values: dict[str, Any]) -> object:
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _restore(entry: _Entry) -> object | None:
+    """Build a fresh detached instance from a cached snapshot.
+
+    The caller attaches it with ``session.add()`` — no SELECT is emitted and
+    later attribute changes are flushed as a normal UPDATE. Collections that
+    were loaded come back loaded, as unchanged (committed) values.
+    """
+    if entry.model is None:
+        return None
+    obj = _detached(entry.model, entry.values)
+    for key, (model, rows) in entry.collections.items():
+        set_committed_value(obj, key, [_detached(model, row) for row in rows])
+    return obj
+
+
+class RoleCache:
+    """Bounded LRU cache of ``(role, user)`` pairs with a TTL.
+
+    Unknown users are cached too (as ``(None, None)``), so repeated updates
+    from unregistered accounts don't hit the database either.
+    """
+
+    def __init__(self, maxsize: int = ROLE_CACHE_MAXSIZE, ttl: float = ROLE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, telegram_id: int) -> tuple[str | None, object | None] | None:
+        """Return ``(role, user_obj)`` or ``None`` on a miss."""
+        entry = self._entries.get(telegram_id)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[telegram_id]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(telegram_id)
+        self.hits += 1
+        return entry.role, _restore(entry)
+
+    def set(self, telegram_id: int, role: str | None, user_obj: object | None) -> None:
+        model, values, collections = _snapshot(user_obj)
+        self._entries[telegram_id] = _Entry(role, model, values, collections, time.monotonic() + self.ttl)
+        self._entries.move_to_end(telegram_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *telegram_ids: int | None) -> None:
+        for telegram_id in telegram_ids:
+            if telegram_id is not None:
+                self._entries.pop(telegram_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def apply_changes(self, payloads: list[str]) -> None:
+        """Change listener handler: drop the named users, or everyone on ALL (e.g. after a reconnect)."""
+        if ALL in payloads:
+            self.clear()
+            return
+        for payload in payloads:
+            self.invalidate(*json.loads(payload))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+role_cache = RoleCache()
+
+
+async def notify_roles_changed(session: AsyncSession, *telegram_ids: int | None) -> None:
+    """Tell every bot process to forget these users' roles once this transaction commits."""
+    ids = sorted({telegram_id for telegram_id in telegram_ids if telegram_id is not None})
+    if ids:
+        await notify(session, CHANNEL, json.dumps(ids))
@@ -0,0 +1,38 @@
+"""Applies admin panel text edits to the bot's text cache as they happen.
+
+The admin panel NOTIFYs ``bot_texts`` with the changed keys in the same
+transaction as the edit (``bot_text_repo.notify_changed``);
+``apply_changes`` is that channel's handler in the change listener and
+re-reads only those keys.
+"""
+import asyncio
+import json
+import logging
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.db.notify import ALL
+from bot.services import text_service
+
+logger = logging.getLogger(__name__)
+
+
+async def apply_changes(session_pool: async_sessionmaker, payloads: list[str]) -> None:
+    """Reload the keys named in a batch of notifications, or everything if one says ALL."""
+    if ALL in payloads:
+        await text_service.refresh(session_pool)
+        return
+    keys: set[str] = set()
+    for payload in payloads:
+        keys.update(json.loads(payload))
+    await text_service.refresh_keys(session_pool, sorted(keys))
+
+
+async def run_text_refresher(session_pool: async_sessionmaker, interval: float) -> None:
+    """Reload all texts every ``interval`` seconds, for edits made without NOTIFY (e.g. in psql)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await text_service.refresh(session_pool)
+        except Exception:
+            logger.exception("Periodic bot text reload failed")
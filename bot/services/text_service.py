@@ -2,22 +2,29 @@
 Bot text service with caching and multi-language support.
 All bot messages are stored in DB and can be edited via admin panel.
 """
+import asyncio
 import logging
-import time
-from typing import Optional
+import string
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from bot.db.repositories import bot_text_repo
-from bot.utils.language import current_language, DEFAULT_LANGUAGE
+from bot.utils.language import current_language, DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES
 
 logger = logging.getLogger(__name__)
 
 # In-memory cache for texts: {key: {lang: value}}
 _cache: dict[str, dict[str, str]] = {}
 _cache_loaded: bool = False
-_cache_updated_at: float = 0.0
-CACHE_TTL: int = 60  # seconds
+_version: int = 0  # bumped on every change to _cache
+
+# Background reloads: one writer at a time, concurrent full reloads share one
+_write_lock = asyncio.Lock()
+_inflight: asyncio.Task | None = None
+
+# (key, lang) pairs the DB had no text for, so it's asked only once
+_missing: set[tuple[str, str]] = set()
 
 
 # === DEFAULT TEXTS (Russian) ===
@@ -166,6 +173,16 @@ DEFAULT_TEXTS = {
     "admin_master_assigned": "Мастер назначен!",
     "admin_master_not_found": "Мастер не найден.",
     "admin_choose_master_for": "Выберите мастера для заявки №{ticket_id}:",
+    "admin_stats": (
+        "📊 <b>Статистика за {date_from} — {date_to}</b>\n"
+        "Всего заявок: <b>{total}</b>\n\n"
+        "<b>По статусам:</b>\n{by_status}\n\n"
+        "<b>По ЖК:</b>\n{by_complex}\n\n"
+        "<b>По категориям:</b>\n{by_category}\n\n"
+        "<b>По мастерам:</b>\n{by_master}"
+    ),
+    "admin_stats_empty": "📊 За период {date_from} — {date_to} заявок нет.",
+    "admin_stats_unassigned": "Не назначен",
 
     # === ADMIN CAR PLATE ===
     "admin_car_plate_approved": "✅ Заявка <b>№{ticket_id}</b> на добавление госномера <b>ОДОБРЕНА</b>.\n\nКлиент уведомлен.",
@@ -223,6 +240,7 @@ DEFAULT_TEXTS = {
     "toast_ticket_approved": "Заявка одобрена!",
     "toast_ticket_rejected": "Заявка отклонена!",
     "toast_ticket_submitted": "Заявка отправлена!",
+    "toast_slow_down": "Слишком часто. Подождите пару секунд.",
 }
 
 # === DEFAULT TEXTS (Kazakh) ===
@@ -336,6 +354,16 @@ DEFAULT_TEXTS_KK = {
     "admin_master_assigned": "Шебер тағайындалды!",
     "admin_master_not_found": "Шебер табылмады.",
     "admin_choose_master_for": "Өтінім №{ticket_id} үшін шеберді таңдаңыз:",
+    "admin_stats": (
+        "📊 <b>{date_from} — {date_to} статистикасы</b>\n"
+        "Барлық өтінімдер: <b>{total}</b>\n\n"
+        "<b>Мәртебелер бойынша:</b>\n{by_status}\n\n"
+        "<b>ТҮК бойынша:</b>\n{by_complex}\n\n"
+        "<b>Санаттар бойынша:</b>\n{by_category}\n\n"
+        "<b>Шеберлер бойынша:</b>\n{by_master}"
+    ),
+    "admin_stats_empty": "📊 {date_from} — {date_to} кезеңінде өтінімдер жоқ.",
+    "admin_stats_unassigned": "Тағайындалмаған",
     "admin_car_plate_approved": "✅ Мемлекеттік нөмір қосу бойынша өтінім <b>№{ticket_id}</b> <b>МАҚҰЛДАНДЫ</b>.\n\nКлиентке хабарландырылды.",
     "admin_car_plate_rejected": "❌ Мемлекеттік нөмір қосу бойынша өтінім <b>№{ticket_id}</b> <b>ҚАБЫЛДАНБАДЫ</b>.\n\nКлиентке хабарландырылды.",
     "notify_new_ticket": "🆕 Жаңа өтінім <b>№{ticket_id}</b>!\n\n{card}",
@@ -383,6 +411,7 @@ DEFAULT_TEXTS_KK = {
     "toast_ticket_approved": "Өтінім мақұлданды!",
     "toast_ticket_rejected": "Өтінім қабылданбады!",
     "toast_ticket_submitted": "Өтінім жіберілді!",
+    "toast_slow_down": "Тым жиі. Бірнеше секунд күтіңіз.",
 }
 
 # Text descriptions for admin panel
@@ -429,15 +458,85 @@ TEXT_DESCRIPTIONS = {
     "notify_car_plate_in_progress": "Госномер одобрен админом, отправлен мастеру ({card})",
     "notify_admin_new_ticket": "Уведомление админу о новой заявке ({card})",
     "admin_master_reassigned": "Сообщение о смене мастера ({ticket_id}, {master_name})",
+    "admin_stats": "Статистика для администратора ({date_from}, {date_to}, {total}, {by_status}, {by_complex}, {by_category}, {by_master})",
+    "admin_stats_empty": "Статистика: нет заявок за период ({date_from}, {date_to})",
+    "toast_slow_down": "Предупреждение, когда пользователь отправляет сообщения или нажимает кнопки слишком часто",
 }
 
 
+def placeholders(text: str) -> frozenset[str]:
+    """Field names ``text`` uses; none if its braces don't parse."""
+    try:
+        return frozenset(name for _, name, _, _ in string.Formatter().parse(text) if name is not None)
+    except ValueError:
+        return frozenset()
+
+
+_DEFAULT_FIELDS: dict[str, frozenset[str]] = {key: placeholders(text) for key, text in DEFAULT_TEXTS.items()}
+
+
+def _default_text(key: str, lang: str) -> str:
+    text = DEFAULT_TEXTS_KK.get(key) if lang == "kk" else None
+    return text if text is not None else DEFAULT_TEXTS.get(key, f"[{key}]")
+
+
+def unknown_placeholders(key: str, text: str) -> list[str]:
+    """Placeholders in ``text`` that the code never passes for ``key``.
+
+    The default text of a key lists exactly what its call sites pass (see
+    tests/unit/test_text_placeholders.py); keys without one accept anything.
+    """
+    fields = _DEFAULT_FIELDS.get(key)
+    if fields is None:
+        return []
+    return sorted(placeholders(text) - fields)
+
+
+def _checked(key: str, text: str) -> str | None:
+    """``text``, or None if it uses placeholders its call sites never pass."""
+    unknown = unknown_placeholders(key, text)
+    if unknown:
+        logger.warning("Text %s uses unknown placeholders %s, using the default instead", key, ", ".join(unknown))
+        return None
+    return text
+
+
+def _check_values(key: str, values: dict[str, str]) -> None:
+    """Swap edited texts of ``key`` the code can't fill for their defaults, so cache hits skip the check."""
+    for lang, text in values.items():
+        if text and _checked(key, text) is None:
+            values[lang] = _default_text(key, lang)
+
+
+def _cached_text(key: str, lang: str) -> str | None:
+    if not _cache_loaded:
+        return None
+    values = _cache.get(key)
+    if not values:
+        return None
+    return values.get(lang) or values.get(DEFAULT_LANGUAGE)
+
+
+def _format(key: str, text: str, kwargs: dict[str, Any]) -> str:
+    if not kwargs:
+        return text
+    try:
+        return text.format_map(kwargs)
+    except (KeyError, IndexError, ValueError) as e:
+        logger.warning("Cannot format text %s: %r", key, e)
+        return text
+
+
 async def load_cache(session: AsyncSession) -> None:
     """Load all texts into memory cache."""
-    global _cache, _cache_loaded, _cache_updated_at
-    _cache = await bot_text_repo.get_all_as_dict(session)
+    global _cache, _cache_loaded, _version
+    cache = await bot_text_repo.get_all_as_dict(session)
+    for key, values in cache.items():
+        _check_values(key, values)
+    _cache = cache
     _cache_loaded = True
-    _cache_updated_at = time.time()
+    _version += 1
+    _missing.clear()
     logger.info("Loaded %d bot texts into cache", len(_cache))
 
 
@@ -445,45 +544,27 @@ async def get_text(session: AsyncSession, key: str, **kwargs) -> str:
     """
     Get text by key in the current language.
     Falls back: current_lang -> ru -> DEFAULT_TEXTS -> [key].
-    Auto-refreshes cache every CACHE_TTL seconds.
+    Edits reach the cache through reload_keys (see text_listener).
     """
-    global _cache, _cache_loaded, _cache_updated_at
-
     lang = current_language.get()
 
-    # Auto-refresh cache if TTL expired
-    if _cache_loaded and (time.time() - _cache_updated_at) > CACHE_TTL:
-        try:
-            await load_cache(session)
-        except Exception as e:
-            logger.warning("Failed to refresh text cache: %s", e)
-
     # Try cache first
-    text = None
-    if _cache_loaded and key in _cache:
-        text = _cache[key].get(lang) or _cache[key].get(DEFAULT_LANGUAGE)
+    text = _cached_text(key, lang)
 
-    if text is None:
+    if text is None and (key, lang) not in _missing:
         # Try DB
         text = await bot_text_repo.get_by_key(session, key, lang)
         if text is None and lang != DEFAULT_LANGUAGE:
             text = await bot_text_repo.get_by_key(session, key, DEFAULT_LANGUAGE)
+        text = _checked(key, text) if text is not None else None
+        if text is None:
+            _missing.add((key, lang))
 
     if text is None:
         # Fall back to default
-        if lang == "kk":
-            text = DEFAULT_TEXTS_KK.get(key)
-        if text is None:
-            text = DEFAULT_TEXTS.get(key, f"[{key}]")
+        text = _default_text(key, lang)
 
-    # Format with kwargs if provided
-    if kwargs:
-        try:
-            text = text.format(**kwargs)
-        except KeyError as e:
-            logger.warning("Missing format key %s for text %s", e, key)
-
-    return text
+    return _format(key, text, kwargs)
 
 
 def get_text_sync(key: str, **kwargs) -> str:
@@ -492,45 +573,71 @@ def get_text_sync(key: str, **kwargs) -> str:
     Use for keyboards where async is not available.
     """
     lang = current_language.get()
+    text = _cached_text(key, lang) or _default_text(key, lang)
+    return _format(key, text, kwargs)
 
-    text = None
-    if _cache_loaded and key in _cache:
-        text = _cache[key].get(lang) or _cache[key].get(DEFAULT_LANGUAGE)
 
-    if text is None:
-        if lang == "kk":
-            text = DEFAULT_TEXTS_KK.get(key)
-        if text is None:
-            text = DEFAULT_TEXTS.get(key, f"[{key}]")
+async def refresh_cache(session: AsyncSession) -> None:
+    """Force refresh the cache from DB."""
+    await load_cache(session)
 
-    if kwargs:
-        try:
-            text = text.format(**kwargs)
-        except KeyError:
-            pass
 
-    return text
+async def reload_keys(session: AsyncSession, keys: list[str]) -> None:
+    """Re-read only ``keys`` from DB after they were edited, added or deleted."""
+    global _version
+    fresh = await bot_text_repo.get_by_keys(session, keys) if _cache_loaded else {}
+    for key in keys:
+        if _cache_loaded:
+            if key in fresh:
+                _check_values(key, fresh[key])
+                _cache[key] = fresh[key]
+            else:
+                _cache.pop(key, None)
+        for lang in SUPPORTED_LANGUAGES:
+            _missing.discard((key, lang))
+    _version += 1
+    logger.info("Reloaded bot texts: %s", ", ".join(keys))
 
 
-async def refresh_cache(session: AsyncSession) -> None:
-    """Force refresh the cache from DB."""
-    await load_cache(session)
+def cache_version() -> int:
+    """Counter bumped by every reload, to tell whether one has landed."""
+    return _version
+
+
+async def refresh(session_pool: async_sessionmaker) -> int:
+    """Reload all texts in a session of their own; returns the new cache version.
+
+    Readers keep getting the current texts until the new ones are swapped
+    in, so they never wait on a reload. Callers arriving while one is
+    running share it instead of starting another.
+    """
+    global _inflight
+    if _inflight is None or _inflight.done():
+        _inflight = asyncio.create_task(_reload(session_pool, None))
+    return await asyncio.shield(_inflight)
+
+
+async def refresh_keys(session_pool: async_sessionmaker, keys: list[str]) -> int:
+    """reload_keys in a session of its own; returns the new cache version."""
+    return await _reload(session_pool, keys)
+
+
+async def _reload(session_pool: async_sessionmaker, keys: list[str] | None) -> int:
+    # Writers take turns, so each reads the DB after the previous one applied
+    async with _write_lock:
+        async with session_pool() as session:
+            if keys is None:
+                await load_cache(session)
+            else:
+                await reload_keys(session, keys)
+        return _version
 
 
 async def seed_default_texts(session: AsyncSession) -> int:
-    """Seed all default texts into DB for both languages if not exists."""
-    count = 0
+    """Insert default texts missing from DB for both languages; edited ones are kept."""
+    rows = []
     for key, value in DEFAULT_TEXTS.items():
         description = TEXT_DESCRIPTIONS.get(key)
-        # Seed Russian
-        existing = await bot_text_repo.get_by_key(session, key, "ru")
-        if not existing:
-            await bot_text_repo.upsert(session, key, value, "ru", description)
-            count += 1
-        # Seed Kazakh
-        kk_value = DEFAULT_TEXTS_KK.get(key, value)
-        existing_kk = await bot_text_repo.get_by_key(session, key, "kk")
-        if not existing_kk:
-            await bot_text_repo.upsert(session, key, kk_value, "kk", description)
-            count += 1
-    return count
+        rows.append({"key": key, "language": "ru", "value": value, "description": description})
+        rows.append({"key": key, "language": "kk", "value": DEFAULT_TEXTS_KK.get(key, value), "description": description})
+    return await bot_text_repo.insert_missing(session, rows)
@@ -2,7 +2,7 @@ import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.db.repositories import ticket_repo, master_repo
+from bot.db.repositories import ticket_repo, master_repo, stats_repo
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +27,7 @@ async def reassign_ticket(
     master_name: str,
 ) -> None:
     """Reassign a ticket to a different master and record the change in history."""
-    await ticket_repo.reassign_master(session, ticket_pk, master_id)
+    await assign_master(session, ticket_pk, master_id)
     await ticket_repo.add_history(
         session,
         ticket_pk=ticket_pk,
@@ -40,12 +40,25 @@ async def reassign_ticket(
     logger.info("Ticket #%d reassigned to master %d by %d", ticket_pk, master_id, changed_by_id)
 
 
-async def create_ticket(session: AsyncSession, data: dict) -> "Ticket":
-    """Create a new ticket from collected FSM data."""
-    from bot.db.models.ticket import Ticket
+async def _record_stats(session: AsyncSession, old: stats_repo.TicketFacts | None, **changes) -> None:
+    """Move the ticket between ``ticket_stats_daily`` buckets for ``changes``.
+
+    ``old`` comes from ``stats_repo.lock_facts`` taken before the ticket
+    was updated; the rollup is written last, after the ticket row.
+    """
+    if old is not None:
+        await stats_repo.record(session, old, old._replace(**changes))
+
+
+async def assign_master(session: AsyncSession, ticket_pk: int, master_id: int) -> None:
+    """Set the ticket's master without a history entry (the caller records one)."""
+    old = await stats_repo.lock_facts(session, ticket_pk)
+    await ticket_repo.reassign_master(session, ticket_pk, master_id)
+    await _record_stats(session, old, assigned_master_id=master_id)
 
-    ticket_id = await ticket_repo.generate_ticket_id(session)
 
+async def create_ticket(session: AsyncSession, data: dict) -> "Ticket":
+    """Create a new ticket from collected FSM data."""
     # Convert enums to strings if needed
     status = data.get("status", "new")
     if hasattr(status, "value"):
@@ -55,51 +68,50 @@ async def create_ticket(session: AsyncSession, data: dict) -> "Ticket":
     if hasattr(category, "value"):
         category = category.value
 
-    ticket = await ticket_repo.create(
-        session,
-        ticket_id=ticket_id,
-        client_telegram_id=data["client_telegram_id"],
-        client_phone=data["client_phone"],
-        client_full_name=data["client_full_name"],
-        residential_complex=data["residential_complex"],
-        category=category,
-        sub_category=data.get("sub_category"),
-        block=data.get("block"),
-        entrance=data.get("entrance"),
-        apartment=data.get("apartment"),
-        description=data["description"],
-        attachments=data.get("attachments"),
-        face_id_photos=data.get("face_id_photos"),
-        car_plate=data.get("car_plate"),
-        car_gate=data.get("car_gate"),
-        has_parking=data.get("has_parking"),
-        parking_number=data.get("parking_number"),
-        parking_reason=data.get("parking_reason"),
-        parking_contract_photo=data.get("parking_contract_photo"),
-        camera_access_email=data.get("camera_access_email"),
-        camera_access_details=data.get("camera_access_details"),
-        key_count=data.get("key_count"),
-        key_type=data.get("key_type"),
-        status=status,
-        assigned_master_id=data.get("assigned_master_id"),
-    )
-
     # Use correct status for history
     history_comment = "Заявка создана"
     if status == "pending_approval":
         history_comment = "Заявка на госномер создана, ожидает одобрения"
 
-    await ticket_repo.add_history(
+    ticket = await ticket_repo.create_with_history(
         session,
-        ticket_pk=ticket.id,
-        old_status=None,
-        new_status=status,
-        changed_by_id=data["client_telegram_id"],
-        changed_by_role="owner",
-        comment=history_comment,
+        values=dict(
+            client_telegram_id=data["client_telegram_id"],
+            client_phone=data["client_phone"],
+            client_full_name=data["client_full_name"],
+            residential_complex=data["residential_complex"],
+            category=category,
+            sub_category=data.get("sub_category"),
+            block=data.get("block"),
+            entrance=data.get("entrance"),
+            apartment=data.get("apartment"),
+            description=data["description"],
+            attachments=data.get("attachments"),
+            face_id_photos=data.get("face_id_photos"),
+            car_plate=data.get("car_plate"),
+            car_gate=data.get("car_gate"),
+            has_parking=data.get("has_parking"),
+            parking_number=data.get("parking_number"),
+            parking_reason=data.get("parking_reason"),
+            parking_contract_photo=data.get("parking_contract_photo"),
+            camera_access_email=data.get("camera_access_email"),
+            camera_access_details=data.get("camera_access_details"),
+            key_count=data.get("key_count"),
+            key_type=data.get("key_type"),
+            status=status,
+            assigned_master_id=data.get("assigned_master_id"),
+        ),
+        history=dict(
+            old_status=None,
+            new_status=status,
+            changed_by_id=data["client_telegram_id"],
+            changed_by_role="owner",
+            comment=history_comment,
+        ),
     )
+    await stats_repo.record(session, None, stats_repo.facts_of(ticket))
 
-    logger.info("Ticket %s created by %s", ticket_id, data["client_telegram_id"])
+    logger.info("Ticket %s created by %s", ticket.ticket_id, data["client_telegram_id"])
     return ticket
 
 
@@ -120,7 +132,9 @@ async def change_status(
     changed_by_role: str,
     comment: str | None = None,
 ) -> None:
+    old = await stats_repo.lock_facts(session, ticket_pk)
     await ticket_repo.update_status(session, ticket_pk, new_status)
+    await _record_stats(session, old, status=new_status)
     await ticket_repo.add_history(
         session,
         ticket_pk=ticket_pk,
@@ -136,7 +150,9 @@ async def change_status(
 async def rate_ticket(
     session: AsyncSession, ticket_pk: int, rating: int, comment: str | None = None
 ) -> None:
+    old = await stats_repo.lock_facts(session, ticket_pk)
     await ticket_repo.set_rating(session, ticket_pk, rating, comment)
+    await _record_stats(session, old, status="closed", rating=rating)
     await ticket_repo.add_history(
         session,
         ticket_pk=ticket_pk,
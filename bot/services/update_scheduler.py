@@ -0,0 +1,142 @@
+"""Concurrent update processing that keeps each chat's updates in order.
+
+Updates from different chats are fed to the dispatcher concurrently, at
+most ``max_concurrency`` at a time; updates from one chat wait for the
+previous one to finish, so FSM flows such as several photos sent at once
+never race on ``state.get_data()`` / ``state.update_data()``.
+"""
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Hashable
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import CallbackQuery, Update
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY: int = 32
+QUEUE_LIMIT: int = 1000
+DEPTH_WARNING: int = 20  # log when one chat has this many updates waiting
+
+
+def chat_key(update: Update) -> Hashable:
+    """The chat whose updates must be processed in order."""
+    event = update.event
+    if isinstance(event, CallbackQuery) and event.message:
+        return event.message.chat.id
+    chat = getattr(event, "chat", None)
+    if chat is not None:
+        return chat.id
+    user = getattr(event, "from_user", None)
+    if user is not None:
+        return user.id
+    # No chat to order against (e.g. poll updates)
+    return ("update", update.update_id)
+
+
+class ChatScheduler:
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        max_concurrency: int = MAX_CONCURRENCY,
+        queue_limit: int = QUEUE_LIMIT,
+    ) -> None:
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.queue_limit = queue_limit
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Per chat: the update being processed (still at the head) and those waiting
+        self._queues: dict[Hashable, deque[Update]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._room = asyncio.Event()
+        self._room.set()
+        self.pending = 0
+        self.running = 0
+        self.processed = 0
+        self._peak_depth = 0
+
+    def submit(self, update: Update) -> None:
+        """Queue an update; returns at once, processing happens in the background."""
+        key = chat_key(update)
+        self.pending += 1
+        if self.pending >= self.queue_limit:
+            self._room.clear()
+        queue = self._queues.get(key)
+        if queue is not None:
+            queue.append(update)
+            self._peak_depth = max(self._peak_depth, len(queue))
+            if len(queue) == DEPTH_WARNING:
+                logger.warning("Chat %s has %d updates queued", key, len(queue))
+            return
+        self._queues[key] = deque([update])
+        self._peak_depth = max(self._peak_depth, 1)
+        task = asyncio.create_task(self._drain(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drain(self, key: Hashable) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                update = queue[0]
+                async with self._semaphore:
+                    self.running += 1
+                    try:
+                        await self.dispatcher.feed_update(self.bot, update)
+                    except Exception:
+                        logger.exception("Failed to process update %s", update.update_id)
+                    finally:
+                        self.running -= 1
+                queue.popleft()
+                self._done()
+        finally:
+            # No await between the empty check and here, so submit() can't
+            # append to a queue nobody drains
+            del self._queues[key]
+            self.pending -= len(queue)
+
+    def _done(self) -> None:
+        self.pending -= 1
+        self.processed += 1
+        if self.pending < self.queue_limit:
+            self._room.set()
+
+    async def wait_for_room(self) -> None:
+        """Wait until fewer than ``queue_limit`` updates are pending."""
+        await self._room.wait()
+
+    @property
+    def chats(self) -> int:
+        """Chats with updates queued or running."""
+        return len(self._queues)
+
+    @property
+    def max_depth(self) -> int:
+        """Updates queued or running in the busiest chat right now."""
+        return max(map(len, self._queues.values()), default=0)
+
+    @property
+    def peak_depth(self) -> int:
+        """The deepest chat queue since the last ``reset_peak``."""
+        return self._peak_depth
+
+    def reset_peak(self) -> None:
+        self._peak_depth = self.max_depth
+
+    def stats(self) -> dict[str, int]:
+        """Current load, for the periodic log."""
+        return {
+            "chats": self.chats,
+            "pending": self.pending,
+            "running": self.running,
+            "processed": self.processed,
+            "max_depth": self.max_depth,
+            "peak_depth": self.peak_depth,
+        }
+
+    async def close(self) -> None:
+        """Wait for every queued update to be processed."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
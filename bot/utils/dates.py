@@ -0,0 +1,34 @@
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from bot.config import settings
+
+
+def local_today() -> date:
+    """Today's date in the configured business timezone."""
+    return datetime.now(ZoneInfo(settings.timezone)).date()
+
+
+def day_start(day: date) -> datetime:
+    """Naive DB timestamp at which the given local day begins."""
+    local = datetime.combine(day, time.min, tzinfo=ZoneInfo(settings.timezone))
+    return local.astimezone(ZoneInfo(settings.db_timezone)).replace(tzinfo=None)
+
+
+def day_range(first: date, last: date | None = None) -> tuple[datetime, datetime]:
+    """Half-open ``[start, end)`` DB timestamp range covering local days first..last.
+
+    Comparing the bare column against these bounds keeps the predicate
+    sargable, unlike ``date(created_at) = ...``.
+    """
+    return day_start(first), day_start((last or first) + timedelta(days=1))
+
+
+def local_date(ts: datetime) -> date:
+    """Local calendar day of a naive DB timestamp."""
+    return ts.replace(tzinfo=ZoneInfo(settings.db_timezone)).astimezone(ZoneInfo(settings.timezone)).date()
+
+
+def db_now() -> datetime:
+    """Current time as a naive DB timestamp (same clock basis as ``now()`` in SQL)."""
+    return datetime.now(ZoneInfo(settings.db_timezone)).replace(tzinfo=None)
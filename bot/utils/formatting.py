@@ -157,3 +157,16 @@ def format_ticket_confirmation(data: dict) -> str:
         lines.append(f"Фото: {photo_count} шт.")
 
     return "\n".join(lines)
+
+
+def format_stats_lines(rows: list, names: dict, show_rating: bool = False) -> str:
+    """One ``• name: count`` line per rollup row (``stats_repo.StatsRow``)."""
+    if not rows:
+        return "—"
+    lines = []
+    for row in rows:
+        line = f"• {names.get(row.value, row.value)}: {row.tickets}"
+        if show_rating and row.avg_rating is not None:
+            line += f" (★ {row.avg_rating:.1f})"
+        lines.append(line)
+    return "\n".join(lines)
@@ -7,3 +7,14 @@ def paginate(total: int, page: int, per_page: int = PER_PAGE) -> tuple[int, int,
     page = max(1, min(page, total_pages))
     offset = (page - 1) * per_page
     return offset, per_page, total_pages
+
+
+def page_count(total: int, per_page: int = PER_PAGE) -> int:
+    return max(1, (total + per_page - 1) // per_page)
+
+
+def keyset_args(cursor) -> dict:
+    """Repository keyset arguments from a ``PageCB`` (or nothing for page 1)."""
+    if cursor is None:
+        return {}
+    return {"after_id": cursor.after or None, "before_id": cursor.before or None}
@@ -1,6 +1,17 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from bot.db.repositories import ticket_repo
+from datetime import date
 
+from sqlalchemy import String, cast, func, literal
+from sqlalchemy.sql import ColumnElement
 
-async def generate(session: AsyncSession) -> str:
-    return await ticket_repo.generate_ticket_id(session)
+TICKET_ID_PREFIX = "QSS"
+
+
+def format_ticket_id(day: date, number: int) -> str:
+    """Build the public ticket ID, e.g. QSS-20250101-0001."""
+    return f"{TICKET_ID_PREFIX}-{day.strftime('%Y%m%d')}-{number:04d}"
+
+
+def ticket_id_sql(day: date, number: ColumnElement[int]) -> ColumnElement[str]:
+    """format_ticket_id for a number computed in SQL (Postgres)."""
+    digits = cast(number, String)
+    return literal(format_ticket_id(day, 0)[:-4]) + func.lpad(digits, func.greatest(4, func.length(digits)), "0")
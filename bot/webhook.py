@@ -0,0 +1,111 @@
+"""Webhook mode: Telegram POSTs updates to an aiohttp server.
+
+The endpoint answers as soon as the update is queued on a
+``ChatScheduler``, so a slow handler never holds Telegram's connection.
+When the scheduler is full the answer waits for room instead, which
+holds Telegram back the way polling stops calling getUpdates.
+
+Per-chat order is only kept within one process, and nginx can't route by
+chat (the chat is only in the JSON body): with two replicas, two quick
+updates of one chat could run at once and one ``update_data`` overwrite
+the other. So one replica receives webhooks: it holds a Postgres advisory
+lock while running, and a second one refuses to start.
+"""
+import asyncio
+import hmac
+import logging
+import signal
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.config import settings
+from bot.services.update_scheduler import ChatScheduler
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+# Advisory lock key held by the replica receiving webhooks
+WEBHOOK_LOCK_ID = 7_201_001
+
+
+@asynccontextmanager
+async def single_receiver(engine: AsyncEngine) -> AsyncIterator[None]:
+    """Hold the webhook lock for the block; RuntimeError if another replica has it.
+
+    SQLite (tests) has no advisory locks, so there this does nothing.
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    # The lock belongs to this connection: it is released when it closes, even on a crash
+    async with engine.connect() as conn:
+        if not await conn.scalar(select(func.pg_try_advisory_lock(WEBHOOK_LOCK_ID))):
+            raise RuntimeError(
+                "Another bot replica is already receiving webhooks; run a single replica with BOT_MODE=webhook"
+            )
+        try:
+            yield
+        finally:
+            await conn.scalar(select(func.pg_advisory_unlock(WEBHOOK_LOCK_ID)))
+
+
+def create_app(bot: Bot, scheduler: ChatScheduler, path: str, secret: str = "") -> web.Application:
+    async def handle_update(request: web.Request) -> web.Response:
+        if secret and not hmac.compare_digest(request.headers.get(SECRET_HEADER, ""), secret):
+            return web.Response(status=401)
+        try:
+            update = Update.model_validate(await request.json(), context={"bot": bot})
+        except (ValueError, ValidationError):
+            return web.Response(status=400)
+        await scheduler.wait_for_room()
+        scheduler.submit(update)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post(path, handle_update)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, scheduler: ChatScheduler, engine: AsyncEngine) -> None:
+    if not settings.webhook_url:
+        raise ValueError("WEBHOOK_URL is required when BOT_MODE=webhook")
+    if not settings.webhook_secret:
+        logger.warning("WEBHOOK_SECRET is not set, the webhook accepts updates from anyone")
+    async with single_receiver(engine):
+        await _serve(dp, bot, scheduler)
+
+
+async def _serve(dp: Dispatcher, bot: Bot, scheduler: ChatScheduler) -> None:
+    app = create_app(bot, scheduler, settings.webhook_path, settings.webhook_secret)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await dp.emit_startup(bot=bot, dispatcher=dp, **dp.workflow_data)
+    try:
+        await site.start()
+        await bot.set_webhook(
+            settings.webhook_url.rstrip("/") + settings.webhook_path,
+            secret_token=settings.webhook_secret or None,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info("Webhook server listening on %s:%s%s", settings.webhook_host, settings.webhook_port, settings.webhook_path)
+        await stop.wait()
+        logger.info("Webhook server stopping, finishing queued updates...")
+    finally:
+        await runner.cleanup()
+        await scheduler.close()
+        await dp.emit_shutdown(bot=bot, dispatcher=dp, **dp.workflow_data)
+        await bot.session.close()
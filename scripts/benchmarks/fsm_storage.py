@@ -0,0 +1,128 @@
+"""Per-update FSM storage overhead: MemoryStorage vs DbStorage with and without batching.
+
+Each update is fed through a Dispatcher and does what ``process_photo``
+does: FSMContextMiddleware reads the state for the state filter, the
+handler reads the data and appends a file id with ``update_data``. The
+batched run is wired as in ``bot.__main__`` (FsmBatchMiddleware around
+FSMContextMiddleware). Reports latency and SQL statements per update.
+
+Run against the configured database:
+    docker compose exec bot python -m scripts.benchmarks.fsm_storage
+or locally against a throwaway SQLite file:
+    python -m scripts.benchmarks.fsm_storage --sqlite
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message, Update, User
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+import bot.db.models  # noqa: F401 — register all tables on Base.metadata
+from bot.db.base import Base
+from bot.db.models.fsm_state import FsmState
+from bot.middlewares.fsm_batch import FsmBatchMiddleware
+from bot.services.fsm_storage import DbStorage
+from bot.states.create_ticket import CreateTicketState
+
+CHAT_ID = 900_000
+
+
+async def process_photo(message: Message, state: FSMContext) -> None:
+    data = await state.get_data()
+    attachments = data.get("attachments", [])
+    attachments.append(message.text)
+    await state.update_data(attachments=attachments[-10:])
+
+
+def create_dispatcher(storage: BaseStorage, batched: bool) -> Dispatcher:
+    router = Router()
+    router.message.register(process_photo, CreateTicketState.uploading_photos)
+    dp = Dispatcher(storage=storage, disable_fsm=batched)
+    if batched:
+        dp.update.outer_middleware(FsmBatchMiddleware(storage))
+        dp.update.outer_middleware(dp.fsm)
+    dp.include_router(router)
+    return dp
+
+
+def photo_update(i: int) -> Update:
+    return Update(update_id=i, message=Message(
+        message_id=i, date=datetime.now(), text=f"file-{i}",
+        chat=Chat(id=CHAT_ID, type="private"), from_user=User(id=CHAT_ID, is_bot=False, first_name="Benchmark"),
+    ))
+
+
+async def run(
+    name: str, storage: BaseStorage, updates: int, counter: list[int], batched: bool = False
+) -> None:
+    bot = Bot("1:BENCHMARK")
+    dp = create_dispatcher(storage, batched)
+    key = StorageKey(bot_id=bot.id, chat_id=CHAT_ID, user_id=CHAT_ID)
+    await storage.set_state(key, CreateTicketState.uploading_photos)
+    await dp.feed_update(bot, photo_update(0))  # warm up connections and caches
+
+    counter[0] = 0
+    timings = []
+    for i in range(1, updates + 1):
+        start = time.perf_counter()
+        await dp.feed_update(bot, photo_update(i))
+        timings.append((time.perf_counter() - start) * 1000)
+    await bot.session.close()
+
+    timings.sort()
+    print(
+        f"{name:<22} mean {statistics.fmean(timings):7.3f} ms  "
+        f"p50 {timings[len(timings) // 2]:7.3f} ms  "
+        f"p95 {timings[int(len(timings) * 0.95)]:7.3f} ms  "
+        f"{counter[0] / updates:4.1f} statements/update"
+    )
+
+
+def count_statements(engine: AsyncEngine) -> list[int]:
+    counter = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(*args) -> None:
+        counter[0] += 1
+
+    return counter
+
+
+async def main(updates: int, use_sqlite: bool) -> None:
+    if use_sqlite:
+        path = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        from bot.db.engine import engine
+    session_pool = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    counter = count_statements(engine)
+
+    print(f"{updates} updates on {engine.dialect.name}")
+    await run("MemoryStorage", MemoryStorage(), updates, counter)
+    await run("DbStorage, per call", DbStorage(session_pool), updates, counter)
+    await run("DbStorage, batched", DbStorage(session_pool), updates, counter, batched=True)
+
+    async with session_pool() as session:
+        await session.execute(delete(FsmState).where(FsmState.key.like(f"%:{CHAT_ID}:{CHAT_ID}%")))
+        await session.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--sqlite", action="store_true", help="use a temporary SQLite file instead of DB_* settings")
+    args = parser.parse_args()
+    asyncio.run(main(args.updates, args.sqlite))
@@ -0,0 +1,59 @@
+"""Per-event overhead of ThrottlingMiddleware.
+
+Compares calling a no-op handler directly with calling it through the
+middleware for: many users in turn (allowed, LRU churn past maxsize),
+and one user flooding (refused after the burst; the notice is a no-op).
+
+    python -m scripts.benchmarks.throttling --events 200000
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiogram.types import Message, User
+
+from bot.middlewares.throttling import MAXSIZE, ThrottlingMiddleware
+
+
+class _Message(Message):
+    async def answer(self, *args, **kwargs) -> None:
+        pass
+
+
+def make_event(user_id: int) -> Message:
+    return _Message.model_construct(from_user=User.model_construct(id=user_id))
+
+
+async def handler(event, data) -> None:
+    pass
+
+
+async def measure(name: str, call, events: list, baseline: float | None = None) -> float:
+    start = time.perf_counter()
+    for event in events:
+        await call(handler, event, {})
+    per_event = (time.perf_counter() - start) / len(events) * 1e9
+    extra = f"  (+{per_event - baseline:6.0f} ns)" if baseline is not None else ""
+    print(f"{name:<34} {per_event:8.0f} ns/event{extra}")
+    return per_event
+
+
+async def main(n: int) -> None:
+    many_users = [make_event(i) for i in range(n)]
+    one_user = [make_event(1)] * n
+
+    async def direct(h, event, data):
+        return await h(event, data)
+
+    baseline = await measure("no middleware", direct, many_users)
+    mw = ThrottlingMiddleware()
+    await measure(f"{n} users (maxsize {MAXSIZE})", mw, many_users, baseline)
+    await measure("1 user flooding", ThrottlingMiddleware(), one_user, baseline)
+    print(f"buckets kept: {len(mw._buckets)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    asyncio.run(main(parser.parse_args().events))
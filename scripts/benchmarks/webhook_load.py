@@ -0,0 +1,121 @@
+"""Feed synthetic message updates to the webhook endpoint and measure it.
+
+By default starts an in-process webhook server whose only handler sleeps
+for --handler-ms, so it shows how the per-chat scheduler overlaps chats
+while keeping each chat's updates in order (checked at the end).
+With --url it loads a running bot instead (e.g. behind nginx); handlers
+there will try to answer the synthetic chats and fail, which is fine for
+measuring the endpoint itself.
+
+    python -m scripts.benchmarks.webhook_load --updates 5000 --chats 200
+    python -m scripts.benchmarks.webhook_load --url http://localhost:8090/webhook --secret ...
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from collections import defaultdict
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message
+from aiohttp import ClientSession, web
+
+from bot.services.update_scheduler import ChatScheduler
+from bot.webhook import SECRET_HEADER, create_app
+
+PORT = 8181
+
+
+def make_update(update_id: int, chat_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+            "text": str(update_id),
+        },
+    }
+
+
+def local_dispatcher(handler_ms: float, seen: dict[int, list[int]]) -> Dispatcher:
+    router = Router()
+
+    @router.message()
+    async def handle(message: Message) -> None:
+        await asyncio.sleep(handler_ms / 1000)
+        seen[message.chat.id].append(message.message_id)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+async def fire(url: str, secret: str, updates: int, chats: int, concurrency: int) -> list[float]:
+    ids = itertools.count(1)
+    latencies: list[float] = []
+    headers = {SECRET_HEADER: secret} if secret else {}
+
+    async with ClientSession() as http:
+        async def worker() -> None:
+            while (update_id := next(ids)) <= updates:
+                body = make_update(update_id, 1_000_000 + update_id % chats)
+                start = time.perf_counter()
+                async with http.post(url, json=body, headers=headers) as resp:
+                    await resp.read()
+                    if resp.status != 200:
+                        raise RuntimeError(f"HTTP {resp.status} for update {update_id}")
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def report(latencies: list[float], elapsed: float) -> None:
+    latencies.sort()
+    print(
+        f"{len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s), "
+        f"latency mean {statistics.fmean(latencies):.2f} ms, "
+        f"p50 {latencies[len(latencies) // 2]:.2f} ms, p99 {latencies[int(len(latencies) * 0.99)]:.2f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.url:
+        start = time.perf_counter()
+        latencies = await fire(args.url, args.secret, args.updates, args.chats, args.concurrency)
+        report(latencies, time.perf_counter() - start)
+        return
+
+    seen: dict[int, list[int]] = defaultdict(list)
+    bot = Bot("123456:LOAD-TEST")
+    scheduler = ChatScheduler(local_dispatcher(args.handler_ms, seen), bot)
+    runner = web.AppRunner(create_app(bot, scheduler, "/webhook", args.secret))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+    try:
+        start = time.perf_counter()
+        latencies = await fire(f"http://127.0.0.1:{PORT}/webhook", args.secret, args.updates, args.chats, args.concurrency)
+        report(latencies, time.perf_counter() - start)
+        await scheduler.close()
+        print(f"all updates processed after {time.perf_counter() - start:.2f}s")
+    finally:
+        await runner.cleanup()
+        await bot.session.close()
+
+    out_of_order = [chat for chat, ids in seen.items() if ids != sorted(ids)]
+    print(f"{sum(map(len, seen.values()))} updates handled in {len(seen)} chats, {len(out_of_order)} chats out of order")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--chats", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50, help="parallel HTTP requests")
+    parser.add_argument("--handler-ms", type=float, default=20, help="simulated handler time (local mode)")
+    parser.add_argument("--url", help="webhook URL of a running bot instead of the in-process server")
+    parser.add_argument("--secret", default="load-test-secret")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,27 @@
+"""Recompute the ticket_stats_daily rollup from the tickets table.
+
+Use for the initial backfill or if the rollup is ever suspected to drift.
+Run: docker compose exec bot python -m scripts.rebuild_ticket_stats
+"""
+
+import asyncio
+
+from sqlalchemy import text
+
+from bot.db.engine import engine, session_pool
+from bot.db.repositories import stats_repo
+
+
+async def rebuild() -> None:
+    async with session_pool() as session:
+        if session.bind.dialect.name == "postgresql":
+            # Keep ticket writes out until the new rollup is committed
+            await session.execute(text("LOCK TABLE tickets IN SHARE MODE"))
+        rows = await stats_repo.rebuild(session)
+        await session.commit()
+    await engine.dispose()
+    print(f"Rebuilt ticket_stats_daily: {rows} rows.")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.db.engine import engine, session_pool
 from bot.db.models import Owner, Master, Admin
+from bot.db.repositories import master_repo
 
 
 OWNERS = [
@@ -86,7 +87,9 @@ async def seed() -> None:
                 select(Master).where(Master.telegram_id == data["telegram_id"])
             )
             if not exists.scalar_one_or_none():
-                session.add(Master(**data))
+                master = Master(**data)
+                master_repo.set_complexes(master, data["residential_complex"].split(","))
+                session.add(master)
 
         # Admins
         for data in ADMINS:
@@ -1,8 +1,13 @@
 """Shared fixtures for all tests."""
+import os
+
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
+# bot.config.Settings requires a token; tests never talk to Telegram
+os.environ.setdefault("BOT_TOKEN", "123456:test-token")
+
 
 @pytest.fixture
 def fake_owner():
@@ -30,6 +35,7 @@ def fake_master():
     master.full_name = "Test Master"
     master.username = "testmaster"
     master.residential_complex = "alasha,terekti"
+    master.complex_names = ["alasha", "terekti"]
     master.is_active = True
     master.language = "ru"
     return master
@@ -0,0 +1,54 @@
+"""Integration tests for the admin dashboard loader."""
+from contextlib import asynccontextmanager
+
+import pytest
+
+from bot.db.models import Master, Owner, Ticket
+from bot.db.repositories import stats_repo
+from bot.services.dashboard_service import DASHBOARD_CONCURRENCY, load_dashboard
+
+
+class TestLoadDashboard:
+    @pytest.mark.asyncio
+    async def test_loads_counts_and_recent_tickets(self, session_factory):
+        async with session_factory() as session:
+            session.add(Owner(phone="77001234567", full_name="Owner", residential_complex="alasha"))
+            session.add(Master(telegram_id=1, full_name="Master", residential_complex="alasha"))
+            for i, status in enumerate(["new", "in_progress", "closed"]):
+                session.add(Ticket(
+                    ticket_id=f"QSS-D-{i:04d}", client_telegram_id=1, client_phone="7700",
+                    client_full_name="Owner", residential_complex="alasha", category="cctv",
+                    description="d", status=status,
+                ))
+            await session.flush()
+            await stats_repo.rebuild(session)
+            await session.commit()
+
+        data = await load_dashboard(session_factory)
+
+        assert data["stats"] == {
+            "total_tickets": 3, "new_tickets": 1, "in_progress": 1, "completed": 1,
+            "total_owners": 1, "total_masters": 1,
+        }
+        assert len(data["recent_tickets"]) == 3
+        assert [(row.value, row.tickets) for row in data["by_complex"]] == [("alasha", 3)]
+
+    @pytest.mark.asyncio
+    async def test_holds_few_sessions_at_once(self, session_factory):
+        open_sessions = peak = 0
+
+        @asynccontextmanager
+        async def counting_pool():
+            nonlocal open_sessions, peak
+            open_sessions += 1
+            peak = max(peak, open_sessions)
+            try:
+                async with session_factory() as session:
+                    yield session
+            finally:
+                open_sessions -= 1
+
+        data = await load_dashboard(counting_pool)
+
+        assert data["stats"]["total_tickets"] == 0
+        assert peak == DASHBOARD_CONCURRENCY
@@ -0,0 +1,21 @@
+"""Integration tests for bot.db.engine pool instrumentation."""
+import pytest
+
+
+class TestTimedQueuePool:
+    @pytest.mark.asyncio
+    async def test_records_checkouts(self, tmp_path):
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from bot.db.engine import TimedQueuePool
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+        try:
+            for _ in range(3):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            assert engine.pool.checkouts == 3
+            assert engine.pool.checkout_time_max >= 0
+            assert engine.pool.checkedout() == 0
+        finally:
+            await engine.dispose()
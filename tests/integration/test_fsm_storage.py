@@ -0,0 +1,142 @@
+"""Integration tests for the DB-backed FSM storage."""
+from datetime import datetime
+
+import pytest
+from unittest.mock import patch
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.types import Chat, Message, Update, User
+from sqlalchemy import event, func, select
+
+from bot.db.models.fsm_state import FsmState
+from bot.db.repositories import fsm_repo
+from bot.middlewares.fsm_batch import FsmBatchMiddleware
+from bot.services.fsm_storage import DbStorage
+from bot.states.create_ticket import CreateTicketState
+
+KEY = StorageKey(bot_id=1, chat_id=100, user_id=100)
+
+
+async def add_photo(message: Message, state: FSMContext) -> None:
+    data = await state.get_data()
+    await state.update_data(attachments=data.get("attachments", []) + [message.text])
+
+
+async def _row_count(session_factory) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(FsmState))
+
+
+class TestDbStorage:
+    @pytest.mark.asyncio
+    async def test_state_survives_new_storage(self, session_factory):
+        await DbStorage(session_factory).set_state(KEY, CreateTicketState.uploading_photos)
+        await DbStorage(session_factory).update_data(KEY, {"attachments": ["a"]})
+
+        storage = DbStorage(session_factory)
+        assert await storage.get_state(KEY) == CreateTicketState.uploading_photos.state
+        assert await storage.get_data(KEY) == {"attachments": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_missing_key(self, session_factory):
+        storage = DbStorage(session_factory)
+        assert await storage.get_state(KEY) is None
+        assert await storage.get_data(KEY) == {}
+
+    @pytest.mark.asyncio
+    async def test_batch_coalesces_writes(self, session_factory):
+        storage = DbStorage(session_factory)
+        with patch.object(fsm_repo, "get", wraps=fsm_repo.get) as get, \
+                patch.object(fsm_repo, "upsert", wraps=fsm_repo.upsert) as upsert:
+            async with storage.batch():
+                for i in range(5):
+                    data = await storage.get_data(KEY)
+                    await storage.update_data(KEY, {"attachments": data.get("attachments", []) + [str(i)]})
+                await storage.set_state(KEY, CreateTicketState.uploading_photos)
+
+        assert get.await_count == 1
+        assert upsert.await_count == 1
+        fresh = DbStorage(session_factory)
+        assert await fresh.get_data(KEY) == {"attachments": ["0", "1", "2", "3", "4"]}
+        assert await fresh.get_state(KEY) == CreateTicketState.uploading_photos.state
+
+    @pytest.mark.asyncio
+    async def test_batch_without_writes_does_not_write(self, session_factory):
+        storage = DbStorage(session_factory)
+        with patch.object(fsm_repo, "upsert", wraps=fsm_repo.upsert) as upsert:
+            async with storage.batch():
+                await storage.get_state(KEY)
+        upsert.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_flushes_when_handler_fails(self, session_factory):
+        storage = DbStorage(session_factory)
+        with pytest.raises(RuntimeError):
+            async with storage.batch():
+                await storage.set_state(KEY, CreateTicketState.confirming)
+                raise RuntimeError
+
+        assert await DbStorage(session_factory).get_state(KEY) == CreateTicketState.confirming.state
+
+    @pytest.mark.asyncio
+    async def test_clear_deletes_row(self, session_factory):
+        storage = DbStorage(session_factory)
+        await storage.set_state(KEY, CreateTicketState.confirming)
+        await storage.set_data(KEY, {"a": 1})
+        assert await _row_count(session_factory) == 1
+
+        async with storage.batch():
+            await storage.set_state(KEY, None)
+            await storage.set_data(KEY, {})
+
+        assert await _row_count(session_factory) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_data_is_a_copy(self, session_factory):
+        storage = DbStorage(session_factory)
+        async with storage.batch():
+            await storage.set_data(KEY, {"photos": ["a"]})
+            data = await storage.get_data(KEY)
+            data["photos"].append("b")
+            assert await storage.get_data(KEY) == {"photos": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_keys_are_isolated(self, session_factory):
+        storage = DbStorage(session_factory)
+        other = StorageKey(bot_id=1, chat_id=200, user_id=200)
+        async with storage.batch():
+            await storage.set_data(KEY, {"a": 1})
+            await storage.set_data(other, {"b": 2})
+
+        assert await storage.get_data(KEY) == {"a": 1}
+        assert await storage.get_data(other) == {"b": 2}
+
+
+class TestDispatcherUpdate:
+    @pytest.mark.asyncio
+    async def test_one_select_and_one_upsert_per_update(self, session_factory, file_db_engine):
+        storage = DbStorage(session_factory)
+        router = Router()
+        router.message.register(add_photo, CreateTicketState.uploading_photos)
+        # Wired as in bot.__main__: the batch wraps FSMContextMiddleware
+        dp = Dispatcher(storage=storage, disable_fsm=True)
+        dp.update.outer_middleware(FsmBatchMiddleware(storage))
+        dp.update.outer_middleware(dp.fsm)
+        dp.include_router(router)
+
+        bot = Bot("42:TEST")
+        key = StorageKey(bot_id=bot.id, chat_id=1, user_id=1)
+        await storage.set_state(key, CreateTicketState.uploading_photos)
+        statements = []
+        event.listen(file_db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        await dp.feed_update(bot, Update(update_id=1, message=Message(
+            message_id=1, date=datetime.now(), text="photo-1",
+            chat=Chat(id=1, type="private"), from_user=User(id=1, is_bot=False, first_name="Owner"),
+        )))
+        await bot.session.close()
+
+        assert [s.split()[0] for s in statements] == ["SELECT", "INSERT"]
+        assert await storage.get_data(key) == {"attachments": ["photo-1"]}
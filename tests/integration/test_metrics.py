@@ -0,0 +1,143 @@
+"""Integration tests for the bot metrics (bot.metrics and its middlewares)."""
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message, Update, User
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from bot import metrics
+from bot.middlewares.metrics import (
+    TelegramMetricsMiddleware, TimedMiddleware, UpdateMetricsMiddleware, instrument_router,
+)
+from bot.services.update_scheduler import ChatScheduler
+from bot.states.create_ticket import CreateTicketState
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _update(update_id: int, text_: str) -> Update:
+    return Update(update_id=update_id, message=Message(
+        message_id=update_id, date=datetime.now(), text=text_,
+        chat=Chat(id=1, type="private"), from_user=User(id=1, is_bot=False, first_name="Owner"),
+    ))
+
+
+async def start_create(message: Message, state: FSMContext, engine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        await conn.execute(text("SELECT 2"))
+    await state.set_state(CreateTicketState.choosing_complex)
+
+
+async def failing(message: Message) -> None:
+    raise RuntimeError("boom")
+
+
+class TestUpdatePipeline:
+    @pytest.mark.asyncio
+    async def test_records_handler_db_and_fsm_per_update(self, db_engine):
+        metrics.instrument_engine(db_engine)
+        router = Router()
+        router.message.register(start_create, Command("create"))
+        router.message.register(failing, Command("fail"))
+        instrument_router(router)
+        # Wired as in bot.__main__: FSMContextMiddleware runs inside the update metrics
+        dp = Dispatcher(storage=metrics.MeteredStorage(MemoryStorage()), disable_fsm=True)
+        dp.update.outer_middleware(UpdateMetricsMiddleware())
+        dp.update.outer_middleware(TimedMiddleware(dp.fsm))
+        dp.include_router(router)
+
+        handler = f"{__name__}.start_create"
+        transition = dict(from_state="none", to_state=CreateTicketState.choosing_complex.state)
+        before = {
+            "handler": _sample("qss_bot_handler_seconds_count", handler=handler, status="ok"),
+            "failed": _sample("qss_bot_handler_seconds_count", handler=f"{__name__}.failing", status="error"),
+            "updates": _sample("qss_bot_update_seconds_count", event_type="message"),
+            "queries": _sample("qss_bot_db_queries_per_update_sum"),
+            "fsm": _sample("qss_bot_fsm_transitions_total", **transition),
+            "fsm_middleware": _sample("qss_bot_middleware_seconds_count", middleware="FSMContextMiddleware"),
+        }
+
+        bot = Bot("42:TEST")
+        await dp.feed_update(bot, _update(1, "/create"), engine=db_engine)
+        with pytest.raises(RuntimeError):
+            await dp.feed_update(bot, _update(2, "/fail"), engine=db_engine)
+        await bot.session.close()
+
+        assert _sample("qss_bot_handler_seconds_count", handler=handler, status="ok") == before["handler"] + 1
+        assert _sample("qss_bot_handler_seconds_count", handler=f"{__name__}.failing", status="error") == before["failed"] + 1
+        assert _sample("qss_bot_update_seconds_count", event_type="message") == before["updates"] + 2
+        assert _sample("qss_bot_db_queries_per_update_sum") == before["queries"] + 2
+        # Only /create changed the state
+        assert _sample("qss_bot_fsm_transitions_total", **transition) == before["fsm"] + 1
+        assert _sample("qss_bot_middleware_seconds_count", middleware="FSMContextMiddleware") == before["fsm_middleware"] + 2
+
+
+class TestTimedMiddleware:
+    @pytest.mark.asyncio
+    async def test_excludes_the_wrapped_handler(self):
+        class SlowHandlerMiddleware:
+            async def __call__(self, handler, event, data):
+                return await handler(event, data)
+
+        async def slow_handler(event, data):
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        before = _sample("qss_bot_middleware_seconds_sum", middleware="SlowHandlerMiddleware")
+        result = await TimedMiddleware(SlowHandlerMiddleware())(slow_handler, object(), {})
+
+        assert result == "ok"
+        assert _sample("qss_bot_middleware_seconds_sum", middleware="SlowHandlerMiddleware") - before < 0.01
+
+
+class TestTelegramMetricsMiddleware:
+    @pytest.mark.asyncio
+    async def test_counts_errors_by_method(self):
+        method = SendMessage(chat_id=1, text="hi")
+        make_request = AsyncMock(side_effect=TelegramForbiddenError(method, "bot was blocked by the user"))
+        before = _sample("qss_bot_telegram_api_errors_total", method="SendMessage", error="TelegramForbiddenError")
+        calls = _sample("qss_bot_telegram_api_seconds_count", method="SendMessage")
+
+        with pytest.raises(TelegramForbiddenError):
+            await TelegramMetricsMiddleware()(make_request, AsyncMock(), method)
+
+        assert _sample("qss_bot_telegram_api_errors_total", method="SendMessage", error="TelegramForbiddenError") == before + 1
+        assert _sample("qss_bot_telegram_api_seconds_count", method="SendMessage") == calls + 1
+
+
+class TestSchedulerGauges:
+    @pytest.mark.asyncio
+    async def test_scrape_reads_queue_without_resetting_peak(self):
+        async def feed_update(bot, update):
+            await asyncio.sleep(0.01)
+
+        dp = MagicMock()
+        dp.feed_update = feed_update
+        scheduler = ChatScheduler(dp, MagicMock())
+        metrics.instrument_scheduler(scheduler)
+        for i in range(1, 4):
+            scheduler.submit(_update(i, "hi"))
+
+        assert _sample("qss_bot_update_queue_pending") == 3
+        assert _sample("qss_bot_update_queue_chats") == 1
+        assert _sample("qss_bot_update_queue_max_depth") == 3
+
+        await scheduler.close()
+        assert _sample("qss_bot_update_queue_pending") == 0
+        assert _sample("qss_bot_update_queue_max_depth") == 0
+        assert _sample("qss_bot_update_queue_peak_depth") == 3
+        assert _sample("qss_bot_update_queue_peak_depth") == 3
+        scheduler.reset_peak()
+        assert _sample("qss_bot_update_queue_peak_depth") == 0
@@ -4,87 +4,295 @@ import time
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
-from bot.middlewares.throttling import ThrottlingMiddleware
+from aiogram.types import CallbackQuery, Message
+
+from bot.middlewares.throttling import Limit, ThrottlingMiddleware
+from bot.services.text_service import DEFAULT_TEXTS
+from bot.utils.constants import UserRole
+
+
+def _event(cls, user_id: int = 12345):
+    event = MagicMock(spec=cls)
+    event.from_user = MagicMock()
+    event.from_user.id = user_id
+    event.answer = AsyncMock()
+    return event
 
 
 class TestThrottlingMiddleware:
     @pytest.mark.asyncio
     async def test_allows_first_message(self):
-        mw = ThrottlingMiddleware(rate_limit=0.5)
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=2, burst=1)})
         handler = AsyncMock(return_value="ok")
 
-        event = MagicMock()
-        event.__class__ = type("Message", (), {})  # isinstance check
-        # Make it pass isinstance(event, Message) — we'll use a real-like mock
-        from aiogram.types import Message
-        event = MagicMock(spec=Message)
-        event.from_user = MagicMock()
-        event.from_user.id = 12345
-
-        result = await mw(handler, event, {})
+        result = await mw(handler, _event(Message), {})
         handler.assert_called_once()
+        assert result == "ok"
 
     @pytest.mark.asyncio
     async def test_blocks_fast_second_message(self):
-        mw = ThrottlingMiddleware(rate_limit=0.5)
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=2, burst=1)})
         handler = AsyncMock(return_value="ok")
-
-        from aiogram.types import Message
-        event = MagicMock(spec=Message)
-        event.from_user = MagicMock()
-        event.from_user.id = 12345
+        event = _event(Message)
 
         await mw(handler, event, {})
         # Send immediately again
-        result = await mw(handler, event, {})
+        await mw(handler, event, {})
         # Handler should only be called once (second blocked)
         assert handler.call_count == 1
 
     @pytest.mark.asyncio
     async def test_allows_after_delay(self):
-        mw = ThrottlingMiddleware(rate_limit=0.1)
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=10, burst=1)})
         handler = AsyncMock(return_value="ok")
-
-        from aiogram.types import Message
-        event = MagicMock(spec=Message)
-        event.from_user = MagicMock()
-        event.from_user.id = 12345
+        event = _event(Message)
 
         await mw(handler, event, {})
         await asyncio.sleep(0.15)
         await mw(handler, event, {})
         assert handler.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_burst(self):
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=1, burst=3)})
+        handler = AsyncMock(return_value="ok")
+        event = _event(Message)
+
+        for _ in range(5):
+            await mw(handler, event, {})
+        assert handler.call_count == 3
+
     @pytest.mark.asyncio
     async def test_different_users_not_throttled(self):
-        mw = ThrottlingMiddleware(rate_limit=0.5)
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=2, burst=1)})
         handler = AsyncMock(return_value="ok")
 
-        from aiogram.types import Message
+        await mw(handler, _event(Message, 111), {})
+        await mw(handler, _event(Message, 222), {})
+        assert handler.call_count == 2
 
-        event1 = MagicMock(spec=Message)
-        event1.from_user = MagicMock()
-        event1.from_user.id = 111
+    @pytest.mark.asyncio
+    async def test_callback_queries_are_throttled_with_toast(self):
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=2, burst=1)})
+        handler = AsyncMock(return_value="ok")
+        event = _event(CallbackQuery)
 
-        event2 = MagicMock(spec=Message)
-        event2.from_user = MagicMock()
-        event2.from_user.id = 222
+        await mw(handler, event, {})
+        await mw(handler, event, {})
+        await mw(handler, event, {})
 
-        await mw(handler, event1, {})
-        await mw(handler, event2, {})
-        assert handler.call_count == 2
+        assert handler.call_count == 1
+        # Every refused callback is answered, so the button stops spinning
+        assert event.answer.await_count == 2
+        assert event.answer.call_args[0][0] == DEFAULT_TEXTS["toast_slow_down"]
 
     @pytest.mark.asyncio
-    async def test_non_message_events_pass_through(self):
-        mw = ThrottlingMiddleware(rate_limit=0.5)
+    async def test_message_flood_is_warned_once(self):
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=2, burst=1)})
         handler = AsyncMock(return_value="ok")
+        event = _event(Message)
 
-        from aiogram.types import CallbackQuery
-        event = MagicMock(spec=CallbackQuery)
-        event.from_user = MagicMock()
-        event.from_user.id = 12345
+        for _ in range(4):
+            await mw(handler, event, {})
+
+        assert handler.call_count == 1
+        event.answer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_messages_and_callbacks_share_a_bucket(self):
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=2, burst=1)})
+        handler = AsyncMock(return_value="ok")
+
+        await mw(handler, _event(Message), {})
+        await mw(handler, _event(CallbackQuery), {})
+        assert handler.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_per_role_limits(self):
+        mw = ThrottlingMiddleware(limits={
+            UserRole.OWNER: Limit(rate=1, burst=2),
+            UserRole.ADMIN: Limit(rate=1, burst=5),
+        })
+        handler = AsyncMock(return_value="ok")
+
+        for _ in range(5):
+            await mw(handler, _event(Message, 1), {"user_role": UserRole.OWNER})
+        for _ in range(5):
+            await mw(handler, _event(Message, 2), {"user_role": UserRole.ADMIN})
+        assert handler.call_count == 2 + 5
+
+    @pytest.mark.asyncio
+    async def test_memory_is_bounded(self):
+        mw = ThrottlingMiddleware(maxsize=100)
+        handler = AsyncMock(return_value="ok")
+
+        for user_id in range(1000):
+            await mw(handler, _event(Message, user_id), {})
+
+        assert len(mw._buckets) == 100
+        assert handler.call_count == 1000
+
+    @pytest.mark.asyncio
+    async def test_other_events_pass_through(self):
+        mw = ThrottlingMiddleware(limits={None: Limit(rate=2, burst=1)})
+        handler = AsyncMock(return_value="ok")
+        event = MagicMock()
 
         await mw(handler, event, {})
         await mw(handler, event, {})
-        # Both should pass (not throttled for non-Message)
         assert handler.call_count == 2
+
+
+class TestAuthMiddlewareRoleCache:
+    @pytest.mark.asyncio
+    async def test_cached_user_changes_are_persisted(self, session_factory):
+        from bot.db.models.owner import Owner
+        from bot.middlewares.auth import AuthMiddleware
+        from bot.services.role_cache import RoleCache
+
+        async with session_factory() as session:
+            session.add(Owner(
+                phone="77001234567", full_name="Owner", residential_complex="alasha",
+                telegram_id=555, language="ru",
+            ))
+            await session.commit()
+
+        async def change_language(event, data):
+            data["user_obj"].language = "kk"
+
+        mw = AuthMiddleware(RoleCache())
+        user = MagicMock()
+        user.id = 555
+        for handler in (AsyncMock(), change_language):
+            async with session_factory() as session:
+                await mw(handler, MagicMock(), {"event_from_user": user, "session": session})
+                await session.commit()
+
+        assert mw.role_cache.hits == 1
+        async with session_factory() as session:
+            owner = await session.get(Owner, 1)
+            assert owner.language == "kk"
+
+    @pytest.mark.asyncio
+    async def test_cached_master_opens_new_tickets_inbox(self, session_factory):
+        from bot.db.models.master import Master
+        from bot.db.models.ticket import Ticket
+        from bot.db.repositories import master_repo
+        from bot.handlers.master.my_tickets import _show_new_tickets_by_complex
+        from bot.middlewares.auth import AuthMiddleware
+        from bot.services.role_cache import RoleCache
+
+        async with session_factory() as session:
+            master = Master(telegram_id=777, full_name="Master")
+            master_repo.set_complexes(master, ["alasha", "terekti"])
+            session.add_all([master, Ticket(
+                ticket_id="QSS-20250101-0001", client_telegram_id=1, client_phone="7700",
+                client_full_name="Owner", residential_complex="terekti", category="cctv",
+                description="-", status="new",
+            )])
+            await session.commit()
+
+        seen = []
+
+        async def open_inbox(event, data):
+            seen.append(data["user_obj"].complex_names)
+            callback = MagicMock()
+            callback.message.edit_text = AsyncMock()
+            callback.answer = AsyncMock()
+            await _show_new_tickets_by_complex(callback, data["session"], data["user_obj"])
+            tickets = callback.message.edit_text.await_args.kwargs["reply_markup"].inline_keyboard
+            assert "QSS-20250101-0001" in tickets[0][0].text
+
+        mw = AuthMiddleware(RoleCache())
+        user = MagicMock()
+        user.id = 777
+        for _ in range(3):
+            async with session_factory() as session:
+                await mw(open_inbox, MagicMock(), {"event_from_user": user, "session": session})
+                await session.commit()
+
+        # The second and third lookups came from the cache, complexes included
+        assert mw.role_cache.hits == 2
+        assert seen == [["alasha", "terekti"]] * 3
+
+
+class TestDbSessionMiddleware:
+    @staticmethod
+    def _count_checkouts(engine):
+        from sqlalchemy import event
+
+        checkouts = []
+        event.listen(engine.sync_engine.pool, "checkout", lambda *args: checkouts.append(1))
+        return checkouts
+
+    @pytest.mark.asyncio
+    async def test_untouched_session_is_never_created(self):
+        from bot.middlewares.db_session import DbSessionMiddleware
+
+        session_pool = MagicMock()
+        mw = DbSessionMiddleware(session_pool)
+
+        result = await mw(AsyncMock(return_value="ok"), MagicMock(), {})
+
+        assert result == "ok"
+        session_pool.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_query_checks_out_connection_and_commits(self, file_db_engine, session_factory):
+        from sqlalchemy import text
+        from bot.middlewares.db_session import DbSessionMiddleware
+
+        checkouts = self._count_checkouts(file_db_engine)
+
+        async def handler(event, data):
+            await data["session"].execute(text("SELECT 1"))
+
+        await DbSessionMiddleware(session_factory)(handler, MagicMock(), {})
+        assert len(checkouts) == 1
+
+    @pytest.mark.asyncio
+    async def test_attach_only_does_not_check_out(self, file_db_engine, session_factory):
+        from sqlalchemy.orm import make_transient_to_detached
+        from bot.db.models.owner import Owner
+        from bot.middlewares.db_session import DbSessionMiddleware
+
+        checkouts = self._count_checkouts(file_db_engine)
+
+        async def handler(event, data):
+            owner = Owner(id=1, phone="1", full_name="x", residential_complex="alasha")
+            make_transient_to_detached(owner)
+            data["session"].add(owner)
+
+        await DbSessionMiddleware(session_factory)(handler, MagicMock(), {})
+        assert checkouts == []
+
+    @pytest.mark.asyncio
+    async def test_pending_changes_are_committed(self, session_factory):
+        from sqlalchemy import select
+        from bot.db.models.admin import Admin
+        from bot.middlewares.db_session import DbSessionMiddleware
+
+        async def handler(event, data):
+            data["session"].add(Admin(telegram_id=1, full_name="Admin"))
+
+        await DbSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        async with session_factory() as session:
+            assert (await session.execute(select(Admin))).scalar_one().full_name == "Admin"
+
+    @pytest.mark.asyncio
+    async def test_rollback_on_error(self, session_factory):
+        from sqlalchemy import select
+        from bot.db.models.admin import Admin
+        from bot.middlewares.db_session import DbSessionMiddleware
+
+        async def handler(event, data):
+            data["session"].add(Admin(telegram_id=1, full_name="Admin"))
+            await data["session"].flush()
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await DbSessionMiddleware(session_factory)(handler, MagicMock(), {})
+
+        async with session_factory() as session:
+            assert (await session.execute(select(Admin))).first() is None
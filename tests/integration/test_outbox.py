@@ -0,0 +1,135 @@
+"""Integration tests for the notification outbox worker."""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramNetworkError
+from aiogram.methods import SendMessage
+from sqlalchemy import select
+
+from bot.db.models.notification_outbox import NotificationOutbox
+from bot.db.repositories import outbox_repo
+from bot.services.fanout import FanoutDispatcher
+from bot.services.outbox import OutboxWriter, drain_once
+
+
+@pytest.fixture(autouse=True)
+def dispatcher():
+    with patch("bot.services.fanout.dispatcher", FanoutDispatcher(global_rate=1000, chat_rate=1000, chat_burst=1000)) as d:
+        yield d
+
+
+async def _queue(session_factory, *chat_ids):
+    async with session_factory() as session:
+        writer = OutboxWriter(session)
+        for chat_id in chat_ids:
+            await writer.send_message(chat_id, f"hi {chat_id}")
+        await session.commit()
+
+
+async def _rows(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(NotificationOutbox).order_by(NotificationOutbox.id))
+        return list(result.scalars().all())
+
+
+class TestDrainOnce:
+    @pytest.mark.asyncio
+    async def test_rolled_back_rows_are_never_sent(self, session_factory, mock_bot):
+        async with session_factory() as session:
+            await OutboxWriter(session).send_message(1, "hi")
+            await session.rollback()
+
+        assert await drain_once(mock_bot, session_factory, 10) == 0
+        mock_bot.send_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sent_rows_are_deleted(self, session_factory, mock_bot):
+        await _queue(session_factory, 1, 2)
+
+        assert await drain_once(mock_bot, session_factory, 10) == 2
+        assert mock_bot.send_message.await_count == 2
+        assert await _rows(session_factory) == []
+
+    @pytest.mark.asyncio
+    async def test_batch_size(self, session_factory, mock_bot):
+        await _queue(session_factory, 1, 2, 3)
+
+        assert await drain_once(mock_bot, session_factory, 2) == 2
+        assert len(await _rows(session_factory)) == 1
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_rescheduled(self, session_factory, mock_bot):
+        await _queue(session_factory, 1)
+        mock_bot.send_message = AsyncMock(
+            side_effect=TelegramNetworkError(method=SendMessage(chat_id=1, text="hi"), message="timeout")
+        )
+
+        await drain_once(mock_bot, session_factory, 10)
+
+        [row] = await _rows(session_factory)
+        assert row.status == "pending"
+        assert row.attempts == 1
+        assert "timeout" in row.last_error
+        # Not due until the backoff has passed
+        assert await drain_once(mock_bot, session_factory, 10) == 0
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_is_marked_failed(self, session_factory, mock_bot):
+        await _queue(session_factory, 1)
+        mock_bot.send_message = AsyncMock(
+            side_effect=TelegramForbiddenError(method=SendMessage(chat_id=1, text="hi"), message="blocked")
+        )
+
+        await drain_once(mock_bot, session_factory, 10)
+
+        [row] = await _rows(session_factory)
+        assert row.status == "failed"
+        assert await drain_once(mock_bot, session_factory, 10) == 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, session_factory, mock_bot):
+        await _queue(session_factory, 1)
+        mock_bot.send_message = AsyncMock(
+            side_effect=TelegramNetworkError(method=SendMessage(chat_id=1, text="hi"), message="timeout")
+        )
+
+        with patch("bot.services.outbox.settings") as s:
+            s.outbox_max_attempts = 2
+            s.outbox_backoff_base = 0.0
+            s.outbox_backoff_max = 0.0
+            s.outbox_lease = 60.0
+            await drain_once(mock_bot, session_factory, 10)
+            await drain_once(mock_bot, session_factory, 10)
+
+        [row] = await _rows(session_factory)
+        assert row.status == "failed"
+        assert row.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_rows_are_leased_not_locked_while_sending(self, session_factory, mock_bot):
+        await _queue(session_factory, 1)
+        claimed_meanwhile = []
+
+        async def send_message(chat_id, **kwargs):
+            # Another worker: SQLite would report "database is locked" if the claim were still open
+            async with session_factory() as session:
+                claimed_meanwhile.extend(await outbox_repo.claim_due(session, 10, lease=60))
+                await session.commit()
+
+        mock_bot.send_message = AsyncMock(side_effect=send_message)
+
+        assert await drain_once(mock_bot, session_factory, 10) == 1
+        assert claimed_meanwhile == []
+        assert await _rows(session_factory) == []
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_claimed_again(self, session_factory, mock_bot):
+        await _queue(session_factory, 1)
+        async with session_factory() as session:
+            # A worker that claimed the row and died before settling it
+            assert len(await outbox_repo.claim_due(session, 10, lease=0)) == 1
+            await session.commit()
+
+        assert await drain_once(mock_bot, session_factory, 10) == 1
+        mock_bot.send_message.assert_awaited_once()
+        assert await _rows(session_factory) == []
@@ -0,0 +1,168 @@
+"""EXPLAIN-based regression tests: hot queries must use indexes."""
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, text
+
+from bot.db.models.master import Master
+from bot.db.models.master_complex import MasterComplex
+from bot.db.models.ticket import Ticket
+from bot.db.repositories import recipient_repo, ticket_repo
+
+STATUSES = ["new", "in_progress", "completed", "closed", "pending_approval"]
+
+
+@pytest_asyncio.fixture
+async def seeded_session(db_session):
+    """2000 tickets over 100 days and 50 owners, with planner statistics."""
+    start = datetime(2025, 1, 1)
+    rows = [
+        dict(
+            ticket_id=f"QSS-{n:06d}",
+            client_telegram_id=1000 + n % 50,
+            client_phone="77001234567",
+            client_full_name="Owner",
+            residential_complex="alasha",
+            category="cctv",
+            description="-",
+            status=STATUSES[n % len(STATUSES)],
+            created_at=start + timedelta(hours=n * 1.2),
+        )
+        for n in range(2000)
+    ]
+    await db_session.execute(insert(Ticket), rows)
+    await db_session.execute(text("ANALYZE"))
+    yield db_session
+
+
+@pytest.fixture
+def captured_sql(db_engine):
+    """Record the SELECT statements sent to the database."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(db_engine.sync_engine, "before_cursor_execute", _capture)
+
+
+async def _exec_driver_sql(session, sql, parameters):
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(sql, parameters)
+    return result.all()
+
+
+async def _plan_of_last(session, captured) -> str:
+    statement, parameters = captured[-1]
+    rows = await _exec_driver_sql(session, f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestTicketQueryPlans:
+    @pytest.mark.asyncio
+    async def test_count_today_by_owner_uses_range_index(self, seeded_session, captured_sql):
+        await ticket_repo.count_today_by_owner(seeded_session, 1007)
+        plan = await _plan_of_last(seeded_session, captured_sql)
+
+        assert "ix_tickets_client_created" in plan
+        assert "created_at>?" in plan and "created_at<?" in plan
+
+    @pytest.mark.asyncio
+    async def test_filtered_by_status_and_date_uses_range_index(self, seeded_session, captured_sql):
+        await ticket_repo.list_filtered_with_total(
+            seeded_session, status="new", date_from=date(2025, 2, 1), date_to=date(2025, 2, 7),
+        )
+        plan = await _plan_of_last(seeded_session, captured_sql)
+
+        assert "ix_tickets_status_created" in plan
+        assert "created_at>?" in plan and "created_at<?" in plan
+
+    @pytest.mark.asyncio
+    async def test_filtered_by_date_only_uses_created_at_index(self, seeded_session, captured_sql):
+        await ticket_repo.list_filtered(
+            seeded_session, date_from=date(2025, 2, 1), date_to=date(2025, 2, 1),
+        )
+        plan = await _plan_of_last(seeded_session, captured_sql)
+
+        assert "ix_tickets_created_at" in plan
+        assert "created_at>?" in plan and "created_at<?" in plan
+
+    @pytest.mark.asyncio
+    async def test_date_range_is_half_open_in_local_time(self, seeded_session):
+        # Tickets are seeded every 1.2h: 20 per UTC day. With the default
+        # UTC+5 business timezone the local day starts at 19:00 UTC the day before.
+        _, total = await ticket_repo.list_filtered_with_total(
+            seeded_session, date_from=date(2025, 1, 2), date_to=date(2025, 1, 2),
+        )
+        assert total == 20
+
+
+@pytest_asyncio.fixture
+async def history_session(db_session):
+    """3000 closed tickets and a 60-ticket inbox over four complexes."""
+    await db_session.execute(insert(Master), [dict(id=1, telegram_id=1, full_name="M", residential_complex="alasha")])
+    complexes = ["alasha", "terekti", "kemel", "jana_omir"]
+    start = datetime(2025, 1, 1)
+    rows = [
+        dict(
+            ticket_id=f"QSS-{n:06d}",
+            client_telegram_id=1000 + n % 50,
+            client_phone="77001234567",
+            client_full_name="Owner",
+            residential_complex=complexes[n % 4],
+            category="cctv",
+            description="-",
+            status="closed" if n < 3000 else ["new", "pending_approval"][n % 2],
+            assigned_master_id=1 if n < 3000 else None,
+            created_at=start + timedelta(hours=n),
+        )
+        for n in range(3060)
+    ]
+    await db_session.execute(insert(Ticket), rows)
+    await db_session.execute(text("ANALYZE"))
+    yield db_session
+
+
+class TestMasterInboxQueryPlans:
+    @pytest.mark.asyncio
+    async def test_first_page_with_total_uses_partial_index(self, history_session, captured_sql):
+        tickets, total = await ticket_repo.list_new_for_master_with_total(history_session, ["alasha", "kemel"], limit=5)
+        plan = await _plan_of_last(history_session, captured_sql)
+
+        assert total == 30 and len(tickets) == 5
+        assert "ix_tickets_master_inbox" in plan
+        # Literal statuses, so the partial index predicate is provably implied
+        assert "IN ('new', 'pending_approval')" in captured_sql[-1][0]
+
+    @pytest.mark.asyncio
+    async def test_next_page_uses_partial_index(self, history_session, captured_sql):
+        first, total = await ticket_repo.list_new_for_master_with_total(history_session, ["terekti"], limit=5)
+        assert total == 15
+
+        second = await ticket_repo.list_new_for_master(history_session, ["terekti"], limit=5, after_id=first[-1].id)
+        assert "ix_tickets_master_inbox" in await _plan_of_last(history_session, captured_sql)
+        assert len(second) == 5 and max(t.id for t in second) < first[-1].id
+
+
+class TestMasterComplexQueryPlans:
+    @pytest.mark.asyncio
+    async def test_new_ticket_recipients_join_by_complex_index(self, db_session, captured_sql):
+        complexes = ["alasha", "terekti", "kemel", "jana_omir"]
+        await db_session.execute(insert(Master), [
+            dict(id=n, telegram_id=n, full_name=f"M{n}", residential_complex=complexes[n % 4])
+            for n in range(1, 201)
+        ])
+        await db_session.execute(insert(MasterComplex), [
+            dict(master_id=n, residential_complex=complexes[n % 4]) for n in range(1, 201)
+        ])
+        await db_session.execute(text("ANALYZE"))
+
+        await recipient_repo.new_ticket_recipients(db_session, "kemel")
+        plan = await _plan_of_last(db_session, captured_sql)
+
+        assert "ix_master_complexes_complex" in plan
+        assert "SCAN masters" not in plan
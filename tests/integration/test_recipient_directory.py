@@ -0,0 +1,59 @@
+"""Integration tests for the in-memory recipient directory."""
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from bot.db.models.admin import Admin
+from bot.db.repositories import master_repo
+from bot.db.repositories.recipient_repo import Recipient
+from bot.services.recipient_directory import RecipientDirectory
+
+
+@pytest_asyncio.fixture
+async def people(db_session, make_master):
+    db_session.add_all([
+        make_master(1, ["alasha", "terekti"], language="kk"),
+        make_master(2, ["terekti"]),
+        make_master(3, ["alasha"], is_active=False),
+        Admin(telegram_id=10, full_name="A1"),
+    ])
+    await db_session.flush()
+    return db_session
+
+
+class TestRecipientDirectory:
+    @pytest.mark.asyncio
+    async def test_indexes_active_masters_by_complex(self, people):
+        directory = RecipientDirectory()
+        await directory.load(people)
+
+        assert directory.masters("alasha") == [Recipient(1, "kk")]
+        assert sorted(directory.masters("terekti")) == [Recipient(1, "kk"), Recipient(2, "ru")]
+        assert directory.masters("kemel") == []
+        assert directory.admins() == [Recipient(10, "ru")]
+
+    @pytest.mark.asyncio
+    async def test_loaded_directory_needs_no_queries(self, db_engine, people):
+        directory = RecipientDirectory()
+        assert await directory.new_ticket_recipients(people, "alasha") == ([Recipient(1, "kk")], [Recipient(10, "ru")])
+
+        await directory.load(people)
+        statements = []
+        event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        assert await directory.new_ticket_recipients(people, "alasha") == ([Recipient(1, "kk")], [Recipient(10, "ru")])
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_reload_picks_up_changes(self, people):
+        directory = RecipientDirectory()
+        await directory.load(people)
+
+        master = await master_repo.get_with_complexes(people, 2)
+        master_repo.set_complexes(master, ["kemel"])
+        people.add(Admin(telegram_id=11, full_name="A2", language="kk"))
+        await people.flush()
+        await directory.load(people)
+
+        assert directory.masters("terekti") == [Recipient(1, "kk")]
+        assert directory.masters("kemel") == [Recipient(2, "ru")]
+        assert len(directory.admins()) == 2
@@ -8,7 +8,9 @@ from bot.db.models.admin import Admin
 from bot.db.models.ticket import Ticket
 from bot.db.models.ticket_history import TicketHistory
 from bot.db.models.bot_text import BotText
-from bot.db.repositories import owner_repo, master_repo, admin_repo, ticket_repo, bot_text_repo
+from bot.db.repositories import owner_repo, master_repo, admin_repo, ticket_repo, bot_text_repo, user_repo
+from bot.services.auth_service import resolve_role
+from bot.utils.constants import UserRole
 
 
 class TestOwnerRepo:
@@ -85,12 +87,8 @@ class TestMasterRepo:
 
     @pytest.mark.asyncio
     async def test_get_by_complex(self, db_session):
-        master = Master(
-            telegram_id=111111,
-            full_name="Alasha Master",
-            residential_complex="alasha,terekti",
-            language="ru",
-        )
+        master = Master(telegram_id=111111, full_name="Alasha Master", language="ru")
+        master_repo.set_complexes(master, ["alasha", "terekti"])
         db_session.add(master)
         await db_session.flush()
 
@@ -98,6 +96,35 @@ class TestMasterRepo:
         assert len(results) >= 1
         assert any(m.full_name == "Alasha Master" for m in results)
 
+    @pytest.mark.asyncio
+    async def test_get_by_complex_matches_whole_names(self, db_session):
+        master = Master(telegram_id=111112, full_name="Alasha 2 Master", language="ru")
+        master_repo.set_complexes(master, ["alasha_2"])
+        db_session.add(master)
+        await db_session.flush()
+
+        assert await master_repo.get_by_complex(db_session, "alasha") == []
+        assert await master_repo.get_by_complex(db_session, "alasha_2") == [master]
+
+    @pytest.mark.asyncio
+    async def test_set_complexes_replaces_rows_and_label(self, db_session):
+        master = Master(telegram_id=111113, full_name="Master", language="ru")
+        master_repo.set_complexes(master, [" terekti", "alasha", "alasha", ""])
+        db_session.add(master)
+        await db_session.flush()
+        assert (master.residential_complex, master.complex_names) == ("alasha,terekti", ["alasha", "terekti"])
+
+        db_session.expunge(master)
+        master = await master_repo.get_with_complexes(db_session, master.id)
+        master_repo.set_complexes(master, ["terekti", "kemel"])
+        await db_session.flush()
+
+        assert master.residential_complex == "kemel,terekti"
+        assert [m.full_name for m in await master_repo.get_by_complex(db_session, "alasha")] == []
+        assert [m.full_name for m in await master_repo.get_by_complex(db_session, "kemel")] == ["Master"]
+        loaded = await master_repo.get_by_telegram_id(db_session, 111113)
+        assert loaded.complex_names == ["kemel", "terekti"]
+
     @pytest.mark.asyncio
     async def test_get_all_active(self, db_session):
         m1 = Master(telegram_id=222221, full_name="Active", residential_complex="alasha", language="ru")
@@ -133,6 +160,65 @@ class TestAdminRepo:
         assert result.language == "kk"
 
 
+class TestUserRepo:
+    """resolve_role's single lookup must match the old admin > master > owner chain."""
+
+    async def _resolve_sequentially(self, session, telegram_id):
+        admin = await admin_repo.get_by_telegram_id(session, telegram_id)
+        if admin:
+            return UserRole.ADMIN, admin
+        master = await master_repo.get_by_telegram_id(session, telegram_id)
+        if master:
+            return UserRole.MASTER, master
+        owner = await owner_repo.get_by_telegram_id(session, telegram_id)
+        if owner:
+            return UserRole.OWNER, owner
+        return None, None
+
+    async def _seed(self, session, tid, admin=False, master=None, owner=None):
+        if admin:
+            session.add(Admin(telegram_id=tid, full_name="Admin", language="ru"))
+        if master is not None:
+            session.add(Master(
+                telegram_id=tid, full_name="Master", residential_complex="alasha", is_active=master,
+            ))
+        if owner is not None:
+            session.add(Owner(
+                phone=f"7700{tid}", full_name="Owner", residential_complex="alasha",
+                telegram_id=tid, is_active=owner,
+            ))
+        await session.flush()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("accounts, expected_role", [
+        (dict(admin=True, master=True, owner=True), UserRole.ADMIN),
+        (dict(admin=True), UserRole.ADMIN),
+        (dict(master=True, owner=True), UserRole.MASTER),
+        (dict(master=False, owner=True), UserRole.OWNER),
+        (dict(owner=True), UserRole.OWNER),
+        (dict(owner=False), None),
+        (dict(), None),
+    ])
+    async def test_matches_sequential_lookup(self, db_session, accounts, expected_role):
+        await self._seed(db_session, 500100, **accounts)
+        await self._seed(db_session, 500200, admin=True, master=True, owner=True)  # noise
+
+        role, user_obj = await resolve_role(db_session, 500100)
+        expected = await self._resolve_sequentially(db_session, 500100)
+
+        assert role == expected_role
+        assert (role, user_obj) == expected
+
+    @pytest.mark.asyncio
+    async def test_returns_all_matching_rows(self, db_session):
+        await self._seed(db_session, 500300, admin=True, master=True, owner=True)
+
+        admin, master, owner = await user_repo.get_accounts_by_telegram_id(db_session, 500300)
+        assert admin.full_name == "Admin"
+        assert master.full_name == "Master"
+        assert owner.full_name == "Owner"
+
+
 class TestTicketRepo:
     async def _create_test_ticket(self, db_session, **overrides):
         defaults = dict(
@@ -234,15 +320,6 @@ class TestTicketRepo:
         result = await ticket_repo.get_by_id(db_session, ticket.id)
         assert result.assigned_master_id == master.id
 
-    @pytest.mark.asyncio
-    async def test_generate_ticket_id_format(self, db_session):
-        ticket_id = await ticket_repo.generate_ticket_id(db_session)
-        assert ticket_id.startswith("QSS-")
-        parts = ticket_id.split("-")
-        assert len(parts) == 3
-        assert len(parts[1]) == 8  # YYYYMMDD
-        assert len(parts[2]) == 4  # NNNN
-
     @pytest.mark.asyncio
     async def test_list_by_owner(self, db_session):
         await self._create_test_ticket(db_session, ticket_id="QSS-T-0001")
@@ -253,13 +330,13 @@ class TestTicketRepo:
         assert len(results) == 2
 
     @pytest.mark.asyncio
-    async def test_count_by_owner(self, db_session):
+    async def test_total_by_owner(self, db_session):
         await self._create_test_ticket(db_session, ticket_id="QSS-C-0001")
         await self._create_test_ticket(db_session, ticket_id="QSS-C-0002", client_telegram_id=999)
         await db_session.flush()
 
-        count = await ticket_repo.count_by_owner(db_session, 123456)
-        assert count == 1
+        _, total = await ticket_repo.list_by_owner_with_total(db_session, 123456)
+        assert total == 1
 
     @pytest.mark.asyncio
     async def test_list_filtered_by_status(self, db_session):
@@ -280,6 +357,60 @@ class TestTicketRepo:
         assert all(t.residential_complex == "alasha" for t in results)
 
 
+    async def _seed_ordered(self, db_session, n):
+        """n tickets, several sharing a created_at so the id tie-break matters."""
+        for i in range(n):
+            await self._create_test_ticket(
+                db_session,
+                ticket_id=f"QSS-K-{i:04d}",
+                created_at=datetime(2025, 1, 1, 10, i // 3),
+            )
+        await db_session.flush()
+        return await ticket_repo.list_by_owner(db_session, 123456, limit=n)
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_match_offset_pages(self, db_session):
+        full = await self._seed_ordered(db_session, 12)
+
+        pages, after = [], None
+        while True:
+            page = await ticket_repo.list_by_owner(db_session, 123456, limit=5, after_id=after)
+            if not page:
+                break
+            pages.append([t.id for t in page])
+            after = page[-1].id
+
+        assert pages == [[t.id for t in full[i:i + 5]] for i in range(0, 12, 5)]
+
+    @pytest.mark.asyncio
+    async def test_keyset_previous_page(self, db_session):
+        full = await self._seed_ordered(db_session, 12)
+
+        page = await ticket_repo.list_by_owner(db_session, 123456, limit=5, before_id=full[10].id)
+        assert [t.id for t in page] == [t.id for t in full[5:10]]
+
+
+    @pytest.mark.asyncio
+    async def test_list_with_total_matches_separate_queries(self, db_session):
+        full = await self._seed_ordered(db_session, 7)
+        await self._create_test_ticket(db_session, ticket_id="QSS-K-OTHER", client_telegram_id=999)
+        await db_session.flush()
+
+        tickets, total = await ticket_repo.list_by_owner_with_total(db_session, 123456, limit=5)
+        assert total == len(await ticket_repo.list_by_owner(db_session, 123456, limit=100)) == 7
+        assert [t.id for t in tickets] == [t.id for t in full[:5]]
+
+        tickets, total = await ticket_repo.list_filtered_with_total(db_session, status="new", limit=5)
+        assert total == len(await ticket_repo.list_filtered(db_session, status="new", limit=100)) == 8
+        assert len(tickets) == 5
+
+    @pytest.mark.asyncio
+    async def test_list_with_total_empty(self, db_session):
+        tickets, total = await ticket_repo.list_new_for_master_with_total(db_session, ["alasha"], limit=5)
+        assert tickets == []
+        assert total == 0
+
+
 class TestBotTextRepo:
     @pytest.mark.asyncio
     async def test_upsert_and_get(self, db_session):
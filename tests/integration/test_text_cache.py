@@ -0,0 +1,100 @@
+"""Integration tests for reloading single bot texts into the cache."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event, select
+
+import bot.services.text_service as ts
+from bot.db.models import BotText
+from bot.db.repositories import bot_text_repo
+from bot.utils.language import current_language
+
+
+@pytest.fixture(autouse=True)
+def restore_cache():
+    saved = ts._cache, ts._cache_loaded
+    yield
+    ts._cache, ts._cache_loaded = saved
+    ts._missing.clear()
+
+
+@pytest.fixture
+def ru():
+    token = current_language.set("ru")
+    yield
+    current_language.reset(token)
+
+
+class TestReloadKeys:
+    @pytest.mark.asyncio
+    async def test_applies_edit_add_and_delete(self, db_session, ru):
+        menu = BotText(key="menu_owner", language="ru", value="Меню v1")
+        db_session.add_all([menu, BotText(key="menu_master", language="ru", value="Мастер v1")])
+        await db_session.commit()
+        await ts.load_cache(db_session)
+
+        menu.value = "Меню v2"
+        db_session.add(BotText(key="custom_new", language="ru", value="Новый"))
+        await db_session.delete(await db_session.get(BotText, 2))
+        await db_session.commit()
+        assert ts.get_text_sync("menu_owner") == "Меню v1"
+
+        await ts.reload_keys(db_session, ["menu_owner", "custom_new", "menu_master"])
+
+        assert ts.get_text_sync("menu_owner") == "Меню v2"
+        assert ts.get_text_sync("custom_new") == "Новый"
+        assert ts.get_text_sync("menu_master") == ts.DEFAULT_TEXTS["menu_master"]
+
+    @pytest.mark.asyncio
+    async def test_forgets_missing_keys(self, db_session, ru):
+        ts._cache, ts._cache_loaded = {}, False
+        assert await ts.get_text(db_session, "custom_late") == "[custom_late]"
+
+        db_session.add(BotText(key="custom_late", language="ru", value="Появился"))
+        await db_session.commit()
+        assert await ts.get_text(db_session, "custom_late") == "[custom_late]"
+
+        await ts.reload_keys(db_session, ["custom_late"])
+        assert await ts.get_text(db_session, "custom_late") == "Появился"
+
+    @pytest.mark.asyncio
+    async def test_notify_is_noop_on_sqlite(self, db_session):
+        await bot_text_repo.notify_changed(db_session, ["menu_owner"])
+        await bot_text_repo.notify_changed(db_session)
+
+    @pytest.mark.asyncio
+    async def test_notify_payload_on_postgres(self):
+        session = MagicMock()
+        session.bind.dialect.name = "postgresql"
+        session.execute = AsyncMock()
+
+        await bot_text_repo.notify_changed(session, ["b", "a", "b"])
+        await bot_text_repo.notify_changed(session, [f"key_{i:05d}" for i in range(1000)])
+
+        payloads = [call.args[0].compile().params for call in session.execute.await_args_list]
+        assert [list(p.values())[1] for p in payloads] == ['["a", "b"]', "*"]
+
+
+class TestSeedDefaultTexts:
+    @pytest.mark.asyncio
+    async def test_one_statement_inserts_only_missing(self, db_engine, db_session):
+        statements = []
+        event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        assert await ts.seed_default_texts(db_session) == 2 * len(ts.DEFAULT_TEXTS)
+        assert len(statements) == 1
+
+        edited = (await db_session.execute(
+            select(BotText).where(BotText.key == "menu_owner", BotText.language == "kk")
+        )).scalar_one()
+        edited.value = "Өзгертілген"
+        await db_session.delete((await db_session.execute(
+            select(BotText).where(BotText.key == "menu_master", BotText.language == "ru")
+        )).scalar_one())
+        await db_session.commit()
+
+        assert await ts.seed_default_texts(db_session) == 1
+        await db_session.refresh(edited)
+        assert edited.value == "Өзгертілген"
+        restored = await bot_text_repo.get_by_key(db_session, "menu_master", "ru")
+        assert restored == ts.DEFAULT_TEXTS["menu_master"]
@@ -0,0 +1,66 @@
+"""Integration tests for per-day ticket number allocation."""
+import asyncio
+from datetime import date
+
+import pytest
+
+from bot.db.models.ticket import Ticket
+from bot.db.repositories import ticket_repo
+from bot.services import ticket_service
+from bot.utils.ticket_id import format_ticket_id
+
+
+def _ticket_data(n: int) -> dict:
+    return {
+        "client_telegram_id": 100000 + n,
+        "client_phone": "77001234567",
+        "client_full_name": f"Owner {n}",
+        "residential_complex": "alasha",
+        "category": "cctv",
+        "description": "Камера не работает",
+    }
+
+
+class TestTicketCounter:
+    def test_format_ticket_id(self):
+        assert format_ticket_id(date(2025, 1, 2), 7) == "QSS-20250102-0007"
+
+    @pytest.mark.asyncio
+    async def test_numbers_increment_per_day(self, db_session):
+        day1, day2 = date(2025, 1, 1), date(2025, 1, 2)
+
+        assert await ticket_repo.next_daily_number(db_session, day1) == 1
+        assert await ticket_repo.next_daily_number(db_session, day1) == 2
+        assert await ticket_repo.next_daily_number(db_session, day2) == 1
+        assert await ticket_repo.next_daily_number(db_session, day1) == 3
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_number_is_reused(self, session_factory):
+        today = date.today()
+        async with session_factory() as session:
+            assert await ticket_repo.next_daily_number(session, today) == 1
+            await session.rollback()
+        async with session_factory() as session:
+            assert await ticket_repo.next_daily_number(session, today) == 1
+
+    @pytest.mark.asyncio
+    async def test_parallel_creation_yields_unique_ids(self, session_factory):
+        from sqlalchemy import select
+
+        count = 200
+
+        async def create(n: int) -> str:
+            async with session_factory() as session:
+                ticket = await ticket_service.create_ticket(session, _ticket_data(n))
+                await session.commit()
+                return ticket.ticket_id
+
+        ticket_ids = await asyncio.gather(*(create(n) for n in range(count)))
+
+        assert len(set(ticket_ids)) == count
+        numbers = sorted(int(tid.rsplit("-", 1)[1]) for tid in ticket_ids)
+        assert numbers == list(range(1, count + 1))
+
+        async with session_factory() as session:
+            stored = (await session.execute(select(Ticket.ticket_id))).scalars().all()
+        assert sorted(stored) == sorted(ticket_ids)
@@ -0,0 +1,140 @@
+"""Integration tests for the ticket creation pipeline."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.db.models.admin import Admin
+from bot.db.models.ticket import Ticket
+from bot.db.models.ticket_history import TicketHistory
+from bot.db.repositories import recipient_repo, ticket_repo
+from bot.services import ticket_service
+
+DATA = {
+    "client_telegram_id": 100001,
+    "client_phone": "77001234567",
+    "client_full_name": "Owner",
+    "residential_complex": "alasha",
+    "category": "car_plate",
+    "description": "Договор приложен",
+    "attachments": ["file-1"],
+    "has_parking": True,
+    "status": "pending_approval",
+}
+
+
+class TestNewTicketRecipients:
+    @pytest.mark.asyncio
+    async def test_masters_of_complex_and_all_admins(self, db_session, make_master):
+        db_session.add_all([
+            make_master(1, ["alasha", "terekti"], language="kk"),
+            make_master(2, ["terekti"]),
+            make_master(3, ["alasha"], is_active=False),
+            make_master(4, ["alasha_2"]),
+            Admin(telegram_id=10, full_name="A1"),
+            Admin(telegram_id=11, full_name="A2", language="kk"),
+        ])
+        await db_session.flush()
+
+        masters, admins = await recipient_repo.new_ticket_recipients(db_session, "alasha")
+
+        assert masters == [recipient_repo.Recipient(1, "kk")]
+        assert sorted(admins) == [recipient_repo.Recipient(10, "ru"), recipient_repo.Recipient(11, "kk")]
+
+
+class TestCreateTicket:
+    @pytest.mark.asyncio
+    async def test_creates_ticket_and_history(self, db_session):
+        ticket = await ticket_service.create_ticket(db_session, DATA)
+        await db_session.commit()
+
+        assert ticket.ticket_id.endswith("-0001")
+        assert ticket.attachments == ["file-1"]
+        history = (await db_session.execute(select(TicketHistory))).scalar_one()
+        assert (history.ticket_id, history.old_status, history.new_status) == (ticket.id, None, "pending_approval")
+        assert "госномер" in history.comment
+
+    @pytest.mark.asyncio
+    async def test_postgres_runs_one_statement(self):
+        """Counter, ticket and history go out as one WITH ... statement on Postgres."""
+        session = MagicMock()
+        session.bind.dialect.name = "postgresql"
+        session.execute = AsyncMock(return_value=MagicMock())
+
+        await ticket_repo.create_with_history(
+            session,
+            values={"client_telegram_id": 1, "description": "-", "attachments": ["a"], "has_parking": None},
+            history={"old_status": None, "new_status": "new", "comment": "Заявка создана"},
+        )
+
+        session.execute.assert_awaited_once()
+        compiled = session.execute.await_args.args[0].compile(dialect=postgresql.asyncpg.dialect())
+        sql = str(compiled)
+        counter, rest = sql.removeprefix("WITH counter AS \n(").split("), \nticket AS \n(", 1)
+        ticket, rest = rest.split("), \nhistory AS \n(", 1)
+        history, final = rest.split(")\n SELECT ", 1)
+
+        assert counter.startswith("INSERT INTO ticket_counters (day, last_value) VALUES")
+        assert "ON CONFLICT (day) DO UPDATE SET last_value = (ticket_counters.last_value + " in counter
+        assert counter.endswith("RETURNING ticket_counters.last_value")
+        # The number comes from the counter row, the ticket row goes on to history and the result
+        assert ticket.startswith(
+            "INSERT INTO tickets (ticket_id, status, client_telegram_id, description, attachments, has_parking) SELECT"
+        )
+        # The column default is not applied inside a CTE, so it is bound explicitly
+        assert "new" in compiled.params.values()
+        assert "lpad(CAST(counter.last_value AS VARCHAR)" in ticket
+        assert "\nFROM counter RETURNING tickets.id, tickets.ticket_id," in ticket
+        assert history.startswith("INSERT INTO ticket_history (ticket_id, old_status, new_status, comment) SELECT ticket.id")
+        assert history.endswith("\nFROM ticket")
+        assert final.endswith("\nFROM ticket")
+        assert all(f"ticket.{column.name}" in final for column in Ticket.__table__.c)
+        assert {"Заявка создана", "new", "-"} <= {v for v in compiled.params.values() if isinstance(v, str)}
+
+
+@pytest.mark.postgres
+class TestCreateTicketOnPostgres:
+    @pytest.mark.asyncio
+    async def test_cte_numbers_ticket_and_adds_history(self, pg_engine):
+        session_factory = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+        statements = []
+        event.listen(pg_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async with session_factory() as session:
+            tickets = [
+                await ticket_repo.create_with_history(
+                    session,
+                    values={
+                        "client_telegram_id": 1, "client_phone": "+77001234567", "client_full_name": "Иван",
+                        "residential_complex": "alasha", "category": "cctv", "description": "-",
+                        "attachments": ["a"], "has_parking": None,
+                    },
+                    history={"old_status": None, "new_status": "new", "comment": "Заявка создана"},
+                )
+                for _ in range(2)
+            ]
+            await session.commit()
+
+        assert len(statements) == 2
+        assert [t.ticket_id[-5:] for t in tickets] == ["-0001", "-0002"]
+        assert (tickets[0].status, tickets[0].attachments, tickets[0].has_parking) == ("new", ["a"], None)
+        async with session_factory() as session:
+            history = (await session.execute(select(TicketHistory).order_by(TicketHistory.id))).scalars().all()
+        assert [(h.ticket_id, h.new_status, h.comment) for h in history] == [
+            (tickets[0].id, "new", "Заявка создана"), (tickets[1].id, "new", "Заявка создана"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_create_ticket_service(self, pg_engine):
+        session_factory = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            ticket = await ticket_service.create_ticket(session, DATA)
+            await session.commit()
+
+        assert ticket.status == "pending_approval"
+        assert ticket.ticket_id.endswith("-0001")
+        async with session_factory() as session:
+            history = (await session.execute(select(TicketHistory))).scalar_one()
+        assert (history.ticket_id, history.new_status) == (ticket.id, "pending_approval")
@@ -0,0 +1,75 @@
+"""Integration tests for the ticket_stats_daily rollup."""
+import pytest
+from sqlalchemy import select
+
+from bot.db.models import Master, TicketStatsDaily
+from bot.db.repositories import stats_repo
+from bot.services import ticket_service
+
+
+async def _snapshot(session):
+    result = await session.execute(
+        select(TicketStatsDaily).where(TicketStatsDaily.ticket_count != 0)
+    )
+    return sorted(
+        (r.day, r.residential_complex, r.category, r.status, r.master_id,
+         r.ticket_count, r.rating_sum, r.rated_count)
+        for r in result.scalars()
+    )
+
+
+def _ticket_data(**overrides):
+    data = {
+        "client_telegram_id": 123456,
+        "client_phone": "77001234567",
+        "client_full_name": "Test Owner",
+        "residential_complex": "alasha",
+        "category": "cctv",
+        "description": "Test",
+    }
+    data.update(overrides)
+    return data
+
+
+class TestTicketStatsRollup:
+    @pytest.mark.asyncio
+    async def test_incremental_updates_match_rebuild(self, db_session):
+        masters = [Master(telegram_id=i, full_name=f"Master {i}", residential_complex="alasha") for i in (1, 2)]
+        db_session.add_all(masters)
+        await db_session.flush()
+
+        first = await ticket_service.create_ticket(db_session, _ticket_data())
+        second = await ticket_service.create_ticket(db_session, _ticket_data(category="intercom"))
+        third = await ticket_service.create_ticket(db_session, _ticket_data(residential_complex="terekti"))
+
+        await ticket_service.change_status(db_session, first.id, "new", "in_progress", 1, "master")
+        await ticket_service.assign_master(db_session, first.id, masters[0].id)
+        await ticket_service.change_status(db_session, first.id, "in_progress", "completed", 1, "master")
+        await ticket_service.rate_ticket(db_session, first.id, 4)
+        await ticket_service.reassign_ticket(db_session, second.id, masters[1].id, "new", 9, "Master 2")
+        await ticket_service.reassign_ticket(db_session, second.id, masters[0].id, "new", 9, "Master 1")
+        await ticket_service.change_status(db_session, third.id, "new", "cancelled", 9, "admin")
+        await db_session.flush()
+
+        incremental = await _snapshot(db_session)
+        await stats_repo.rebuild(db_session)
+        assert incremental == await _snapshot(db_session)
+
+        by_master = await stats_repo.totals_by(db_session, "master_id")
+        assert {row.value: row.tickets for row in by_master} == {masters[0].id: 2, stats_repo.UNASSIGNED: 1}
+        rated = next(row for row in by_master if row.value == masters[0].id)
+        assert rated.avg_rating == 4
+
+    @pytest.mark.asyncio
+    async def test_status_summary_from_rollup(self, db_session):
+        for status in ("new", "new", "pending_approval"):
+            await ticket_service.create_ticket(db_session, _ticket_data(status=status))
+        await db_session.flush()
+
+        summary = await stats_repo.status_summary(db_session)
+        assert summary == {"total": 3, "new": 2, "in_progress": 0, "completed": 0}
+
+    @pytest.mark.asyncio
+    async def test_unknown_dimension_rejected(self, db_session):
+        with pytest.raises(ValueError):
+            await stats_repo.totals_by(db_session, "client_phone")
@@ -0,0 +1,115 @@
+"""Integration tests for the webhook endpoint."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot.webhook import SECRET_HEADER, create_app, single_receiver
+
+UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 42, "type": "private"},
+        "from": {"id": 42, "is_bot": False, "first_name": "U"},
+        "text": "/start",
+    },
+}
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = MagicMock()
+    scheduler.wait_for_room = AsyncMock()
+    return scheduler
+
+
+@pytest.fixture
+async def client(scheduler):
+    app = create_app(MagicMock(), scheduler, "/webhook", secret="s3cret")
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+class TestWebhook:
+    @pytest.mark.asyncio
+    async def test_update_is_scheduled(self, client, scheduler):
+        resp = await client.post("/webhook", json=UPDATE, headers={SECRET_HEADER: "s3cret"})
+
+        assert resp.status == 200
+        update = scheduler.submit.call_args[0][0]
+        assert update.update_id == 1
+        assert update.message.text == "/start"
+
+    @pytest.mark.asyncio
+    async def test_full_scheduler_holds_the_answer(self, client, scheduler):
+        room = asyncio.Event()
+        scheduler.wait_for_room = AsyncMock(side_effect=room.wait)
+
+        request = asyncio.create_task(client.post("/webhook", json=UPDATE, headers={SECRET_HEADER: "s3cret"}))
+        await asyncio.sleep(0.05)
+        assert not request.done()
+        scheduler.submit.assert_not_called()
+
+        room.set()
+        assert (await request).status == 200
+        scheduler.submit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_wrong_secret_is_rejected(self, client, scheduler):
+        resp = await client.post("/webhook", json=UPDATE, headers={SECRET_HEADER: "nope"})
+
+        assert resp.status == 401
+        scheduler.submit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_secret_is_rejected(self, client, scheduler):
+        resp = await client.post("/webhook", json=UPDATE)
+        assert resp.status == 401
+
+    @pytest.mark.asyncio
+    async def test_malformed_update(self, client, scheduler):
+        resp = await client.post("/webhook", data="not json", headers={SECRET_HEADER: "s3cret"})
+
+        assert resp.status == 400
+        scheduler.submit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_other_paths(self, client):
+        resp = await client.post("/other", json=UPDATE, headers={SECRET_HEADER: "s3cret"})
+        assert resp.status == 404
+
+
+class TestSingleReceiver:
+    @staticmethod
+    def _postgres_engine(got_lock: bool):
+        conn = MagicMock()
+        conn.scalar = AsyncMock(side_effect=[got_lock, True])
+        engine = MagicMock()
+        engine.dialect.name = "postgresql"
+        engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+        engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+        return engine, conn
+
+    @pytest.mark.asyncio
+    async def test_second_replica_refuses_to_start(self):
+        engine, _ = self._postgres_engine(got_lock=False)
+        with pytest.raises(RuntimeError, match="single replica"):
+            async with single_receiver(engine):
+                pytest.fail("served without the lock")
+
+    @pytest.mark.asyncio
+    async def test_lock_is_held_while_serving(self):
+        engine, conn = self._postgres_engine(got_lock=True)
+        async with single_receiver(engine):
+            assert conn.scalar.await_count == 1
+        sql = [str(call.args[0]) for call in conn.scalar.await_args_list]
+        assert "pg_try_advisory_lock" in sql[0] and "pg_advisory_unlock" in sql[1]
+
+    @pytest.mark.asyncio
+    async def test_noop_on_sqlite(self, db_engine):
+        async with single_receiver(db_engine):
+            pass
@@ -0,0 +1,17 @@
+"""Unit test fixtures."""
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def until():
+    """Wait until ``predicate()`` is true, failing the test after ``timeout`` seconds."""
+    async def wait(predicate, timeout: float = 1.0) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not predicate():
+            assert loop.time() < deadline, "condition not reached"
+            await asyncio.sleep(0.001)
+
+    return wait
@@ -9,10 +9,8 @@ from bot.utils.constants import UserRole
 class TestResolveRole:
     @pytest.mark.asyncio
     async def test_resolve_role_admin(self, mock_session, fake_admin):
-        with patch("bot.services.auth_service.admin_repo") as admin_repo, \
-             patch("bot.services.auth_service.master_repo"), \
-             patch("bot.services.auth_service.owner_repo"):
-            admin_repo.get_by_telegram_id = AsyncMock(return_value=fake_admin)
+        with patch("bot.services.auth_service.user_repo") as user_repo:
+            user_repo.get_accounts_by_telegram_id = AsyncMock(return_value=(fake_admin, None, None))
 
             role, user_obj = await resolve_role(mock_session, 999999)
             assert role == UserRole.ADMIN
@@ -20,11 +18,8 @@ class TestResolveRole:
 
     @pytest.mark.asyncio
     async def test_resolve_role_master(self, mock_session, fake_master):
-        with patch("bot.services.auth_service.admin_repo") as admin_repo, \
-             patch("bot.services.auth_service.master_repo") as master_repo, \
-             patch("bot.services.auth_service.owner_repo"):
-            admin_repo.get_by_telegram_id = AsyncMock(return_value=None)
-            master_repo.get_by_telegram_id = AsyncMock(return_value=fake_master)
+        with patch("bot.services.auth_service.user_repo") as user_repo:
+            user_repo.get_accounts_by_telegram_id = AsyncMock(return_value=(None, fake_master, None))
 
             role, user_obj = await resolve_role(mock_session, 654321)
             assert role == UserRole.MASTER
@@ -32,12 +27,8 @@ class TestResolveRole:
 
     @pytest.mark.asyncio
     async def test_resolve_role_owner(self, mock_session, fake_owner):
-        with patch("bot.services.auth_service.admin_repo") as admin_repo, \
-             patch("bot.services.auth_service.master_repo") as master_repo, \
-             patch("bot.services.auth_service.owner_repo") as owner_repo:
-            admin_repo.get_by_telegram_id = AsyncMock(return_value=None)
-            master_repo.get_by_telegram_id = AsyncMock(return_value=None)
-            owner_repo.get_by_telegram_id = AsyncMock(return_value=fake_owner)
+        with patch("bot.services.auth_service.user_repo") as user_repo:
+            user_repo.get_accounts_by_telegram_id = AsyncMock(return_value=(None, None, fake_owner))
 
             role, user_obj = await resolve_role(mock_session, 123456)
             assert role == UserRole.OWNER
@@ -45,12 +36,8 @@ class TestResolveRole:
 
     @pytest.mark.asyncio
     async def test_resolve_role_none(self, mock_session):
-        with patch("bot.services.auth_service.admin_repo") as admin_repo, \
-             patch("bot.services.auth_service.master_repo") as master_repo, \
-             patch("bot.services.auth_service.owner_repo") as owner_repo:
-            admin_repo.get_by_telegram_id = AsyncMock(return_value=None)
-            master_repo.get_by_telegram_id = AsyncMock(return_value=None)
-            owner_repo.get_by_telegram_id = AsyncMock(return_value=None)
+        with patch("bot.services.auth_service.user_repo") as user_repo:
+            user_repo.get_accounts_by_telegram_id = AsyncMock(return_value=(None, None, None))
 
             role, user_obj = await resolve_role(mock_session, 000000)
             assert role is None
@@ -59,14 +46,20 @@ class TestResolveRole:
     @pytest.mark.asyncio
     async def test_resolve_role_priority_admin_over_master(self, mock_session, fake_admin, fake_master):
         """Admin role takes priority even if user is also a master."""
-        with patch("bot.services.auth_service.admin_repo") as admin_repo, \
-             patch("bot.services.auth_service.master_repo") as master_repo, \
-             patch("bot.services.auth_service.owner_repo"):
-            admin_repo.get_by_telegram_id = AsyncMock(return_value=fake_admin)
-            # master_repo should never be called
+        with patch("bot.services.auth_service.user_repo") as user_repo:
+            user_repo.get_accounts_by_telegram_id = AsyncMock(return_value=(fake_admin, fake_master, None))
+
             role, user_obj = await resolve_role(mock_session, 999999)
             assert role == UserRole.ADMIN
-            master_repo.get_by_telegram_id.assert_not_called()
+            assert user_obj == fake_admin
+
+    @pytest.mark.asyncio
+    async def test_resolve_role_single_lookup(self, mock_session, fake_owner):
+        with patch("bot.services.auth_service.user_repo") as user_repo:
+            user_repo.get_accounts_by_telegram_id = AsyncMock(return_value=(None, None, fake_owner))
+
+            await resolve_role(mock_session, 123456)
+            user_repo.get_accounts_by_telegram_id.assert_awaited_once_with(mock_session, 123456)
 
 
 class TestAuthenticateByPhone:
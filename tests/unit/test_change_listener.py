@@ -0,0 +1,74 @@
+"""Tests for bot.services.change_listener module."""
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from bot.services import change_listener
+from bot.services.change_listener import run_change_listener
+
+
+class FakeConnection:
+    def __init__(self, alive: bool = True):
+        self.alive = alive
+        self.callbacks = {}
+        self.terminated = False
+
+    async def add_listener(self, channel, callback):
+        self.callbacks[channel] = callback
+
+    def notify(self, channel: str, payload: str) -> None:
+        self.callbacks[channel](self, 1, channel, payload)
+
+    async def fetchval(self, query):
+        if not self.alive:
+            raise ConnectionError("connection is closed")
+        return 1
+
+    def terminate(self):
+        self.terminated = True
+
+
+async def _stop(task: asyncio.Task) -> None:
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+class TestRunChangeListener:
+    @pytest.mark.asyncio
+    async def test_reloads_all_on_connect_then_routes_by_channel(self, until):
+        texts, recipients = AsyncMock(), AsyncMock()
+        conn = FakeConnection()
+        with patch("bot.services.change_listener.asyncpg.connect", AsyncMock(return_value=conn)):
+            task = asyncio.create_task(run_change_listener({"bot_texts": texts, "recipients": recipients}, "postgresql://test"))
+            await until(lambda: recipients.await_count)
+            texts.assert_awaited_once_with(["*"])
+            recipients.assert_awaited_once_with(["*"])
+
+            conn.notify("bot_texts", json.dumps(["menu_owner"]))
+            conn.notify("bot_texts", json.dumps(["menu_master"]))
+            await until(lambda: texts.await_count == 2)
+            await _stop(task)
+
+        # Both notifications were queued before the listener woke up: one call
+        texts.assert_awaited_with([json.dumps(["menu_owner"]), json.dumps(["menu_master"])])
+        assert recipients.await_count == 1
+        assert conn.terminated
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_dead_connection(self, monkeypatch, until):
+        monkeypatch.setattr(change_listener, "PING_INTERVAL", 0.01)
+        monkeypatch.setattr(change_listener, "RECONNECT_DELAY", 0.01)
+        handler = AsyncMock()
+        dead, fresh = FakeConnection(alive=False), FakeConnection()
+        connect = AsyncMock(side_effect=[OSError("refused"), dead, fresh])
+        with patch("bot.services.change_listener.asyncpg.connect", connect):
+            task = asyncio.create_task(run_change_listener({"bot_texts": handler}, "postgresql://test"))
+            await until(lambda: fresh.callbacks and handler.await_count == 2)
+            await _stop(task)
+
+        # A full reload after each successful connect, since notifications were missed
+        assert connect.await_count == 3
+        assert dead.terminated
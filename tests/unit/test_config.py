@@ -0,0 +1,25 @@
+"""Tests for bot.config module."""
+import pytest
+
+from bot.config import Settings
+
+
+class TestDbEngineOptions:
+    def test_profiles_have_separate_pool_sizes(self):
+        settings = Settings(bot_token="x", bot_db_pool_size=20, admin_db_pool_size=2)
+
+        assert settings.db_engine_options("bot")["pool_size"] == 20
+        assert settings.db_engine_options("admin")["pool_size"] == 2
+
+    def test_default_profile_from_settings(self):
+        settings = Settings(bot_token="x", db_profile="admin")
+        assert settings.db_engine_options() == settings.db_engine_options("admin")
+
+    def test_statement_cache_passed_to_driver(self):
+        settings = Settings(bot_token="x", db_statement_cache_size=0)
+        options = settings.db_engine_options("bot")
+        assert options["connect_args"] == {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            Settings(bot_token="x").db_engine_options("worker")
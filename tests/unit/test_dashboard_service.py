@@ -0,0 +1,42 @@
+"""Tests for bot.services.dashboard_service module."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from bot.services.dashboard_service import DashboardCache
+
+
+class TestDashboardCache:
+    @pytest.mark.asyncio
+    async def test_reuses_snapshot_within_ttl(self):
+        cache = DashboardCache(ttl=60)
+        with patch("bot.services.dashboard_service.load_dashboard", AsyncMock(return_value={"stats": {}})) as load:
+            first = await cache.get(None)
+            second = await cache.get(None)
+
+        assert first is second
+        load.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reloads_after_expiry(self):
+        cache = DashboardCache(ttl=0)
+        with patch("bot.services.dashboard_service.load_dashboard", AsyncMock(return_value={})) as load:
+            await cache.get(None)
+            await cache.get(None)
+
+        assert load.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_load(self):
+        cache = DashboardCache(ttl=60)
+
+        async def slow_load(_pool):
+            await asyncio.sleep(0.01)
+            return {}
+
+        with patch("bot.services.dashboard_service.load_dashboard", AsyncMock(side_effect=slow_load)) as load:
+            await asyncio.gather(*(cache.get(None) for _ in range(10)))
+
+        load.assert_awaited_once()
+        assert cache.loads == 1
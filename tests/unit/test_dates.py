@@ -0,0 +1,26 @@
+"""Tests for bot.utils.dates module."""
+from datetime import date, datetime
+from unittest.mock import patch
+
+from bot.utils.dates import day_range, day_start
+
+
+class TestDayRange:
+    def test_day_start_converted_to_db_timezone(self):
+        with patch("bot.utils.dates.settings") as settings:
+            settings.timezone = "Asia/Almaty"
+            settings.db_timezone = "UTC"
+            assert day_start(date(2025, 3, 10)) == datetime(2025, 3, 9, 19, 0)
+
+    def test_single_day_is_half_open(self):
+        with patch("bot.utils.dates.settings") as settings:
+            settings.timezone = "UTC"
+            settings.db_timezone = "UTC"
+            assert day_range(date(2025, 3, 10)) == (datetime(2025, 3, 10), datetime(2025, 3, 11))
+
+    def test_multi_day_range(self):
+        with patch("bot.utils.dates.settings") as settings:
+            settings.timezone = "UTC"
+            settings.db_timezone = "UTC"
+            start, end = day_range(date(2025, 3, 1), date(2025, 3, 7))
+            assert (start, end) == (datetime(2025, 3, 1), datetime(2025, 3, 8))
@@ -0,0 +1,110 @@
+"""Tests for bot.services.fanout module."""
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from bot.services.fanout import Delivery, FanoutDispatcher, TokenBucket
+
+
+def _retry_after(seconds=0):
+    return TelegramRetryAfter(SendMessage(chat_id=1, text="x"), "Flood control exceeded", seconds)
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_block(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+        bucket.block(2)
+        assert bucket.reserve() == pytest.approx(2, abs=0.01)
+
+
+class TestFanoutDispatcher:
+    @pytest.mark.asyncio
+    async def test_chats_are_sent_in_parallel(self, mock_bot):
+        async def slow_send(chat_id, **kwargs):
+            await asyncio.sleep(0.05)
+
+        mock_bot.send_message = AsyncMock(side_effect=slow_send)
+        deliveries = [Delivery(chat_id, "send_message", {"text": "hi"}) for chat_id in range(10)]
+
+        start = time.perf_counter()
+        results = await FanoutDispatcher().send_all(mock_bot, deliveries)
+
+        assert time.perf_counter() - start < 0.25
+        assert [r.chat_id for r in results] == list(range(10))
+        assert all(r.ok for r in results)
+
+    @pytest.mark.asyncio
+    async def test_order_kept_within_chat(self, mock_bot):
+        calls = []
+        mock_bot.send_photo = AsyncMock(side_effect=lambda chat_id, **kw: calls.append(("photo", chat_id)))
+        mock_bot.send_message = AsyncMock(side_effect=lambda chat_id, **kw: calls.append(("message", chat_id)))
+
+        await FanoutDispatcher().send_all(mock_bot, [
+            Delivery(1, "send_photo", {"photo": "file"}),
+            Delivery(1, "send_message", {"text": "card"}),
+        ])
+
+        assert calls == [("photo", 1), ("message", 1)]
+
+    @pytest.mark.asyncio
+    async def test_global_rate_limit(self, mock_bot):
+        deliveries = [Delivery(chat_id, "send_message", {"text": "hi"}) for chat_id in range(6)]
+
+        start = time.perf_counter()
+        await FanoutDispatcher(global_rate=20).send_all(mock_bot, deliveries[:1])
+        await FanoutDispatcher(global_rate=20).send_all(mock_bot, deliveries)
+        elapsed = time.perf_counter() - start
+
+        # Burst of 20 covers everything: no throttling
+        assert elapsed < 0.05
+
+        dispatcher = FanoutDispatcher(global_rate=50)
+        dispatcher.global_bucket = TokenBucket(rate=50, capacity=1)
+        start = time.perf_counter()
+        await dispatcher.send_all(mock_bot, deliveries)
+        # 6 messages at 50/s with no burst: 5 intervals of 20 ms
+        assert time.perf_counter() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured(self, mock_bot):
+        mock_bot.send_message = AsyncMock(side_effect=[_retry_after(0), None])
+
+        [result] = await FanoutDispatcher().send_all(mock_bot, [Delivery(1, "send_message", {"text": "hi"})])
+
+        assert result.ok
+        assert result.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, mock_bot):
+        mock_bot.send_message = AsyncMock(side_effect=_retry_after(0))
+
+        [result] = await FanoutDispatcher(max_attempts=2).send_all(
+            mock_bot, [Delivery(1, "send_message", {"text": "hi"})]
+        )
+
+        assert not result.ok
+        assert result.attempts == 2
+        assert mock_bot.send_message.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self, mock_bot):
+        mock_bot.send_message = AsyncMock(side_effect=[Exception("Forbidden: bot was blocked"), None])
+
+        results = await FanoutDispatcher().send_all(mock_bot, [
+            Delivery(1, "send_message", {"text": "hi"}),
+            Delivery(2, "send_message", {"text": "hi"}),
+        ])
+
+        assert [r.ok for r in results] == [False, True]
+        assert "blocked" in results[0].error
@@ -3,7 +3,8 @@ import pytest
 from datetime import datetime
 from unittest.mock import MagicMock
 
-from bot.utils.formatting import format_ticket_card, format_history, format_ticket_confirmation
+from bot.db.repositories.stats_repo import StatsRow
+from bot.utils.formatting import format_ticket_card, format_history, format_ticket_confirmation, format_stats_lines
 
 
 class TestFormatTicketCard:
@@ -207,3 +208,13 @@ class TestFormatTicketConfirmation:
         result = format_ticket_confirmation(data)
         assert "test@mail.kz" in result
         assert "Блок 5" in result
+
+
+class TestFormatStatsLines:
+    def test_lines_with_names_and_rating(self):
+        rows = [StatsRow(1, 5, 9, 2), StatsRow(0, 2, 0, 0)]
+        text = format_stats_lines(rows, {1: "Мастер", 0: "Не назначен"}, show_rating=True)
+        assert text == "• Мастер: 5 (★ 4.5)\n• Не назначен: 2"
+
+    def test_empty(self):
+        assert format_stats_lines([], {}) == "—"
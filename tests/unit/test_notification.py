@@ -8,12 +8,23 @@ from bot.services.notification_service import (
     notify_owner_completed,
     notify_master_new_ticket,
     notify_admins_new_ticket,
+    notify_admin_car_plate_review,
+    notify_masters_new_ticket,
     notify_owner_car_plate_decision,
     _with_lang,
 )
+from bot.db.repositories.recipient_repo import Recipient
+from bot.services.fanout import FanoutDispatcher
 from bot.utils.language import current_language
 
 
+@pytest.fixture(autouse=True)
+def dispatcher():
+    """Fresh rate limiter per test, so per-chat buckets don't carry over."""
+    with patch("bot.services.fanout.dispatcher", FanoutDispatcher()) as d:
+        yield d
+
+
 class TestWithLangContext:
     def test_with_lang_sets_language(self):
         with _with_lang("kk"):
@@ -109,6 +120,67 @@ class TestNotifyAdminsNewTicket:
             assert mock_bot.send_message.call_count == 2
 
 
+    @pytest.mark.asyncio
+    async def test_reports_per_recipient_results(self, mock_bot, fake_admin):
+        admin2 = MagicMock()
+        admin2.telegram_id = 888888
+        admin2.language = "ru"
+        mock_bot.send_message = AsyncMock(side_effect=[None, Exception("blocked")])
+
+        with patch("bot.services.notification_service.admin_repo") as admin_repo:
+            admin_repo.get_all = AsyncMock(return_value=[fake_admin, admin2])
+            results = await notify_admins_new_ticket(mock_bot, AsyncMock(), "Card text")
+
+        assert [(r.chat_id, r.ok) for r in results] == [(999999, True), (888888, False)]
+
+    @pytest.mark.asyncio
+    async def test_uses_loaded_recipient_directory(self, mock_bot):
+        directory = MagicMock(loaded=True)
+        directory.admins.return_value = [Recipient(777777, "kk")]
+        with patch("bot.services.notification_service.recipient_directory", directory), \
+                patch("bot.services.notification_service.admin_repo") as admin_repo:
+            admin_repo.get_all = AsyncMock()
+            results = await notify_admins_new_ticket(mock_bot, AsyncMock(), "Card text")
+
+        admin_repo.get_all.assert_not_awaited()
+        assert [r.chat_id for r in results] == [777777]
+
+
+class TestNotifyMastersNewTicket:
+    @pytest.mark.asyncio
+    async def test_sends_to_every_master(self, mock_bot, fake_master):
+        master2 = MagicMock()
+        master2.telegram_id = 777777
+        master2.language = "kk"
+
+        results = await notify_masters_new_ticket(mock_bot, [fake_master, master2], "Card text", ticket_pk=1)
+
+        assert mock_bot.send_message.call_count == 2
+        assert all(r.ok for r in results)
+
+    @pytest.mark.asyncio
+    async def test_car_plate_sends_contract_first(self, mock_bot, fake_master):
+        await notify_masters_new_ticket(
+            mock_bot, [fake_master], "Card text", ticket_pk=1, is_car_plate=True, contract_photo="file-id",
+        )
+
+        mock_bot.send_photo.assert_called_once()
+        kb = mock_bot.send_message.call_args[1]["reply_markup"]
+        assert len(kb.inline_keyboard[0]) == 2  # approve / reject
+
+
+class TestNotifyAdminCarPlateReview:
+    @pytest.mark.asyncio
+    async def test_photo_and_message_per_admin(self, mock_bot, fake_admin):
+        with patch("bot.services.notification_service.admin_repo") as admin_repo:
+            admin_repo.get_all = AsyncMock(return_value=[fake_admin])
+            results = await notify_admin_car_plate_review(
+                mock_bot, AsyncMock(), "Card", 1, "approve", contract_photo="file-id",
+            )
+
+        assert [r.method for r in results] == ["send_photo", "send_message"]
+
+
 class TestNotifyCarPlateDecision:
     @pytest.mark.asyncio
     async def test_approved(self, mock_bot):
@@ -0,0 +1,80 @@
+"""Tests for bot.services.outbox module."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.services.fanout import Delivery
+from bot.services.notification_service import notify_admins_new_ticket, notify_owner_completed
+from bot.services.outbox import OutboxWriter, _deserialize, backoff_delay
+
+
+@pytest.fixture
+def session():
+    return MagicMock()
+
+
+class TestOutboxWriter:
+    @pytest.mark.asyncio
+    async def test_send_message_adds_row(self, session):
+        writer = OutboxWriter(session)
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="OK", callback_data="ok")],
+        ])
+        await writer.send_message(42, "hi", reply_markup=keyboard)
+
+        row = session.add.call_args[0][0]
+        assert row.chat_id == 42
+        assert row.method == "send_message"
+        assert row.payload == {
+            "text": "hi",
+            "reply_markup": {"inline_keyboard": [[{"text": "OK", "callback_data": "ok"}]]},
+        }
+
+    def test_payload_round_trip(self, session):
+        writer = OutboxWriter(session)
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="OK", callback_data="ok")],
+        ])
+        writer.enqueue([Delivery(1, "send_message", {"text": "hi", "reply_markup": keyboard})])
+
+        row = session.add.call_args[0][0]
+        kwargs = _deserialize(row.payload)
+        assert kwargs["reply_markup"] == keyboard
+        assert kwargs["text"] == "hi"
+
+    @pytest.mark.asyncio
+    async def test_notification_is_queued_not_sent(self, session, mock_bot):
+        writer = OutboxWriter(session)
+        await notify_owner_completed(writer, 100, "QSS-1", 1)
+
+        mock_bot.send_message.assert_not_called()
+        row = session.add.call_args[0][0]
+        assert row.chat_id == 100
+        assert "reply_markup" in row.payload
+
+    @pytest.mark.asyncio
+    async def test_fanout_notification_is_queued(self, session):
+        admins = [MagicMock(telegram_id=1, language="ru"), MagicMock(telegram_id=2, language="ru")]
+        with patch("bot.services.notification_service.admin_repo") as admin_repo, \
+                patch("bot.services.notification_service.fanout") as fanout:
+            admin_repo.get_all = AsyncMock(return_value=admins)
+            results = await notify_admins_new_ticket(OutboxWriter(session), session, "card")
+
+        assert results == []
+        fanout.dispatcher.send_all.assert_not_called()
+        assert [c[0][0].chat_id for c in session.add.call_args_list] == [1, 2]
+
+
+class TestBackoff:
+    def test_doubles(self):
+        with patch("bot.services.outbox.settings") as s:
+            s.outbox_backoff_base = 2.0
+            s.outbox_backoff_max = 600.0
+            assert [backoff_delay(n) for n in (1, 2, 3, 4)] == [2.0, 4.0, 8.0, 16.0]
+
+    def test_capped(self):
+        with patch("bot.services.outbox.settings") as s:
+            s.outbox_backoff_base = 2.0
+            s.outbox_backoff_max = 60.0
+            assert backoff_delay(20) == 60.0
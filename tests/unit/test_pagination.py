@@ -1,7 +1,9 @@
 """Tests for bot.utils.pagination module."""
 import pytest
 
-from bot.utils.pagination import paginate, PER_PAGE
+from bot.callbacks.navigation_cb import PageCB
+from bot.keyboards.common import page_nav_row
+from bot.utils.pagination import paginate, page_count, keyset_args, PER_PAGE
 
 
 class TestPaginate:
@@ -60,3 +62,36 @@ class TestPaginate:
         offset, limit, total_pages = paginate(total=20, page=4)
         assert total_pages == 4
         assert offset == 15
+
+
+class TestKeyset:
+    def test_page_count(self):
+        assert page_count(0) == 1
+        assert page_count(5) == 1
+        assert page_count(6) == 2
+
+    def test_first_page_has_no_cursor(self):
+        assert keyset_args(None) == {}
+
+    def test_cursor_args(self):
+        cb = PageCB(scope="owner_tickets", page=3, total=40, after=17)
+        assert keyset_args(cb) == {"after_id": 17, "before_id": None}
+
+    def test_packed_callback_fits_telegram_limit(self):
+        cb = PageCB(scope="master_completed", page=99999, total=9_999_999, after=2**31 - 1, before=2**31 - 1)
+        assert len(cb.pack().encode()) <= 64
+
+
+class TestPageNavRow:
+    tickets = [type("T", (), {"id": i})() for i in (30, 29, 28)]
+
+    def test_back_to_first_page_carries_no_cursor_or_count(self):
+        back, forward = page_nav_row("owner_tickets", self.tickets, page=2, total_pages=3, total=12)
+
+        assert PageCB.unpack(back.callback_data) == PageCB(scope="owner_tickets", page=1)
+        assert PageCB.unpack(forward.callback_data) == PageCB(scope="owner_tickets", page=3, total=12, after=28)
+
+    def test_back_to_later_page_keeps_count(self):
+        back, = page_nav_row("owner_tickets", self.tickets, page=3, total_pages=3, total=12)
+
+        assert PageCB.unpack(back.callback_data) == PageCB(scope="owner_tickets", page=2, total=12, before=30)
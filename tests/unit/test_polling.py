@@ -0,0 +1,56 @@
+"""Tests for bot.polling module."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from bot.polling import _poll
+
+
+class TestPoll:
+    @pytest.mark.asyncio
+    async def test_updates_are_submitted_and_confirmed(self):
+        offsets = []
+
+        async def get_updates(method, request_timeout=None):
+            offsets.append(method.offset)
+            if len(offsets) == 1:
+                return [MagicMock(update_id=10), MagicMock(update_id=11)]
+            raise asyncio.CancelledError
+
+        bot = MagicMock(side_effect=get_updates)
+        bot.session.timeout = 60
+        dp = MagicMock()
+        dp.resolve_used_update_types.return_value = ["message"]
+        scheduler = MagicMock()
+        scheduler.wait_for_room = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await _poll(dp, bot, scheduler)
+
+        assert [c[0][0].update_id for c in scheduler.submit.call_args_list] == [10, 11]
+        assert offsets == [None, 12]
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_back_off(self, monkeypatch):
+        calls = 0
+
+        async def get_updates(method, request_timeout=None):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("network down")
+            raise asyncio.CancelledError
+
+        bot = MagicMock(side_effect=get_updates)
+        bot.session.timeout = 60
+        sleep = AsyncMock()
+        monkeypatch.setattr("bot.polling.Backoff.asleep", sleep)
+        scheduler = MagicMock()
+        scheduler.wait_for_room = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await _poll(MagicMock(), bot, scheduler)
+
+        sleep.assert_awaited_once()
+        scheduler.submit.assert_not_called()
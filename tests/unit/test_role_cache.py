@@ -0,0 +1,143 @@
+"""Tests for bot.services.role_cache module."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import inspect
+
+from bot.db.models import Owner
+from bot.services.role_cache import RoleCache, notify_roles_changed
+from bot.utils.constants import UserRole
+
+
+def _owner(**overrides):
+    values = dict(
+        id=1, phone="77001234567", full_name="Test Owner", residential_complex="alasha",
+        telegram_id=123456, is_active=True, language="ru",
+    )
+    values.update(overrides)
+    return Owner(**values)
+
+
+class TestRoleCache:
+    def test_miss_then_hit(self):
+        cache = RoleCache()
+        assert cache.get(123456) is None
+
+        cache.set(123456, UserRole.OWNER, _owner())
+        role, user_obj = cache.get(123456)
+
+        assert role == UserRole.OWNER
+        assert user_obj.full_name == "Test Owner"
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+    def test_hit_returns_detached_copy(self):
+        cache = RoleCache()
+        original = _owner()
+        cache.set(123456, UserRole.OWNER, original)
+
+        _, first = cache.get(123456)
+        _, second = cache.get(123456)
+
+        assert first is not original
+        assert first is not second
+        assert inspect(first).detached
+        assert inspect(first).identity == (1,)
+
+    def test_unknown_user_is_cached(self):
+        cache = RoleCache()
+        cache.set(42, None, None)
+        assert cache.get(42) == (None, None)
+        assert cache.hits == 1
+
+    def test_entry_expires_after_ttl(self):
+        cache = RoleCache(ttl=60)
+        with patch("bot.services.role_cache.time.monotonic", return_value=1000.0):
+            cache.set(123456, UserRole.OWNER, _owner())
+        with patch("bot.services.role_cache.time.monotonic", return_value=1061.0):
+            assert cache.get(123456) is None
+        assert len(cache) == 0
+        assert cache.misses == 1
+
+    def test_lru_eviction(self):
+        cache = RoleCache(maxsize=2)
+        cache.set(1, None, None)
+        cache.set(2, None, None)
+        cache.get(1)  # 1 becomes most recently used
+        cache.set(3, None, None)
+
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
+        assert cache.get(3) is not None
+        assert cache.evictions == 1
+
+    def test_invalidate(self):
+        cache = RoleCache()
+        cache.set(1, None, None)
+        cache.set(2, None, None)
+        cache.invalidate(1, None)
+
+        assert cache.get(1) is None
+        assert cache.get(2) is not None
+
+    @pytest.mark.asyncio
+    async def test_apply_changes(self):
+        cache = RoleCache()
+        for telegram_id in (1, 2, 3):
+            cache.set(telegram_id, None, None)
+
+        await cache.apply_changes(["[1]", "[2, 4]"])
+        assert len(cache) == 1 and cache.get(3) is not None
+
+        await cache.apply_changes(["*"])
+        assert len(cache) == 0
+
+
+class TestNotifyRolesChanged:
+    @pytest.mark.asyncio
+    async def test_payload_on_postgres(self):
+        session = MagicMock()
+        session.bind.dialect.name = "postgresql"
+        session.execute = AsyncMock()
+
+        await notify_roles_changed(session, 2, None, 1, 2)
+        await notify_roles_changed(session, None)
+
+        payloads = [call.args[0].compile().params for call in session.execute.await_args_list]
+        assert [list(p.values()) for p in payloads] == [["roles", "[1, 2]"]]
+
+    @pytest.mark.asyncio
+    async def test_noop_on_sqlite(self):
+        session = MagicMock()
+        session.bind.dialect.name = "sqlite"
+        session.execute = AsyncMock()
+
+        await notify_roles_changed(session, 1)
+        session.execute.assert_not_awaited()
+
+
+class TestAuthMiddlewareCache:
+    @pytest.mark.asyncio
+    async def test_second_update_skips_db(self, mock_session):
+        from unittest.mock import AsyncMock, MagicMock
+        from bot.middlewares.auth import AuthMiddleware
+
+        cache = RoleCache()
+        mw = AuthMiddleware(cache)
+        handler = AsyncMock(return_value="ok")
+        user = MagicMock()
+        user.id = 123456
+        mock_session.add = MagicMock()
+
+        with patch(
+            "bot.middlewares.auth.resolve_role",
+            AsyncMock(return_value=(UserRole.OWNER, _owner(language="kk"))),
+        ) as resolve:
+            await mw(handler, MagicMock(), {"event_from_user": user, "session": mock_session})
+            data = {"event_from_user": user, "session": mock_session}
+            await mw(handler, MagicMock(), data)
+
+        resolve.assert_awaited_once()
+        assert data["user_role"] == UserRole.OWNER
+        assert data["user_language"] == "kk"
+        mock_session.add.assert_called_once_with(data["user_obj"])
+        assert cache.stats()["hits"] == 1
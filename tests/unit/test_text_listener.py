@@ -0,0 +1,51 @@
+"""Tests for bot.services.text_listener module."""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bot.services.text_listener import apply_changes, run_text_refresher
+
+
+@pytest.fixture
+def session_pool():
+    session = MagicMock()
+    pool = MagicMock()
+    pool.return_value.__aenter__ = AsyncMock(return_value=session)
+    pool.return_value.__aexit__ = AsyncMock(return_value=None)
+    return pool
+
+
+@pytest.fixture
+def text_service():
+    with patch("bot.services.text_listener.text_service") as service:
+        service.refresh = AsyncMock()
+        service.refresh_keys = AsyncMock()
+        yield service
+
+
+class TestApplyChanges:
+    @pytest.mark.asyncio
+    async def test_merges_keys(self, session_pool, text_service):
+        await apply_changes(session_pool, [json.dumps(["b", "a"]), json.dumps(["a", "c"])])
+        text_service.refresh_keys.assert_awaited_once()
+        assert text_service.refresh_keys.await_args.args[1] == ["a", "b", "c"]
+        text_service.refresh.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_all_reloads_everything(self, session_pool, text_service):
+        await apply_changes(session_pool, [json.dumps(["a"]), "*"])
+        text_service.refresh.assert_awaited_once()
+        text_service.refresh_keys.assert_not_awaited()
+
+
+class TestRunTextRefresher:
+    @pytest.mark.asyncio
+    async def test_keeps_running_after_failure(self, session_pool, text_service, until):
+        text_service.refresh.side_effect = [RuntimeError("db down"), 2, 3]
+        task = asyncio.create_task(run_text_refresher(session_pool, 0.001))
+        await until(lambda: text_service.refresh.await_count == 3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
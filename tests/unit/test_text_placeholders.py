@@ -0,0 +1,51 @@
+"""Every get_text/get_text_sync call passes the placeholders its text uses."""
+import ast
+from pathlib import Path
+
+import pytest
+
+from bot.services.text_service import DEFAULT_TEXTS, DEFAULT_TEXTS_KK, placeholders
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _calls():
+    """(location, key, passed keywords or None for a ``**`` splat) per call with a literal key."""
+    for path in sorted([*ROOT.joinpath("bot").rglob("*.py"), *ROOT.joinpath("admin_panel").rglob("*.py")]):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            func = node.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            index = {"get_text": 1, "get_text_sync": 0}.get(name)
+            if index is None or len(node.args) <= index:
+                continue
+            key = node.args[index]
+            if not isinstance(key, ast.Constant) or not isinstance(key.value, str):
+                continue
+            passed = {kw.arg for kw in node.keywords}
+            yield f"{path.relative_to(ROOT)}:{node.lineno}", key.value, None if None in passed else passed
+
+
+CALLS = list(_calls())
+
+
+class TestCallSites:
+    def test_calls_found(self):
+        assert len(CALLS) > 100
+
+    @pytest.mark.parametrize("where,key,passed", CALLS, ids=[c[0] for c in CALLS])
+    def test_key_exists_and_placeholders_passed(self, where, key, passed):
+        assert key in DEFAULT_TEXTS, f"{where}: unknown text key {key}"
+        if passed is None:
+            return
+        for texts in (DEFAULT_TEXTS, DEFAULT_TEXTS_KK):
+            missing = placeholders(texts[key]) - passed
+            assert not missing, f"{where}: {key} needs {sorted(missing)}"
+
+
+class TestDefaults:
+    def test_kk_uses_same_placeholders_as_ru(self):
+        for key, value in DEFAULT_TEXTS_KK.items():
+            assert placeholders(value) == placeholders(DEFAULT_TEXTS[key]), key
@@ -1,9 +1,18 @@
 """Tests for bot.services.text_service module."""
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from bot.services.text_service import (
+    cache_version,
+    get_text,
     get_text_sync,
+    load_cache,
+    refresh,
+    refresh_keys,
+    placeholders,
+    unknown_placeholders,
     DEFAULT_TEXTS,
     DEFAULT_TEXTS_KK,
     _cache,
@@ -98,3 +107,146 @@ class TestDefaultTextsKKCoverage:
     def test_error_generic_exists(self):
         assert "error_generic" in DEFAULT_TEXTS
         assert "error_generic" in DEFAULT_TEXTS_KK
+
+
+class TestPlaceholders:
+    def test_field_names(self):
+        assert placeholders("№{ticket_id} — {count} {{x}} {value:.1f}") == {"ticket_id", "count", "value"}
+
+    def test_unbalanced_braces_have_none(self):
+        assert placeholders("oops {") == frozenset()
+
+    def test_unbalanced_braces_render_verbatim(self):
+        import bot.services.text_service as ts
+        assert ts._format("k", "oops {", {"a": 1}) == "oops {"
+
+
+class TestGetText:
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        import bot.services.text_service as ts
+        saved = ts._cache, ts._cache_loaded
+        ts._cache, ts._cache_loaded = {}, False
+        ts._missing.clear()
+        yield
+        ts._cache, ts._cache_loaded = saved
+        ts._missing.clear()
+
+    @pytest.mark.asyncio
+    async def test_missing_key_asks_db_once(self, mock_session):
+        with patch("bot.services.text_service.bot_text_repo") as repo:
+            repo.get_by_key = AsyncMock(return_value=None)
+            token = current_language.set("ru")
+            try:
+                for _ in range(3):
+                    assert await get_text(mock_session, "action_cancelled") == "Действие отменено."
+            finally:
+                current_language.reset(token)
+        assert repo.get_by_key.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_load_cache_forgets_missing(self, mock_session):
+        with patch("bot.services.text_service.bot_text_repo") as repo:
+            repo.get_by_key = AsyncMock(return_value=None)
+            repo.get_all_as_dict = AsyncMock(return_value={})
+            await get_text(mock_session, "action_cancelled")
+            await load_cache(mock_session)
+            import bot.services.text_service as ts
+            ts._cache_loaded = False
+            await get_text(mock_session, "action_cancelled")
+        assert repo.get_by_key.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_placeholder_in_db_text_uses_default(self, mock_session):
+        with patch("bot.services.text_service.bot_text_repo") as repo:
+            repo.get_all_as_dict = AsyncMock(return_value={
+                "create_submitted": {"ru": "Заявка {ticket_id} от {typo}"},
+            })
+            repo.get_by_key = AsyncMock(return_value="Заявка {ticket_id} от {typo}")
+            await load_cache(mock_session)
+            token = current_language.set("ru")
+            try:
+                result = await get_text(mock_session, "create_submitted", ticket_id="QSS-1")
+            finally:
+                current_language.reset(token)
+        assert "{typo}" not in result
+        assert result.startswith("Заявка <b>№QSS-1</b> принята")
+
+    def test_unknown_placeholders(self):
+        assert unknown_placeholders("create_submitted", "{ticket_id} {typo} {a}") == ["a", "typo"]
+        assert unknown_placeholders("create_submitted", "{ticket_id}") == []
+        assert unknown_placeholders("custom_admin_key", "{anything}") == []
+
+
+class TestRefresh:
+    @pytest.fixture(autouse=True)
+    def cache(self):
+        import bot.services.text_service as ts
+        saved = ts._cache, ts._cache_loaded
+        ts._cache, ts._cache_loaded = {"menu_owner": {"ru": "old"}}, True
+        yield
+        ts._cache, ts._cache_loaded = saved
+
+    @pytest.fixture
+    def session_pool(self, mock_session):
+        pool = MagicMock()
+        pool.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+        pool.return_value.__aexit__ = AsyncMock(return_value=None)
+        return pool
+
+    @pytest.fixture
+    def gate(self):
+        """A get_all_as_dict that blocks until the test opens the gate."""
+        opened = asyncio.Event()
+
+        async def get_all_as_dict(session):
+            await opened.wait()
+            return {"menu_owner": {"ru": "new"}}
+
+        with patch("bot.services.text_service.bot_text_repo") as repo:
+            repo.get_all_as_dict = AsyncMock(side_effect=get_all_as_dict)
+            repo.get_by_keys = AsyncMock(return_value={"menu_owner": {"ru": "newest"}})
+            yield repo, opened
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_one_load(self, session_pool, gate):
+        repo, opened = gate
+        before = cache_version()
+        tasks = [asyncio.create_task(refresh(session_pool)) for _ in range(5)]
+        await asyncio.sleep(0)
+        opened.set()
+        versions = await asyncio.gather(*tasks)
+        assert repo.get_all_as_dict.await_count == 1
+        assert versions == [before + 1] * 5
+
+    @pytest.mark.asyncio
+    async def test_readers_get_old_texts_during_reload(self, session_pool, gate):
+        _, opened = gate
+        token = current_language.set("ru")
+        try:
+            task = asyncio.create_task(refresh(session_pool))
+            await asyncio.sleep(0)
+            assert get_text_sync("menu_owner") == "old"
+            opened.set()
+            await task
+            assert get_text_sync("menu_owner") == "new"
+        finally:
+            current_language.reset(token)
+
+    @pytest.mark.asyncio
+    async def test_key_reload_waits_for_full_reload(self, session_pool, gate):
+        repo, opened = gate
+        token = current_language.set("ru")
+        try:
+            full = asyncio.create_task(refresh(session_pool))
+            while not repo.get_all_as_dict.await_count:
+                await asyncio.sleep(0)
+            keys = asyncio.create_task(refresh_keys(session_pool, ["menu_owner"]))
+            await asyncio.sleep(0.01)
+            assert not repo.get_by_keys.await_count
+            opened.set()
+            await asyncio.gather(full, keys)
+            # The later, narrower reload is applied last rather than overwritten
+            assert get_text_sync("menu_owner") == "newest"
+        finally:
+            current_language.reset(token)
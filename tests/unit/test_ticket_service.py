@@ -5,6 +5,14 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from bot.services.ticket_service import create_ticket, change_status, rate_ticket, find_master_for_ticket
 
 
+@pytest.fixture(autouse=True)
+def stats_repo():
+    with patch("bot.services.ticket_service.stats_repo") as repo:
+        repo.lock_facts = AsyncMock(return_value=None)
+        repo.record = AsyncMock()
+        yield repo
+
+
 class TestCreateTicket:
     @pytest.mark.asyncio
     async def test_create_ticket_basic(self, mock_session):
@@ -13,9 +21,7 @@ class TestCreateTicket:
         fake_ticket.ticket_id = "QSS-20250101-0001"
 
         with patch("bot.services.ticket_service.ticket_repo") as ticket_repo:
-            ticket_repo.generate_ticket_id = AsyncMock(return_value="QSS-20250101-0001")
-            ticket_repo.create = AsyncMock(return_value=fake_ticket)
-            ticket_repo.add_history = AsyncMock()
+            ticket_repo.create_with_history = AsyncMock(return_value=fake_ticket)
 
             data = {
                 "client_telegram_id": 123456,
@@ -28,10 +34,9 @@ class TestCreateTicket:
             result = await create_ticket(mock_session, data)
 
             assert result.ticket_id == "QSS-20250101-0001"
-            ticket_repo.create.assert_called_once()
-            ticket_repo.add_history.assert_called_once()
+            ticket_repo.create_with_history.assert_called_once()
             # Verify history has correct status
-            call_kwargs = ticket_repo.add_history.call_args[1]
+            call_kwargs = ticket_repo.create_with_history.call_args[1]["history"]
             assert call_kwargs["new_status"] == "new"
             assert call_kwargs["comment"] == "Заявка создана"
 
@@ -41,9 +46,7 @@ class TestCreateTicket:
         fake_ticket.id = 2
 
         with patch("bot.services.ticket_service.ticket_repo") as ticket_repo:
-            ticket_repo.generate_ticket_id = AsyncMock(return_value="QSS-20250101-0002")
-            ticket_repo.create = AsyncMock(return_value=fake_ticket)
-            ticket_repo.add_history = AsyncMock()
+            ticket_repo.create_with_history = AsyncMock(return_value=fake_ticket)
 
             data = {
                 "client_telegram_id": 123456,
@@ -56,7 +59,7 @@ class TestCreateTicket:
             }
             await create_ticket(mock_session, data)
 
-            call_kwargs = ticket_repo.add_history.call_args[1]
+            call_kwargs = ticket_repo.create_with_history.call_args[1]["history"]
             assert call_kwargs["new_status"] == "pending_approval"
             assert "госномер" in call_kwargs["comment"]
 
@@ -69,9 +72,7 @@ class TestCreateTicket:
         fake_ticket.id = 1
 
         with patch("bot.services.ticket_service.ticket_repo") as ticket_repo:
-            ticket_repo.generate_ticket_id = AsyncMock(return_value="QSS-20250101-0001")
-            ticket_repo.create = AsyncMock(return_value=fake_ticket)
-            ticket_repo.add_history = AsyncMock()
+            ticket_repo.create_with_history = AsyncMock(return_value=fake_ticket)
 
             data = {
                 "client_telegram_id": 123456,
@@ -83,7 +84,7 @@ class TestCreateTicket:
             }
             await create_ticket(mock_session, data)
 
-            create_kwargs = ticket_repo.create.call_args[1]
+            create_kwargs = ticket_repo.create_with_history.call_args[1]["values"]
             assert create_kwargs["category"] == "cctv"
 
 
@@ -0,0 +1,190 @@
+"""Tests for bot.services.update_scheduler module."""
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+from aiogram.types import Update
+
+from bot.services.update_scheduler import ChatScheduler, chat_key
+
+
+def message_update(update_id: int, chat_id: int, text: str = "hi") -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "U"},
+            "text": text,
+        },
+    })
+
+
+def callback_update(update_id: int, chat_id: int) -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "chat_instance": "x",
+            "data": "d",
+            "from": {"id": 555, "is_bot": False, "first_name": "U"},
+            "message": {"message_id": 1, "date": 0, "chat": {"id": chat_id, "type": "private"}},
+        },
+    })
+
+
+class RecordingDispatcher:
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.log: list[tuple[str, int]] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def feed_update(self, bot, update):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.log.append(("start", update.update_id))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", update.update_id))
+        self.running -= 1
+
+
+class TestChatKey:
+    def test_message(self):
+        assert chat_key(message_update(1, 42)) == 42
+
+    def test_callback_uses_message_chat(self):
+        assert chat_key(callback_update(1, 42)) == 42
+
+    def test_no_chat(self):
+        update = MagicMock(update_id=7, event=object())
+        assert chat_key(update) == ("update", 7)
+
+
+class TestChatScheduler:
+    @pytest.mark.asyncio
+    async def test_same_chat_is_serialized(self):
+        dp = RecordingDispatcher()
+        scheduler = ChatScheduler(dp, MagicMock())
+        for i in range(1, 4):
+            scheduler.submit(message_update(i, 42))
+        await scheduler.close()
+
+        assert dp.log == [("start", 1), ("end", 1), ("start", 2), ("end", 2), ("start", 3), ("end", 3)]
+        assert dp.max_running == 1
+
+    @pytest.mark.asyncio
+    async def test_different_chats_run_concurrently(self):
+        dp = RecordingDispatcher()
+        scheduler = ChatScheduler(dp, MagicMock())
+        for i in range(1, 4):
+            scheduler.submit(message_update(i, 100 + i))
+        await scheduler.close()
+
+        assert dp.max_running == 3
+
+    @pytest.mark.asyncio
+    async def test_failing_update_does_not_block_chat(self):
+        dp = RecordingDispatcher()
+        calls = []
+
+        async def feed_update(bot, update):
+            calls.append(update.update_id)
+            if update.update_id == 1:
+                raise RuntimeError("boom")
+
+        dp.feed_update = feed_update
+        scheduler = ChatScheduler(dp, MagicMock())
+        scheduler.submit(message_update(1, 42))
+        scheduler.submit(message_update(2, 42))
+        await scheduler.close()
+
+        assert calls == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_chat_queue_is_released(self):
+        scheduler = ChatScheduler(RecordingDispatcher(delay=0), MagicMock())
+        scheduler.submit(message_update(1, 42))
+        await scheduler.close()
+        assert scheduler._queues == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        dp = RecordingDispatcher()
+        scheduler = ChatScheduler(dp, MagicMock(), max_concurrency=2)
+        for i in range(1, 6):
+            scheduler.submit(message_update(i, 100 + i))
+        await scheduler.close()
+
+        assert dp.max_running == 2
+        assert scheduler.processed == 5
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_metrics(self):
+        scheduler = ChatScheduler(RecordingDispatcher(), MagicMock())
+        for i in range(1, 4):
+            scheduler.submit(message_update(i, 42))
+        scheduler.submit(message_update(4, 43))
+
+        stats = scheduler.stats()
+        assert stats["chats"] == 2
+        assert stats["pending"] == 4
+        assert stats["max_depth"] == 3
+
+        await scheduler.close()
+        stats = scheduler.stats()
+        assert stats["pending"] == 0
+        assert stats["processed"] == 4
+        assert stats["max_depth"] == 0
+        # Reading doesn't reset the peak, reset_peak does
+        assert stats["peak_depth"] == scheduler.stats()["peak_depth"] == 3
+        scheduler.reset_peak()
+        assert scheduler.peak_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_for_room(self):
+        scheduler = ChatScheduler(RecordingDispatcher(), MagicMock(), queue_limit=2)
+        scheduler.submit(message_update(1, 42))
+        scheduler.submit(message_update(2, 43))
+
+        waiter = asyncio.create_task(scheduler.wait_for_room())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await scheduler.close()
+        await asyncio.wait_for(waiter, 1)
+
+
+class TestFsmOrdering:
+    @pytest.mark.asyncio
+    async def test_rapid_photos_are_not_lost(self):
+        """Same pattern as process_face_photo: read data, await, write it back."""
+        from aiogram import Bot, Dispatcher, Router
+        from aiogram.fsm.context import FSMContext
+        from aiogram.fsm.storage.base import StorageKey
+        from aiogram.fsm.storage.memory import MemoryStorage
+
+        router = Router()
+
+        @router.message()
+        async def add_photo(message, state: FSMContext):
+            data = await state.get_data()
+            photos = data.get("photos", [])
+            photos.append(message.text)
+            await asyncio.sleep(0.01)  # e.g. answering the user
+            await state.update_data(photos=photos)
+
+        storage = MemoryStorage()
+        dp = Dispatcher(storage=storage)
+        dp.include_router(router)
+        bot = Bot("123456:TEST")
+        scheduler = ChatScheduler(dp, bot)
+        for i in range(1, 6):
+            scheduler.submit(message_update(i, 42, text=f"photo{i}"))
+        await scheduler.close()
+        await bot.session.close()
+
+        data = await storage.get_data(StorageKey(bot_id=123456, chat_id=42, user_id=42))
+        assert data["photos"] == [f"photo{i}" for i in range(1, 6)]